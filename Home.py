@@ -1,436 +1,109 @@
+import Startup_timing  # first, so startup timing covers every other import
 import sys
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from functools import partial
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QLabel, QLineEdit, QPushButton, QSizePolicy, QTabWidget,
-                             QTableWidget, QTableWidgetItem, QHeaderView, QSpacerItem,
+                             QLabel, QLineEdit, QSizePolicy, QTabWidget,
+                             QTableView, QHeaderView, QSpacerItem,
                              QMenu, QMenuBar, QStatusBar, QCheckBox, QMessageBox,
-                             QDateEdit, QAbstractItemView, QFrame, QScrollArea, QComboBox,
-                             QFormLayout, QTextEdit)
-from PyQt6.QtCore import Qt, QSize, QDate, QPropertyAnimation, QEasingCurve
-from PyQt6.QtGui import QFont, QColor, QPixmap, QIcon, QPalette
-from qtawesome import icon  # QtAwesome for Font Awesome icons
-
-
-class ModernButton(QPushButton):
-    """Custom modern button with hover effect."""
-
-    def __init__(self, text, primary=False):
-        super().__init__(text)
-        self.primary = primary
-        self.setup_style()
-
-    def setup_style(self):
-        if self.primary:
-            self.setStyleSheet("""
-                QPushButton {
-                    background-color: #2196F3;
-                    color: white;
-                    border: none;
-                    border-radius: 6px;
-                    padding: 8px 16px;
-                    font-weight: 600;
-                    font-size: 9pt;
-                }
-                QPushButton:hover {
-                    background-color: #1976D2;
-                }
-                QPushButton:pressed {
-                    background-color: #0D47A1;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QPushButton {
-                    background-color: white;
-                    color: #424242;
-                    border: 1px solid #E0E0E0;
-                    border-radius: 6px;
-                    padding: 8px 16px;
-                    font-weight: 500;
-                    font-size: 9pt;
-                }
-                QPushButton:hover {
-                    background-color: #F5F5F5;
-                    border-color: #BDBDBD;
-                }
-                QPushButton:pressed {
-                    background-color: #EEEEEE;
-                }
-            """)
-
-
-class AutoGenerateTab(QWidget):
-    def __init__(self, username, current_date, main_window):
-        super().__init__()
-        self.username = username
-        self.current_date = current_date
-        self.main_window = main_window
-        self.formulation_data = self.load_formulation_data()
-        self.setup_ui()
-
-    def load_formulation_data(self):
-        """Load sample formulation data."""
-        return [
-            ["B107", "2.500000", "0.000000", "2.5000000", "0.025000", "2.475000"],
-            ["B37", "4.000000", "0.000000", "1.5000000", "0.015000", "1.485000"],
-            ["L28", "5.000000", "0.000000", "1.0000000", "0.010000", "0.990000"]
-        ]
-
-    def setup_ui(self):
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(20, 10, 20, 10)
-        layout.setSpacing(8)
-
-        # Title Card
-        title_card = QFrame()
-        title_card.setObjectName("card")
-        title_layout = QHBoxLayout(title_card)
-        title_layout.setContentsMargins(20, 8, 20, 8)
-
-        # Main Content Layout
-        main_content = QHBoxLayout()
-        main_content.setSpacing(10)
-
-        # Middle: Form Fields Card
-        middle_card = QFrame()
-        middle_card.setObjectName("card")
-        middle_layout = QVBoxLayout(middle_card)
-        middle_layout.setContentsMargins(15, 15, 15, 15)
-        middle_layout.setSpacing(5)
-
-        form_title = QLabel("Form Details")
-        form_title.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-        form_title.setStyleSheet("color: #1976D2;")
-        middle_layout.addWidget(form_title, 2)
-
-        form_widget = QWidget()
-        form_layout = QFormLayout(form_widget)
-        form_layout.setLabelAlignment(Qt.AlignmentFlag.AlignRight)
-        form_layout.setHorizontalSpacing(8)
-        form_layout.setVerticalSpacing(3)
-        form_layout.setContentsMargins(0, 0, 0, 0)
-
-        # Field styling adjusted to match theme
-        field_style = "background-color: #FFF3E0; border: 1px solid #FF9800; border-radius: 4px; padding: 4px;"
-        white_field_style = "background-color: #FAFAFA; border: 1px solid #E0E0E0; border-radius: 4px; padding: 4px;"
-        field_width = 180
-        field_height = 24
-
-        # Product Code
-        product_code_layout = QHBoxLayout()
-        self.product_code_combo = QComboBox()
-        self.product_code_combo.setEditable(True)
-        self.product_code_combo.setCurrentText("BA0830E")
-        self.product_code_combo.setFixedSize(field_width, field_height)
-        self.product_code_combo.setStyleSheet(field_style)
-        product_code_layout.addWidget(self.product_code_combo)
-        product_code_layout.addStretch()
-        form_layout.addRow("PRODUCT CODE *", product_code_layout)
-
-        # Product Color
-        self.product_color_edit = QLineEdit("BLUE")
-        self.product_color_edit.setFixedSize(field_width, field_height)
-        self.product_color_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("PRODUCT COLOR", self.product_color_edit)
-
-        # Dosage and LD(%)
-        dosage_layout = QHBoxLayout()
-        dosage_layout.setSpacing(5)
-        self.dosage_edit = QLineEdit("100.00000")
-        self.dosage_edit.setFixedSize(100, field_height)
-        self.dosage_edit.setStyleSheet(field_style)
-        dosage_layout.addWidget(self.dosage_edit)
-
-        ld_label = QLabel("LD (%)")
-        ld_label.setFont(QFont("Segoe UI", 8))
-        dosage_layout.addWidget(ld_label)
-
-        self.ld_edit = QLineEdit("0.40000")
-        self.ld_edit.setFixedSize(80, field_height)
-        self.ld_edit.setStyleSheet(white_field_style)
-        dosage_layout.addWidget(self.ld_edit)
-        dosage_layout.addStretch()
-        form_layout.addRow("DOSAGE *", dosage_layout)
-
-        # Customer
-        self.customer_combo = QComboBox()
-        self.customer_combo.setEditable(True)
-        self.customer_combo.setCurrentText("Una Internationale")
-        self.customer_combo.setFixedSize(field_width, field_height)
-        self.customer_combo.setStyleSheet(field_style)
-        form_layout.addRow("CUSTOMER *", self.customer_combo)
-
-        # Lot No.
-        self.lot_no_combo = QComboBox()
-        self.lot_no_combo.setEditable(True)
-        self.lot_no_combo.setFixedSize(field_width, field_height)
-        self.lot_no_combo.setStyleSheet(field_style)
-        form_layout.addRow("LOT NO. *", self.lot_no_combo)
-
-        # Tentative Production Date
-        self.tentative_date_edit = QLineEdit("  /  /")
-        self.tentative_date_edit.setFixedSize(field_width, field_height)
-        self.tentative_date_edit.setStyleSheet(field_style)
-        form_layout.addRow("TENTATIVE PRODUCTION DATE *", self.tentative_date_edit)
-
-        # Confirmation Date for Inventory Only
-        self.confirm_date_edit = QLineEdit("  /  /")
-        self.confirm_date_edit.setFixedSize(field_width, field_height)
-        self.confirm_date_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("CONFIRMATION DATE FOR INVENTORY ONLY *", self.confirm_date_edit)
-
-        # Order Form No.
-        self.order_form_combo = QComboBox()
-        self.order_form_combo.setEditable(True)
-        self.order_form_combo.setFixedSize(field_width, field_height)
-        self.order_form_combo.setStyleSheet(field_style)
-        form_layout.addRow("ORDER FORM NO. *", self.order_form_combo)
-
-        # Colormatch No.
-        self.colormatch_no_edit = QLineEdit("-")
-        self.colormatch_no_edit.setFixedSize(field_width, field_height)
-        self.colormatch_no_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("COLORMATCH NO.", self.colormatch_no_edit)
-
-        # Matched Date
-        self.matched_date_edit = QLineEdit("02/14/2025")
-        self.matched_date_edit.setFixedSize(field_width, field_height)
-        self.matched_date_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("MATCHED DATE", self.matched_date_edit)
-
-        # Formulation ID
-        self.formulation_id_edit = QLineEdit("16026")
-        self.formulation_id_edit.setFixedSize(field_width, field_height)
-        self.formulation_id_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("FORMULATION ID", self.formulation_id_edit)
-
-        # Mixing Time
-        self.mixing_time_edit = QLineEdit("-")
-        self.mixing_time_edit.setFixedSize(field_width, field_height)
-        self.mixing_time_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("MIXING TIME", self.mixing_time_edit)
-
-        # Machine No.
-        self.machine_no_edit = QLineEdit()
-        self.machine_no_edit.setFixedSize(field_width, field_height)
-        self.machine_no_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("MACHINE NO.", self.machine_no_edit)
-
-        # QTY. REQ.
-        self.qty_req_edit = QLineEdit("0.0000000")
-        self.qty_req_edit.setFixedSize(field_width, field_height)
-        self.qty_req_edit.setStyleSheet(field_style)
-        form_layout.addRow("QTY. REQ. *", self.qty_req_edit)
-
-        # QTY. PER BATCH
-        self.qty_per_batch_edit = QLineEdit("0.0000000")
-        self.qty_per_batch_edit.setFixedSize(field_width, field_height)
-        self.qty_per_batch_edit.setStyleSheet(field_style)
-        form_layout.addRow("QTY. PER BATCH *", self.qty_per_batch_edit)
-
-        # Prepared By
-        self.prepared_by_combo = QComboBox()
-        self.prepared_by_combo.setEditable(True)
-        self.prepared_by_combo.setFixedSize(field_width, field_height)
-        self.prepared_by_combo.setStyleSheet(field_style)
-        form_layout.addRow("PREPARED BY *", self.prepared_by_combo)
-
-        # Notes
-        self.notes_edit = QTextEdit()
-        self.notes_edit.setFixedHeight(40)
-        self.notes_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("NOTES", self.notes_edit)
-
-        middle_layout.addWidget(form_widget)
-        main_content.addWidget(middle_card, 3)
-
-        # Right Side: Form Type, Production ID, and Materials Card
-        right_card = QFrame()
-        right_card.setObjectName("card")
-        right_layout = QVBoxLayout(right_card)
-        right_layout.setContentsMargins(15, 15, 15, 15)
-        right_layout.setSpacing(8)
-
-        # Form Type Row
-        form_type_layout = QHBoxLayout()
-        form_type_label = QLabel("FORM TYPE")
-        form_type_label.setFont(QFont("Segoe UI", 9))
-        form_type_layout.addWidget(form_type_label)
-
-        self.form_type_combo = QComboBox()
-        self.form_type_combo.setFixedSize(150, field_height)
-        self.form_type_combo.setStyleSheet(field_style)
-        form_type_layout.addWidget(self.form_type_combo)
-        form_type_layout.addStretch()
-        right_layout.addLayout(form_type_layout)
-
-        # Production ID
-        prod_id_layout = QHBoxLayout()
-        prod_id_label = QLabel("PRODUCTION ID")
-        prod_id_label.setFont(QFont("Segoe UI", 9))
-        prod_id_layout.addWidget(prod_id_label)
-
-        self.production_id_label = QLabel("0098744")
-        self.production_id_label.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
-        self.production_id_label.setStyleSheet("color: #2196F3;")
-        prod_id_layout.addWidget(self.production_id_label)
-        prod_id_layout.addStretch()
-        right_layout.addLayout(prod_id_layout)
-
-        # Materials Table
-        headers = ["Material Name", "Large Scale (KG.)", "Small Scale (G.)", "Total Weight (KG.)", "Total Loss (KG.)", "Total Consumption (KG.)"]
-        self.materials_table = QTableWidget()
-        self.materials_table.setRowCount(len(self.formulation_data))
-        self.materials_table.setColumnCount(6)
-        self.materials_table.setHorizontalHeaderLabels(headers)
-
-        # Modern table styling
-        self.materials_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.materials_table.verticalHeader().setVisible(False)
-        self.materials_table.setAlternatingRowColors(True)
-        self.materials_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.materials_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
-        self.materials_table.setFont(QFont("Segoe UI", 9))
-        self.materials_table.horizontalHeader().setFont(QFont("Segoe UI", 7, QFont.Weight.Bold))
-        self.materials_table.setMinimumHeight(250)
-        self.materials_table.horizontalHeader().setStyleSheet("""
-            QHeaderView::section {
-                background-color: #1976D2;
-                color: white;
-                padding: 4px;
-                border: none;
-                font-weight: bold;
-            }
-        """)
-
-        # Populate table
-        for row, row_data in enumerate(self.formulation_data):
-            for col, item_data in enumerate(row_data):
-                item = QTableWidgetItem(str(item_data))
-                item.setFont(QFont("Segoe UI", 9))
-                self.materials_table.setItem(row, col, item)
-
-        right_layout.addWidget(self.materials_table)
-
-        # Bottom stats section
-        stats_layout = QVBoxLayout()
-        stats_layout.setSpacing(3)
-
-        items_label = QLabel("NO. OF ITEMS :  0")
-        items_label.setFont(QFont("Segoe UI", 8, QFont.Weight.Bold))
-        stats_layout.addWidget(items_label)
-
-        weight_label = QLabel("TOTAL WEIGHT  : 0.000000")
-        weight_label.setFont(QFont("Segoe UI", 8, QFont.Weight.Bold))
-        stats_layout.addWidget(weight_label)
-
-        fg_label = QLabel("FG in 1D (FOR WH) ONLY")
-        fg_label.setFont(QFont("Segoe UI", 7))
-        stats_layout.addWidget(fg_label)
-
-        right_layout.addLayout(stats_layout)
-        right_layout.addStretch()
-
-        main_content.addWidget(right_card, 7)
-
-        layout.addLayout(main_content)
-
-        # Cancel Button
-        cancel_btn = ModernButton("CLICK HERE TO CANCEL THIS PRODUCTION")
-        cancel_btn.setStyleSheet("QPushButton { color: #2196F3; background: transparent; border: none; text-decoration: underline; }")
-        layout.addWidget(cancel_btn, alignment=Qt.AlignmentFlag.AlignRight)
-
-        # Encoded By Section Card
-        encoded_card = QFrame()
-        encoded_card.setObjectName("card")
-        encoded_layout = QHBoxLayout(encoded_card)
-        encoded_layout.setContentsMargins(20, 8, 20, 8)
-
-        encoded_by_label = QLabel("ENCODED BY")
-        encoded_by_label.setFont(QFont("Segoe UI", 9))
-        encoded_layout.addWidget(encoded_by_label)
-
-        prod_confirm_label = QLabel("PRODUCTION CONFIRMATION ENCODED ON")
-        prod_confirm_label.setFont(QFont("Segoe UI", 9))
-        encoded_layout.addWidget(prod_confirm_label)
-
-        self.confirm_encoded_edit = QLineEdit("0000000")
-        self.confirm_encoded_edit.setFixedSize(120, field_height)
-        self.confirm_encoded_edit.setStyleSheet(field_style)
-        encoded_layout.addWidget(self.confirm_encoded_edit)
-
-        encoded_layout.addStretch()
-        layout.addWidget(encoded_card)
-
-        # Bottom Section with Date and Buttons Card
-        bottom_card = QFrame()
-        bottom_card.setObjectName("card")
-        bottom_layout = QHBoxLayout(bottom_card)
-        bottom_layout.setContentsMargins(20, 8, 20, 8)
-
-        date_prod_layout = QVBoxLayout()
-        date_label = QLabel(self.current_date)
-        date_label.setFont(QFont("Segoe UI", 8))
-        date_prod_layout.addWidget(date_label)
-
-        prod_encoded_layout = QHBoxLayout()
-        prod_encoded_label = QLabel("PRODUCTION ENCODED ON")
-        prod_encoded_label.setFont(QFont("Segoe UI", 8))
-        prod_encoded_layout.addWidget(prod_encoded_label)
-
-        self.prod_encoded_edit = QLineEdit("  /  /")
-        self.prod_encoded_edit.setFixedSize(100, field_height)
-        self.prod_encoded_edit.setStyleSheet(white_field_style)
-        prod_encoded_layout.addWidget(self.prod_encoded_edit)
-        prod_encoded_layout.addStretch()
-
-        date_prod_layout.addLayout(prod_encoded_layout)
-        bottom_layout.addLayout(date_prod_layout, 3)
-
-        bottom_layout.addStretch()
-
-        # Action Buttons
-        btn_layout = QHBoxLayout()
-        btn_layout.setSpacing(3)
-
-        buttons = [
-            ("GENERATE", True),
-            ("TUMBLER", False),
-            ("GENERATE ADVANCE", False),
-            ("PRINT", False),
-            ("NEW", False),
-            ("CLOSE", False)
-        ]
-
-        for btn_text, is_primary in buttons:
-            btn_width = 120 if btn_text == "GENERATE ADVANCE" else 80 if btn_text == "GENERATE" or btn_text == "TUMBLER" else 60
-            btn = ModernButton(btn_text, primary=is_primary)
-            btn.setFixedSize(btn_width, 25)
-            if btn_text == "CLOSE":
-                btn.clicked.connect(self.main_window.close)
-            btn_layout.addWidget(btn)
-
-        bottom_layout.addLayout(btn_layout)
-        layout.addWidget(bottom_card)
+                             QDateEdit, QAbstractItemView, QFrame, QScrollArea,
+                             QProgressBar, QFileDialog, QProgressDialog)
+from PyQt6.QtCore import Qt, QSize, QDate, QPropertyAnimation, QEasingCurve, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QPixmap, QIcon, QPalette
+from production_tab.Production_model import ProductionTableModel, MaterialTableModel
+from production_tab.Data_loader import BatchLoader, BatchFeeder
+from production_tab.Export_worker import ExportWorker, EXPORT_HEADERS
+from production_tab.Archive_dialog import ArchiveDialog
+from production_tab.Receive_dialog import ReceiveDialog
+from production_tab.Summary_dialog import SummaryDialog
+from production_tab.Theme import ModernButton, apply_theme, font
+from production_tab.Auto_generate import AutoGenerateTab
+from production_data.Production_store import ProductionStore, PAGE_SIZE
+from production_data.Search_index import SearchIndex
+from production_data.Sort_index import SortPermutations
+from production_data.Date_index import DateRangeIndex
+from production_data.Archive_store import ArchiveStore, ARCHIVE_AFTER_DAYS
+from production_data.Statistics import ProductionStatistics
+from production_data.Consumption_calculator import compute_consumption, material_rows
+from production_data.Fixed_point import format_fixed
+from production_data.Formulation_repository import FormulationRepository, DEFAULT_FORMULATION_ID
+from production_data.Product_index import ProductCodeIndex
+from production_data.Completion_sources import SqlPrefixSource, SortedPrefixSource
+from production_data.Users import USERNAMES
+from production_data.Id_allocator import IdAllocator
+from production_data.Batch_generator import BatchGenerator
+from production_data.Warehouse_ledger import WarehouseLedger
+from production_data.Stock_snapshot import StockSnapshot
+
+
+# Batch size shown with the default formulation until a production record is picked
+SAMPLE_BATCH_KG = 5.0
 
 
 class MainApplicationWindow(QMainWindow):
+    # Emitted from any thread after the running statistics change
+    stats_changed = pyqtSignal()
+
     def __init__(self, username="User"):
         super().__init__()
         self.setWindowTitle("MASTERBATCH PHILIPPINES INC. - Production Management System")
         self.setGeometry(100, 50, 1600, 900)
         self.username = username
         self.current_date = datetime.now().strftime("%m/%d/%Y %I:%M:%S %p")
-        self.production_data = self.load_production_data()
-        self.formulation_data = self.load_formulation_data()
+        self.store = ProductionStore()
+        self.archive = ArchiveStore()
+        self.statistics = ProductionStatistics(self.store)
+        self.formulations = FormulationRepository(self.store)
+        self.production_ids = IdAllocator(self.store)
+        self.batch_generator = BatchGenerator(self.store, self.production_ids)
+        self.ledger = WarehouseLedger(self.store)
+        self.stock = StockSnapshot()
+        self.stock.load(self.ledger)
+        self.ledger.add_listener(self.stock.on_stock_changed)
+        self.product_index = ProductCodeIndex()
+        self.store.add_listener(self.product_index.on_records_changed)
+        # Shared completion sources; none of them loads anything until the user types
+        self.completions = {
+            "product_code": self.product_index,
+            "customer": SqlPrefixSource(self.store, "production_record", "customer"),
+            "lot_no": SqlPrefixSource(self.store, "production_record", "lot_no"),
+            "order_form": SqlPrefixSource(self.store, "order_form", "order_form_no"),
+            "prepared_by": SortedPrefixSource(USERNAMES),
+        }
+        self.store.add_listener(self.completions["customer"].invalidate)
+        self.store.add_listener(self.completions["lot_no"].invalidate)
+        self.store.add_listener(self.completions["order_form"].invalidate)
+        self.store.add_listener(self.statistics.on_records_changed)
+        self.store.add_listener(lambda removed, added: self.stats_changed.emit())
+        self._feeders = []
+        self.production_feeder = None
+        self._exports = []
+        self.search_index = SearchIndex()
+        self.sort_permutations = SortPermutations()
+        self.date_index = DateRangeIndex()
         self.setup_ui()
         self.apply_styles()
         self.center_window()
+        self.stats_changed.connect(self.refresh_statistics)
+
+        # Data is streamed in once the event loop is running so the window paints first
+        QTimer.singleShot(0, self.start_loading)
 
     def switch_to_tab(self, index):
         if hasattr(self, 'tab_widget'):
             self.tab_widget.setCurrentIndex(index)
 
+    def set_user(self, username):
+        """Hand a window built ahead of login to the user who logged in."""
+        self.username = username
+        self.current_date = datetime.now().strftime("%m/%d/%Y %I:%M:%S %p")
+        self.user_name_label.setText(username)
+
+    def on_tab_changed(self, index):
+        if self.auto_generate_tab is None and self.tab_widget.widget(index) is self.auto_generate_page:
+            self.auto_generate_tab = AutoGenerateTab(self.username, self.current_date, self)
+            self.auto_generate_page.layout().addWidget(self.auto_generate_tab)
+
     def center_window(self):
         """Center the window on the screen."""
         screen_geometry = QApplication.primaryScreen().geometry()
@@ -439,29 +112,155 @@ class MainApplicationWindow(QMainWindow):
         center_y = (screen_geometry.height() - window_geometry.height()) // 2
         self.move(center_x, center_y)
 
+    def start_loading(self):
+        """Stream production records in the background and show the default formulation."""
+        self.load_production_data()
+        self.show_formulation(self.formulations.get(DEFAULT_FORMULATION_ID), SAMPLE_BATCH_KG)
+
+    def _start_loader(self, batches, sink, on_finished):
+        loader = BatchLoader(batches)
+        feeder = BatchFeeder(sink, parent=self)
+        feeder.attach(loader)
+        feeder.finished.connect(on_finished)
+        feeder.finished.connect(partial(self._end_loader, feeder))
+        loader.signals.failed.connect(self.on_load_failed)
+        loader.signals.failed.connect(partial(self._end_loader, feeder))
+        self._feeders.append(feeder)
+        QThreadPool.globalInstance().start(loader)
+        return feeder
+
+    def _end_loader(self, feeder, *_):
+        """Stop a feeder that finished, failed or was superseded, and let it go."""
+        if feeder not in self._feeders:
+            return
+        self._feeders.remove(feeder)
+        feeder.cancel()
+        feeder.deleteLater()
+        if feeder is self.production_feeder:
+            self.production_feeder = None
+
     def load_production_data(self):
-        """Load sample production data."""
-        return [
-            ["10/06/25", "TRADESPHERE INDUSTRIAL COMMODITIES, INC.", "PP-W9845E", "White", "8211X", "2.5000000"],
-            ["10/06/25", "PLACEL MFG. CO., INC.", "PP-V0669E", "PEARL VIOLET", "8210X", "1.0200000"],
-            ["10/06/25", "In House", "VA4086E", "VIOLET", "1619AN", "125.0000000"],
-            ["10/03/25", "ROWELL LITHOGRAPHY & METAL CLOSURE, INC.", "DE-B17719E", "BLUE", "8196X", "5.0000000"],
-            ["10/06/25", "In House", "VA4086E", "VIOLET", "1618AN", "70.6200000"],
-            ["10/06/25", "In House", "VA4086E", "VIOLET", "1617AN", "50.0000000"],
-            ["10/06/25", "TRADESPHERE INDUSTRIAL COMMODITIES, INC.", "DP-K16339E", "PINK", "8209X", "1.0400000"],
-            ["10/04/25", "Everbright Net & Twine", "IA1770E", "GOLDEN BROWN", "1616AN", "15.0000000"],
-            ["10/04/25", "Everbright Net & Twine", "IA1770E", "GOLDEN BROWN", "1584AN-1615AN", "800.0000000"],
-            ["10/04/25", "EVERGOOD PLASTIC INDUSTRY INC.", "KA4595E", "FUCHSIA PINK", "1574AN-1583AN", "500.0000000"],
-            ["10/04/25", "FILIPINAS PLASTIC CORP.", "DU-B12434E", "BLUE", "8208X", "40.0000000"]
-        ]
-
-    def load_formulation_data(self):
-        """Load sample formulation data."""
-        return [
-            ["B107", "2.500000", "0.000000", "2.5000000", "0.025000", "2.475000"],
-            ["B37", "4.000000", "0.000000", "1.5000000", "0.015000", "1.485000"],
-            ["L28", "5.000000", "0.000000", "1.0000000", "0.010000", "0.990000"]
-        ]
+        """Stream production records from the store into the table."""
+        if self.production_feeder is not None:
+            self._end_loader(self.production_feeder)
+        self.production_model.set_records([])
+        self.search_index = SearchIndex()
+        self.sort_permutations = SortPermutations()
+        self.load_progress.setRange(0, self.store.count_records())
+        self.load_progress.setValue(0)
+        self.load_progress.show()
+        self.statusBar().showMessage("⏳ Loading production records...")
+
+        self.production_feeder = self._start_loader(self.production_batches, self.append_production_batch,
+                                                    self.on_production_loaded)
+        self.production_feeder.progress.connect(self.load_progress.setValue)
+
+    def production_batches(self):
+        """Archive aged records, then yield the remaining hot records (runs on the loader thread)."""
+        cutoff = date.today() - timedelta(days=ARCHIVE_AFTER_DAYS)
+        self.archive.archive_from(self.store, cutoff.isoformat())
+        self.statistics.load(self.store)
+        self.product_index.load(self.store)
+        self.stats_changed.emit()
+        yield from self.store.iter_records()
+
+    def show_formulation(self, formulation, qty_kg):
+        """Show a formulation's materials for one batch of qty_kg in the material table."""
+        rows = []
+        if formulation is not None:
+            names = [material for material, _ in formulation.materials]
+            result = compute_consumption([concentration for _, concentration in formulation.materials],
+                                         formulation.dosage, formulation.ld_percent, qty_kg, qty_kg)
+            rows = material_rows(names, result)
+        self.material_model.set_records(rows)
+
+    def show_record_materials(self, index):
+        """Show the materials behind the clicked production record."""
+        source_row = self.production_model.source_row(index.row())
+        self.production_model.highlight_row = source_row
+        self.production_table.viewport().update()
+        record = self.production_model.source_record(source_row)
+        formulation = self.formulations.for_product(record[2])
+        self.show_formulation(formulation, float(record[5]))
+        if formulation is None:
+            self.statusBar().showMessage(f"No formulation on file for {record[2]}")
+
+    def append_production_batch(self, batch):
+        self.production_model.append_records(batch)
+        self.search_index.add_records(batch)
+
+    def on_entries_generated(self, result):
+        """Show freshly generated entries without reloading the table."""
+        self.append_production_batch([(datetime.strptime(record[0], "%Y-%m-%d").strftime("%m/%d/%y"), *record[1:6])
+                                      for record in result.records])
+        # While loading, on_indexes_ready sorts and filters everything at the end
+        if self.load_progress.isHidden():
+            self.apply_sort()
+            self.apply_date_filter()
+        self.statusBar().showMessage(
+            f"✅ Generated {len(result.records)} entr{'y' if len(result.records) == 1 else 'ies'} "
+            f"in {result.elapsed * 1000:.0f} ms ({result.rate:,.0f} entries/s)")
+
+    def on_production_loaded(self):
+        """Finish the search index and sort orders on the loader thread once every record is in."""
+        self.statusBar().showMessage("⏳ Indexing production records...")
+        self.production_feeder = self._start_loader(
+            partial(self.index_batches, self.search_index, SortPermutations.columns(self.production_model)),
+            self.install_indexes, self.on_indexes_ready)
+
+    @staticmethod
+    def index_batches(search_index, sort_columns):
+        """Build the search index's sorted arrays and every sort order (runs on the loader thread)."""
+        sort_permutations = SortPermutations()
+        sort_permutations.extend(*sort_columns)
+        yield [(search_index, search_index.compacted(), sort_permutations)]
+
+    def install_indexes(self, batch):
+        for search_index, compacted, sort_permutations in batch:
+            search_index.install(compacted)
+            # Rows generated while they were built are merged in by the next get()
+            self.sort_permutations = sort_permutations
+
+    def on_indexes_ready(self):
+        self.load_progress.hide()
+        self.build_date_index()
+        self.show_date_bounds()
+        self.check_lot_allocations()
+        self.apply_sort()
+        if self.lot_number_edit.text().strip() or self.search_edit.text().strip():
+            self.search_records()
+
+    def check_lot_allocations(self):
+        """Report records whose lot ranges overlap or duplicate another record's."""
+        overlaps = self.search_index.lot_ranges.overlaps()
+        if overlaps:
+            row, other = overlaps[0]
+            self.statusBar().showMessage(
+                f"⚠ {len(overlaps)} overlapping lot allocation(s), e.g. "
+                f"{self.production_model.source_record(row)[4]} and {self.production_model.source_record(other)[4]}")
+        else:
+            self.statusBar().showMessage("✅ Ready | MBPI System 2025")
+
+    def refresh_statistics(self):
+        """Show the running totals; reading them never rescans records."""
+        self.total_records_value.setText(str(self.statistics.record_count))
+        self.materials_used_value.setText(str(self.statistics.materials_used))
+
+    def on_load_failed(self, message):
+        self.load_progress.hide()
+        self.statusBar().showMessage(f"❌ Failed to load data: {message}")
+
+    def closeEvent(self, event):
+        for feeder in list(self._feeders):
+            self._end_loader(feeder)
+        for worker in self._exports:
+            worker.cancel()
+        # The entry on screen was never generated, so its ID goes back with the rest of the block
+        if self.auto_generate_tab is not None:
+            self.production_ids.give_back(self.auto_generate_tab.production_id)
+        self.production_ids.close()
+        self.ledger.close()
+        super().closeEvent(event)
 
     def setup_ui(self):
         self.create_menu_bar()
@@ -515,9 +314,12 @@ class MainApplicationWindow(QMainWindow):
 
         self.tab_widget.addTab(tab1, "Production Records")
 
-        # Second Tab: Auto Generate
-        tab2 = AutoGenerateTab(self.username, self.current_date, self)
-        self.tab_widget.addTab(tab2, "Auto Generate")
+        # Second Tab: Auto Generate, built the first time it is opened
+        self.auto_generate_tab = None
+        self.auto_generate_page = QWidget()
+        QVBoxLayout(self.auto_generate_page).setContentsMargins(0, 0, 0, 0)
+        self.tab_widget.addTab(self.auto_generate_page, "Auto Generate")
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
 
         main_layout.addWidget(self.tab_widget)
 
@@ -534,13 +336,13 @@ class MainApplicationWindow(QMainWindow):
         left_layout = QVBoxLayout()
         left_layout.setSpacing(2)
         title = QLabel("Production Management")
-        title.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
-        title.setStyleSheet("color: white;")
+        title.setFont(font(16, bold=True))
+        title.setProperty("tone", "inverse")
         left_layout.addWidget(title)
 
         subtitle = QLabel("Auto Generate Records - With Consumption")
-        subtitle.setFont(QFont("Segoe UI", 9))
-        subtitle.setStyleSheet("color: rgba(255, 255, 255, 0.8);")
+        subtitle.setFont(font(9))
+        subtitle.setProperty("tone", "inverse-muted")
         left_layout.addWidget(subtitle)
 
         layout.addLayout(left_layout)
@@ -548,24 +350,18 @@ class MainApplicationWindow(QMainWindow):
 
         # Right: User info
         user_frame = QFrame()
-        user_frame.setStyleSheet("""
-            QFrame {
-                background-color: rgba(255, 255, 255, 0.15);
-                border-radius: 8px;
-                padding: 3px 10px;
-            }
-        """)
+        user_frame.setObjectName("userFrame")
         user_layout = QHBoxLayout(user_frame)
         user_layout.setSpacing(8)
 
         user_icon = QLabel("👤")
-        user_icon.setFont(QFont("Segoe UI", 14))
+        user_icon.setFont(font(14))
         user_layout.addWidget(user_icon)
 
-        user_name = QLabel(self.username)
-        user_name.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
-        user_name.setStyleSheet("color: white;")
-        user_layout.addWidget(user_name)
+        self.user_name_label = QLabel(self.username)
+        self.user_name_label.setFont(font(9, bold=True))
+        self.user_name_label.setProperty("tone", "inverse")
+        user_layout.addWidget(self.user_name_label)
 
         layout.addWidget(user_frame)
 
@@ -581,12 +377,12 @@ class MainApplicationWindow(QMainWindow):
 
         # LOT NO Display
         lot_label = QLabel("LOT NO:")
-        lot_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        lot_label.setFont(font(10, bold=True))
         layout.addWidget(lot_label)
 
         self.lot_no_value = QLabel("8196X - ROWELL LITHOGRAPHY & METAL CLOSURE")
-        self.lot_no_value.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-        self.lot_no_value.setStyleSheet("color: #2196F3;")
+        self.lot_no_value.setFont(font(10, bold=True))
+        self.lot_no_value.setProperty("tone", "accent")
         layout.addWidget(self.lot_no_value)
 
         layout.addStretch()
@@ -609,6 +405,17 @@ class MainApplicationWindow(QMainWindow):
 
         search_btn = ModernButton("Search", primary=True)
         search_btn.setFixedHeight(36)
+        search_btn.clicked.connect(self.search_records)
+        self.lot_number_edit.returnPressed.connect(self.search_records)
+        self.search_edit.returnPressed.connect(self.search_records)
+
+        # Search as you type, once typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.search_records)
+        self.lot_number_edit.textChanged.connect(self.search_timer.start)
+        self.search_edit.textChanged.connect(self.search_timer.start)
         search_layout.addWidget(search_btn)
 
         layout.addLayout(search_layout)
@@ -625,16 +432,15 @@ class MainApplicationWindow(QMainWindow):
 
         # Header
         title = QLabel("📊 Production Records")
-        title.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        title.setFont(font(10, bold=True))
         layout.addWidget(title)
 
         # Table
-        self.production_table = QTableWidget()
-        self.production_table.setRowCount(len(self.production_data))
-        self.production_table.setColumnCount(6)
-        self.production_table.setHorizontalHeaderLabels([
-            "Date", "Customer", "Product Code", "Color", "Lot No.", "Qty Produced"
-        ])
+        self.production_model = ProductionTableModel(parent=self, page_size=PAGE_SIZE)
+        self.production_model.highlight_row = 3  # Highlight selected row
+        self.production_table = QTableView()
+        self.production_table.setModel(self.production_model)
+        self.production_table.clicked.connect(self.show_record_materials)
 
         # Modern table styling
         self.production_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
@@ -642,19 +448,10 @@ class MainApplicationWindow(QMainWindow):
         self.production_table.setAlternatingRowColors(True)
         self.production_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.production_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
-        self.production_table.setFont(QFont("Segoe UI", 9))
-        self.production_table.horizontalHeader().setFont(QFont("Segoe UI", 8, QFont.Weight.Bold))
+        self.production_table.setFont(font(9))
+        self.production_table.horizontalHeader().setFont(font(8, bold=True))
         self.production_table.setMaximumHeight(250)
 
-        # Populate table
-        for row, row_data in enumerate(self.production_data):
-            for col, item_data in enumerate(row_data):
-                item = QTableWidgetItem(str(item_data))
-                item.setFont(QFont("Segoe UI", 9))
-                self.production_table.setItem(row, col, item)
-                if row == 3:  # Highlight selected row
-                    item.setBackground(QColor("#E3F2FD"))
-
         layout.addWidget(self.production_table)
 
         return card
@@ -675,32 +472,32 @@ class MainApplicationWindow(QMainWindow):
         stats_layout.setSpacing(5)
 
         stats_title = QLabel("📈 Statistics")
-        stats_title.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        stats_title.setFont(font(10, bold=True))
         stats_layout.addWidget(stats_title)
 
         # Total records
         total_label = QLabel("Total Records")
-        total_label.setFont(QFont("Segoe UI", 8))
-        total_label.setStyleSheet("color: #757575;")
+        total_label.setFont(font(8))
+        total_label.setProperty("tone", "muted")
         stats_layout.addWidget(total_label)
 
-        total_value = QLabel(str(len(self.production_data)))
-        total_value.setFont(QFont("Segoe UI", 18, QFont.Weight.Bold))
-        total_value.setStyleSheet("color: #2196F3;")
-        stats_layout.addWidget(total_value)
+        self.total_records_value = QLabel("0")
+        self.total_records_value.setFont(font(18, bold=True))
+        self.total_records_value.setProperty("tone", "accent")
+        stats_layout.addWidget(self.total_records_value)
 
         stats_layout.addSpacing(5)
 
         # Total materials
         mat_label = QLabel("Materials Used")
-        mat_label.setFont(QFont("Segoe UI", 8))
-        mat_label.setStyleSheet("color: #757575;")
+        mat_label.setFont(font(8))
+        mat_label.setProperty("tone", "muted")
         stats_layout.addWidget(mat_label)
 
-        mat_value = QLabel(str(len(self.formulation_data)))
-        mat_value.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
-        mat_value.setStyleSheet("color: #4CAF50;")
-        stats_layout.addWidget(mat_value)
+        self.materials_used_value = QLabel("0")
+        self.materials_used_value.setFont(font(16, bold=True))
+        self.materials_used_value.setProperty("tone", "success")
+        stats_layout.addWidget(self.materials_used_value)
 
         stats_layout.addStretch()
         layout.addWidget(stats_card)
@@ -713,13 +510,14 @@ class MainApplicationWindow(QMainWindow):
         actions_layout.setSpacing(8)
 
         actions_title = QLabel("⚡ Quick Actions")
-        actions_title.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        actions_title.setFont(font(10, bold=True))
         actions_layout.addWidget(actions_title)
 
         new_btn = ModernButton("➕ New Entry", primary=True)
         actions_layout.addWidget(new_btn)
 
         export_btn = ModernButton("📤 Export Data")
+        export_btn.clicked.connect(self.export_data)
         actions_layout.addWidget(export_btn)
 
         refresh_btn = ModernButton("🔄 Refresh")
@@ -740,30 +538,19 @@ class MainApplicationWindow(QMainWindow):
 
         # Header
         title = QLabel("🧪 Material Composition")
-        title.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        title.setFont(font(10, bold=True))
         layout.addWidget(title)
 
         # Table
-        self.material_table = QTableWidget()
-        self.material_table.setRowCount(len(self.formulation_data))
-        self.material_table.setColumnCount(6)
-        self.material_table.setHorizontalHeaderLabels([
-            "Material", "Large Scale (KG)", "Small Scale (G)",
-            "Total Weight (KG)", "Total Loss (KG)", "Total Consumption (KG)"
-        ])
+        self.material_model = MaterialTableModel(parent=self)
+        self.material_table = QTableView()
+        self.material_table.setModel(self.material_model)
 
         self.material_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.material_table.verticalHeader().setVisible(False)
         self.material_table.setMaximumHeight(200)
-        self.material_table.setFont(QFont("Segoe UI", 9))
-        self.material_table.horizontalHeader().setFont(QFont("Segoe UI", 8, QFont.Weight.Bold))
-
-        # Populate material table
-        for row, row_data in enumerate(self.formulation_data):
-            for col, item_data in enumerate(row_data):
-                item = QTableWidgetItem(str(item_data))
-                item.setFont(QFont("Segoe UI", 9))
-                self.material_table.setItem(row, col, item)
+        self.material_table.setFont(font(9))
+        self.material_table.horizontalHeader().setFont(font(8, bold=True))
 
         layout.addWidget(self.material_table)
 
@@ -782,6 +569,7 @@ class MainApplicationWindow(QMainWindow):
         filters_layout.setSpacing(15)
 
         self.all_data_chk = QCheckBox("All Data")
+        self.all_data_chk.setChecked(True)
         filters_layout.addWidget(self.all_data_chk)
 
         self.date_old_chk = QCheckBox("Date Old")
@@ -796,6 +584,16 @@ class MainApplicationWindow(QMainWindow):
         self.prodcode_chk = QCheckBox("Product Code A-Z")
         filters_layout.addWidget(self.prodcode_chk)
 
+        self.sort_checks = {
+            "date_old": self.date_old_chk,
+            "date_new": self.date_new_chk,
+            "customer": self.cust_name_chk,
+            "product_code": self.prodcode_chk,
+        }
+        for key, check in self.sort_checks.items():
+            check.toggled.connect(partial(self.on_sort_toggled, key))
+        self.all_data_chk.toggled.connect(self.on_all_data_toggled)
+
         filters_layout.addStretch()
 
         layout.addLayout(filters_layout)
@@ -805,7 +603,7 @@ class MainApplicationWindow(QMainWindow):
         actions_layout.setSpacing(10)
 
         date_from_label = QLabel("From:")
-        date_from_label.setFont(QFont("Segoe UI", 9))
+        date_from_label.setFont(font(9))
         actions_layout.addWidget(date_from_label)
 
         self.date_from_edit = QDateEdit()
@@ -815,7 +613,7 @@ class MainApplicationWindow(QMainWindow):
         actions_layout.addWidget(self.date_from_edit)
 
         date_to_label = QLabel("To:")
-        date_to_label.setFont(QFont("Segoe UI", 9))
+        date_to_label.setFont(font(9))
         actions_layout.addWidget(date_to_label)
 
         self.date_to_edit = QDateEdit()
@@ -824,11 +622,14 @@ class MainApplicationWindow(QMainWindow):
         self.date_to_edit.setFixedWidth(120)
         actions_layout.addWidget(self.date_to_edit)
 
+        self.date_from_edit.dateChanged.connect(self.on_date_range_changed)
+        self.date_to_edit.dateChanged.connect(self.on_date_range_changed)
+
         actions_layout.addStretch()
 
         # Admin Access
         admin_label = QLabel("🔐 Admin:")
-        admin_label.setFont(QFont("Segoe UI", 9))
+        admin_label.setFont(font(9))
         actions_layout.addWidget(admin_label)
 
         self.admin_pwd_edit = QLineEdit()
@@ -839,9 +640,11 @@ class MainApplicationWindow(QMainWindow):
 
         # Export Buttons
         export_btn = ModernButton("📤 Export", primary=True)
+        export_btn.clicked.connect(self.export_data)
         actions_layout.addWidget(export_btn)
 
         export_old_btn = ModernButton("📂 Export Old")
+        export_old_btn.clicked.connect(self.export_old_data)
         actions_layout.addWidget(export_old_btn)
 
         view_btn = ModernButton("👁 View")
@@ -856,6 +659,141 @@ class MainApplicationWindow(QMainWindow):
 
         return panel
 
+    def search_records(self):
+        """Filter the production table through the in-memory search index."""
+        self.search_timer.stop()
+        lot_no = self.lot_number_edit.text().strip()
+        text = self.search_edit.text().strip()
+
+        mask = self.search_index.search_lot(lot_no) if lot_no else None
+        if text:
+            text_mask = self.search_index.search(text)
+            mask = text_mask if mask is None else mask & text_mask
+        self.production_model.set_filter("search", mask)
+        if mask is None:
+            return
+
+        if self.production_model.rowCount():
+            record = self.production_model.record(0)
+            self.lot_no_value.setText(f"{record[4]} - {record[1]}")
+        else:
+            self.lot_no_value.setText("No matching records")
+
+    def on_sort_toggled(self, key, checked):
+        """Keep the sort checkboxes mutually exclusive and apply the chosen order."""
+        if checked:
+            for other, check in self.sort_checks.items():
+                if other != key and check.isChecked():
+                    check.blockSignals(True)
+                    check.setChecked(False)
+                    check.blockSignals(False)
+        self.apply_sort()
+
+    def apply_sort(self):
+        key = next((key for key, check in self.sort_checks.items() if check.isChecked()), None)
+        order = self.sort_permutations.get(key, self.production_model) if key else None
+        self.production_model.set_sort_order(order)
+
+    def on_all_data_toggled(self, checked):
+        """Show records of every date, paged into the table as it scrolls."""
+        self.apply_date_filter()
+
+    def build_date_index(self):
+        """Index record dates for the From/To filter, leaving the chosen range as it is."""
+        dates = self.production_model.column_array(0)
+        self.date_index.build(dates, self.sort_permutations.get("date_old", self.production_model))
+        del dates
+
+    def show_date_bounds(self):
+        """Start the From/To range at the first and last record dates."""
+        bounds = self.date_index.bounds()
+        if bounds is not None:
+            for edit, ordinal in zip((self.date_from_edit, self.date_to_edit), bounds):
+                edit.blockSignals(True)
+                edit.setDate(QDate(date.fromordinal(ordinal)))
+                edit.blockSignals(False)
+
+    def on_date_range_changed(self):
+        if self.all_data_chk.isChecked():
+            self.all_data_chk.setChecked(False)  # applies the date range via on_all_data_toggled
+        else:
+            self.apply_date_filter()
+
+    def apply_date_filter(self):
+        """Restrict the production table to the From/To range unless All Data is checked."""
+        if self.all_data_chk.isChecked():
+            self.production_model.set_filter("date", None)
+            return
+        if self.date_index.row_count != self.production_model.source_count():
+            self.build_date_index()
+        first = self.date_from_edit.date().toPyDate().toordinal()
+        last = self.date_to_edit.date().toPyDate().toordinal()
+        self.production_model.set_filter("date", self.date_index.mask_between(first, last))
+
+    def export_data(self):
+        """Export the records in the From/To range, or every record when All Data is checked."""
+        if self.all_data_chk.isChecked():
+            self.start_export(None, None, "production_records")
+        else:
+            first = self.date_from_edit.date().toPyDate()
+            last = self.date_to_edit.date().toPyDate()
+            self.start_export(first.isoformat(), last.isoformat(),
+                              f"production_records_{first:%Y%m%d}_{last:%Y%m%d}")
+
+    def export_old_data(self):
+        """Export the archived and hot records dated before the From date."""
+        before = self.date_from_edit.date().toPyDate()
+        last = (before - timedelta(days=1)).isoformat()
+
+        def batches():
+            yield from self.archive.scan(last=last, batch_size=5000)
+            yield from self.store.iter_records(batch_size=5000, last=last)
+
+        self.start_export(None, last, f"production_records_before_{before:%Y%m%d}", batches,
+                          self.archive.count(last=last) + self.store.count_between(None, last))
+
+    def start_export(self, first, last, default_name, batches=None, total=None, headers=EXPORT_HEADERS,
+                     format_row=None):
+        """Stream records to a user-chosen CSV or XLSX file on the thread pool."""
+        path, _ = QFileDialog.getSaveFileName(self, "Export Production Records", f"{default_name}.csv",
+                                              "CSV Files (*.csv);;Excel Workbook (*.xlsx)")
+        if not path:
+            return
+        if batches is None:
+            batches = partial(self.store.iter_records, batch_size=5000, first=first, last=last)
+            total = self.store.count_between(first, last)
+
+        worker = ExportWorker(batches, path, headers, format_row)
+        progress = QProgressDialog("📤 Exporting production records...", "Cancel", 0, total, self)
+        progress.setWindowTitle("Export")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        progress.canceled.connect(worker.cancel)
+        worker.signals.progress.connect(progress.setValue)
+        worker.signals.finished.connect(partial(self.on_export_finished, worker, progress))
+        worker.signals.failed.connect(partial(self.on_export_failed, worker, progress))
+        worker.signals.cancelled.connect(partial(self.on_export_cancelled, worker, progress))
+        self._exports.append(worker)
+        QThreadPool.globalInstance().start(worker)
+
+    def _end_export(self, worker, progress):
+        progress.close()
+        self._exports.remove(worker)
+
+    def on_export_finished(self, worker, progress, path):
+        self._end_export(worker, progress)
+        self.statusBar().showMessage(f"✅ Exported to {path}")
+
+    def on_export_failed(self, worker, progress, message):
+        self._end_export(worker, progress)
+        QMessageBox.warning(self, "Export", f"❌ Export failed: {message}")
+
+    def on_export_cancelled(self, worker, progress):
+        self._end_export(worker, progress)
+        self.statusBar().showMessage("Export cancelled")
+
     def refresh_data(self):
         """Refresh tables."""
         QMessageBox.information(self, "Refresh", "✅ Data refreshed successfully!")
@@ -864,9 +802,34 @@ class MainApplicationWindow(QMainWindow):
         """Handle VIEW button."""
         QMessageBox.information(self, "View", "👁 Viewing selected production record...")
 
+    def open_summary(self, export=False):
+        dialog = SummaryDialog(self.store, self.start_export, self)
+        if export:
+            QTimer.singleShot(0, dialog.export_summary)
+        dialog.exec()
+
+    def view_archives(self):
+        dialog = ArchiveDialog(self.archive, self.store, self)
+        dialog.restored.connect(self.on_archive_restored)
+        dialog.exec()
+
+    def on_archive_restored(self, count):
+        self.statusBar().showMessage(f"♻ Restored {count} archived record(s)")
+        self.load_production_data()
+
+    def receive_stock(self):
+        dialog = ReceiveDialog(self.ledger, self.formulations.material_codes(), self)
+        dialog.received.connect(self.on_stock_received)
+        dialog.exec()
+
+    def on_stock_received(self, material, qty):
+        self.statusBar().showMessage(f"📥 Received {format_fixed(qty, 6)} KG of {material}")
+        if self.auto_generate_tab is not None:
+            self.auto_generate_tab.show_shortfalls()
+
     def create_menu_bar(self):
         menu_bar = self.menuBar()
-        menu_bar.setFont(QFont("Segoe UI", 9))
+        menu_bar.setFont(font(9))
 
         file_menu = menu_bar.addMenu("📁 File")
         view_menu = menu_bar.addMenu("👁 View")
@@ -888,257 +851,45 @@ class MainApplicationWindow(QMainWindow):
         view_menu.addSeparator()
         view_menu.addAction("Dashboard")
 
-        reports_menu.addAction("Export Reports")
-        reports_menu.addAction("Generate Summary")
+        reports_menu.addAction("Export Reports").triggered.connect(partial(self.open_summary, True))
+        reports_menu.addAction("Generate Summary").triggered.connect(partial(self.open_summary, False))
 
+        utilities_menu.addAction("Receive Stock").triggered.connect(self.receive_stock)
         utilities_menu.addAction("System Utilities")
         utilities_menu.addAction("Data Management")
 
-        archive_menu.addAction("View Archives")
-        archive_menu.addAction("Restore Data")
+        archive_menu.addAction("View Archives").triggered.connect(self.view_archives)
+        archive_menu.addAction("Restore Data").triggered.connect(self.view_archives)
 
         system_menu.addAction("User Settings")
         system_menu.addAction("Preferences")
 
     def create_status_bar(self):
         status = self.statusBar()
-        status.setFont(QFont("Segoe UI", 9))
+        status.setFont(font(9))
         status.showMessage("✅ Ready | MBPI System 2025")
 
+        self.load_progress = QProgressBar()
+        self.load_progress.setFixedWidth(200)
+        self.load_progress.setMaximumHeight(14)
+        self.load_progress.hide()
+        status.addPermanentWidget(self.load_progress)
+
     def apply_styles(self):
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #F5F7FA;
-            }
-
-            #headerFrame {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #1976D2, stop:0.5 #2196F3, stop:1 #42A5F5);
-                border: none;
-            }
-
-            #card {
-                background-color: white;
-                border-radius: 12px;
-                border: 1px solid #E0E0E0;
-            }
-
-            #sidePanel {
-                background-color: transparent;
-            }
-
-            #statsCard {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #E3F2FD, stop:1 #BBDEFB);
-                border-radius: 12px;
-                border: none;
-            }
-
-            QLineEdit {
-                background-color: #F5F5F5;
-                border: 2px solid #E0E0E0;
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-size: 9pt;
-                font-family: 'Segoe UI';
-            }
-
-            QLineEdit:focus {
-                border: 2px solid #2196F3;
-                background-color: white;
-            }
-
-            QDateEdit {
-                background-color: #F5F5F5;
-                border: 2px solid #E0E0E0;
-                border-radius: 8px;
-                padding: 6px 10px;
-                font-size: 9pt;
-                font-family: 'Segoe UI';
-            }
-
-            QDateEdit:focus {
-                border: 2px solid #2196F3;
-                background-color: white;
-            }
-
-            QDateEdit::drop-down {
-                border: none;
-                padding-right: 5px;
-            }
-
-            QCheckBox {
-                font-size: 9pt;
-                font-family: 'Segoe UI';
-                spacing: 8px;
-                color: #424242;
-            }
-
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-                border-radius: 4px;
-                border: 2px solid #BDBDBD;
-                background-color: white;
-            }
-
-            QCheckBox::indicator:hover {
-                border-color: #2196F3;
-            }
-
-            QCheckBox::indicator:checked {
-                background-color: #2196F3;
-                border-color: #2196F3;
-                image: none;
-            }
-
-            QTableWidget {
-                background-color: white;
-                gridline-color: #F0F0F0;
-                border: none;
-                border-radius: 8px;
-            }
-
-            QTableWidget::item {
-                padding: 8px;
-                border: none;
-            }
-
-            QTableWidget::item:selected {
-                background-color: #E3F2FD;
-                color: #1976D2;
-            }
-
-            QTableWidget::item:alternate {
-                background-color: #FAFAFA;
-            }
-
-            QHeaderView::section {
-                background-color: #F5F5F5;
-                color: #616161;
-                padding: 8px;
-                border: none;
-                border-bottom: 2px solid #E0E0E0;
-                font-weight: bold;
-            }
-
-            QMenuBar {
-                background-color: white;
-                border-bottom: 1px solid #E0E0E0;
-                padding: 4px;
-                font-family: 'Segoe UI';
-            }
-
-            QMenuBar::item {
-                padding: 6px 12px;
-                background-color: transparent;
-                border-radius: 4px;
-            }
-
-            QMenuBar::item:selected {
-                background-color: #E3F2FD;
-                color: #1976D2;
-            }
-
-            QMenu {
-                background-color: white;
-                border: 1px solid #E0E0E0;
-                border-radius: 8px;
-                padding: 5px;
-            }
-
-            QMenu::item {
-                padding: 8px 25px;
-                border-radius: 4px;
-            }
-
-            QMenu::item:selected {
-                background-color: #E3F2FD;
-                color: #1976D2;
-            }
-
-            QStatusBar {
-                background-color: white;
-                border-top: 1px solid #E0E0E0;
-                color: #757575;
-            }
-
-            QScrollBar:vertical {
-                background-color: #F5F5F5;
-                width: 12px;
-                border-radius: 6px;
-            }
-
-            QScrollBar::handle:vertical {
-                background-color: #BDBDBD;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-
-            QScrollBar::handle:vertical:hover {
-                background-color: #9E9E9E;
-            }
-
-            QTabWidget::pane {
-                border: 1px solid #E0E0E0;
-                background-color: #F5F7FA;
-            }
-
-            QTabBar::tab {
-                background-color: #F5F5F5;
-                padding: 8px 16px;
-                border: 1px solid #E0E0E0;
-                border-bottom: none;
-                font-family: 'Segoe UI';
-                font-size: 9pt;
-            }
-
-            QTabBar::tab:selected {
-                background-color: white;
-                border-top: 2px solid #2196F3;
-            }
-
-            QTabBar::tab:hover {
-                background-color: #E3F2FD;
-            }
-
-            QComboBox {
-                background-color: #F5F5F5;
-                border: 2px solid #E0E0E0;
-                border-radius: 8px;
-                padding: 6px 10px;
-                font-size: 9pt;
-                font-family: 'Segoe UI';
-                min-height: 24px;
-            }
-
-            QComboBox:focus {
-                border: 2px solid #2196F3;
-                background-color: white;
-            }
-
-            QComboBox::drop-down {
-                border: none;
-                width: 20px;
-            }
-
-            QTextEdit {
-                background-color: #FAFAFA;
-                border: 1px solid #E0E0E0;
-                border-radius: 4px;
-                padding: 4px;
-                font-size: 9pt;
-                font-family: 'Segoe UI';
-            }
-        """)
+        # One application-wide stylesheet; a window built before the theme was installed installs it
+        apply_theme()
 
 
 if __name__ == "__main__":
+    Startup_timing.enable()
+    Startup_timing.mark("imports")
     app = QApplication(sys.argv)
 
     # Set application-wide font
-    app.setFont(QFont("Segoe UI", 9))
+    app.setFont(font(9))
 
     window = MainApplicationWindow(username="Admin")
+    Startup_timing.mark("main window built")
+    Startup_timing.report_first_paint(window)
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -1,9 +1,11 @@
+import Startup_timing  # first, so startup timing covers every other import
 import sys
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QLineEdit, QPushButton, QSizePolicy, QCompleter, QMessageBox)
-from PyQt6.QtCore import Qt, QSize, QStringListModel
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, QSize, QStringListModel, QTimer
 from Home import MainApplicationWindow
+from production_tab.Theme import apply_theme, font
+from production_data.Users import USERNAMES
 
 class LoginWindow(QMainWindow):
     def __init__(self):
@@ -12,9 +14,30 @@ class LoginWindow(QMainWindow):
         self.setGeometry(100, 100, 500, 400)
         self.setFixedSize(500, 400)
         self.main_app_window = None # To hold the instance of the main app window
+        self.logged_in = False
         self.setup_ui()
         self.apply_styles()
         self.center_window()
+        # Build the main window while the user types; its data starts loading in the background
+        QTimer.singleShot(0, self.warm_up)
+
+    def warm_up(self):
+        """Pre-build the main window hidden so a successful login only has to show it."""
+        if self.main_app_window is None:
+            self.main_app_window = MainApplicationWindow()
+            Startup_timing.mark("main window pre-built")
+
+    def discard_warm_up(self):
+        if self.main_app_window is not None:
+            self.main_app_window.close()
+            self.main_app_window.deleteLater()
+            self.main_app_window = None
+
+    def closeEvent(self, event):
+        # Leaving without logging in throws the pre-built window away
+        if not self.logged_in:
+            self.discard_warm_up()
+        super().closeEvent(event)
 
     def center_window(self):
         screen_geometry = QApplication.primaryScreen().geometry()
@@ -37,19 +60,19 @@ class LoginWindow(QMainWindow):
         form_layout.setSpacing(10)
 
         title_label = QLabel("Login")
-        title_label.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        title_label.setFont(font(14, bold=True, family="Arial"))
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         form_layout.addWidget(title_label)
         form_layout.addSpacing(10)
 
         username_layout = QHBoxLayout()
         username_label = QLabel("USERNAME:")
-        username_label.setFont(QFont("Arial", 10))
+        username_label.setFont(font(10, family="Arial"))
         username_layout.addWidget(username_label)
 
         self.username_entry = QLineEdit()
-        self.username_entry.setFont(QFont("Arial", 10))
-        self.usernames_list = ["Admin", "User1 Technician", "User2 Manager", "Guest"]
+        self.username_entry.setFont(font(10, family="Arial"))
+        self.usernames_list = USERNAMES
         completer = QCompleter(self.usernames_list)
         completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
         completer.setFilterMode(Qt.MatchFlag.MatchStartsWith)
@@ -79,11 +102,11 @@ class LoginWindow(QMainWindow):
 
         password_layout = QHBoxLayout()
         password_label = QLabel("PASSWORD:")
-        password_label.setFont(QFont("Arial", 10))
+        password_label.setFont(font(10, family="Arial"))
         password_layout.addWidget(password_label)
 
         self.password_entry = QLineEdit()
-        self.password_entry.setFont(QFont("Arial", 10))
+        self.password_entry.setFont(font(10, family="Arial"))
         self.password_entry.setEchoMode(QLineEdit.EchoMode.Password)
         self.password_entry.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         self.password_entry.returnPressed.connect(self.handle_login)
@@ -93,21 +116,21 @@ class LoginWindow(QMainWindow):
 
         button_layout = QHBoxLayout()
         self.login_button = QPushButton("LOGIN")
-        self.login_button.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+        self.login_button.setFont(font(10, bold=True, family="Arial"))
         self.login_button.setFixedSize(100, 35)
         self.login_button.clicked.connect(self.handle_login)
         button_layout.addWidget(self.login_button)
 
         self.exit_button = QPushButton("EXIT")
-        self.exit_button.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+        self.exit_button.setFont(font(10, bold=True, family="Arial"))
         self.exit_button.setFixedSize(100, 35)
-        self.exit_button.clicked.connect(QApplication.instance().quit)
+        self.exit_button.clicked.connect(self.close)
         button_layout.addWidget(self.exit_button)
         form_layout.addLayout(button_layout)
         form_layout.addStretch()
 
         footer_label = QLabel("MBPI - 2025")
-        footer_label.setFont(QFont("Arial", 8))
+        footer_label.setFont(font(8, family="Arial"))
         footer_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         footer_label.setStyleSheet("color: gray;")
         form_layout.addWidget(footer_label)
@@ -131,6 +154,8 @@ class LoginWindow(QMainWindow):
                 background: transparent;
             }
             QLineEdit {
+                font-family: Arial;
+                font-size: 10pt;
                 border: 1px solid #cccccc;
                 border-radius: 5px;
                 padding: 5px;
@@ -173,17 +198,25 @@ class LoginWindow(QMainWindow):
         if username == "Admin" and password == "admin123":
             QMessageBox.information(self, "Login Successful", f"Welcome, {username}!")
             print("Login Successful!")
+            self.logged_in = True
             self.close() # Close the login window
 
-            # Instantiate and show the main application window
-            self.main_app_window = MainApplicationWindow(username=username)
+            # Show the pre-built main window, building it now if login beat the warm-up
+            self.warm_up()
+            self.main_app_window.set_user(username)
+            Startup_timing.report_first_paint(self.main_app_window, "main window first paint")
             self.main_app_window.show()
         else:
             QMessageBox.warning(self, "Login Error", "Invalid Username or Password.")
             print("Invalid Credentials")
 
 if __name__ == "__main__":
+    Startup_timing.enable()
+    Startup_timing.mark("imports")
     app = QApplication(sys.argv)
+    apply_theme(app)
     window = LoginWindow()
+    Startup_timing.mark("login window built")
+    Startup_timing.report_first_paint(window, "login first paint")
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""Startup timing report, switched on with --startup-timing.
+
+Import this module before any other application module: its import time is the zero point.
+Every function is a no-op until enable() is called.
+"""
+import sys
+import time
+
+STARTED = time.perf_counter()
+STARTUP_TIMING_FLAG = "--startup-timing"
+
+_marks = []
+_enabled = False
+_watchers = []
+
+
+def enable(argv=None):
+    """Turn the report on if --startup-timing is among argv; return whether it is on."""
+    global _enabled
+    _enabled = STARTUP_TIMING_FLAG in (sys.argv if argv is None else argv)
+    return _enabled
+
+
+def mark(label):
+    """Record that a startup step has just finished."""
+    if _enabled:
+        _marks.append((label, time.perf_counter()))
+
+
+def report_first_paint(window, label="first paint"):
+    """Mark label and print the report when window (or any of its children) first paints."""
+    if not _enabled:
+        return
+    from PyQt6.QtCore import QObject, QEvent
+    from PyQt6.QtWidgets import QApplication, QWidget
+
+    class FirstPaintWatcher(QObject):
+        def eventFilter(self, watched, event):
+            if (event.type() == QEvent.Type.Paint and isinstance(watched, QWidget)
+                    and watched.window() is window):
+                QApplication.instance().removeEventFilter(self)
+                _watchers.remove(self)
+                mark(label)
+                print_report()
+            return False
+
+    watcher = FirstPaintWatcher()
+    _watchers.append(watcher)
+    QApplication.instance().installEventFilter(watcher)
+
+
+def print_report(stream=None):
+    stream = stream or sys.stderr
+    previous = STARTED
+    for label, at in _marks:
+        print(f"{label:<28}{(at - previous) * 1000:9.1f} ms   {(at - STARTED) * 1000:9.1f} ms total", file=stream)
+        previous = at
+    print(file=stream)
@@ -0,0 +1,60 @@
+"""Entries per second written by GENERATE ADVANCE, against committing one entry at a time.
+
+    python benchmarks/bench_batch_generate.py --lots 1000 --rounds 5
+
+Both sides write the same production and consumption rows for the default formulation.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from production_data.Production_store import ProductionStore  # noqa: E402
+from production_data.Id_allocator import IdAllocator  # noqa: E402
+from production_data.Formulation_repository import FormulationRepository, DEFAULT_FORMULATION_ID  # noqa: E402
+from production_data.Batch_generator import BatchGenerator, expand_lots, split_evenly  # noqa: E402
+from production_data.Fixed_point import UNITS_PER_KG  # noqa: E402
+
+
+def run(path, lot_count, rounds, per_entry):
+    store = ProductionStore(path)
+    allocator = IdAllocator(store)
+    generator = BatchGenerator(store, allocator)
+    formulation = FormulationRepository(store).get(DEFAULT_FORMULATION_ID)
+    written = 0
+    began = time.perf_counter()
+    for round_no in range(rounds):
+        first = 100000 + round_no * lot_count
+        lots = expand_lots(f"{first}AN-{first + lot_count - 1}AN")
+        quantities = split_evenly(25 * lot_count * UNITS_PER_KG, lot_count)
+        if per_entry:
+            for lot, qty in zip(lots, quantities):
+                generator.generate(formulation, "2025-10-04", "Everbright Net & Twine", "BLUE", [lot], [qty],
+                                   formulation.dosage, formulation.ld_percent)
+        else:
+            generator.generate(formulation, "2025-10-04", "Everbright Net & Twine", "BLUE", lots, quantities,
+                               formulation.dosage, formulation.ld_percent)
+        written += lot_count
+    elapsed = time.perf_counter() - began
+    allocator.close()
+    store.close()
+    return written / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lots", type=int, default=1000, help="lots per GENERATE ADVANCE range")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for label, per_entry in (("one transaction per entry", True), ("one transaction per range", False)):
+            rate = run(os.path.join(directory, f"bench_{per_entry}.db"), args.lots, args.rounds, per_entry)
+            print(f"{label:<26}: {rate:>10,.0f} entries/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Time from NEW to a form ready for input: rebuilding the Auto Generate form against recycling it.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_form_reset.py --entries 200
+
+Each entry types the fields an encoder usually changes (lot, quantities, order form) and then
+starts the next one. The rebuild side replaces the form with a fresh FormEngine, as constructing
+a new tab would; the reset side rewrites only the dirty fields of the same widgets, and the copy
+side refills a cleared form from the previous entry's snapshot. Every step includes the repaint, and the median
+must stay within one 60 Hz frame.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QEvent  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QVBoxLayout, QWidget  # noqa: E402
+
+from production_tab.Theme import apply_theme  # noqa: E402
+from production_tab.Form_engine import FormEngine  # noqa: E402
+from production_tab.Auto_generate import AUTO_GENERATE_FIELDS  # noqa: E402
+
+TARGET_MS = 1000 / 60
+EDITS = {"lot_no": "1584AN-1615AN", "qty_req": "250.0000000", "qty_per_batch": "25.0000000",
+         "order_form": "OF-10231", "notes": "rush order"}
+
+
+def type_entry(form, number):
+    for name, text in EDITS.items():
+        form.set_value(name, f"{text}{number}" if name == "notes" else text)
+
+
+def run(app, entries, mode):
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    form = FormEngine(AUTO_GENERATE_FIELDS, defaults={"prepared_by": "Admin"})
+    layout.addWidget(form.widget)
+    window.show()
+    app.processEvents()
+    timings = []
+    for number in range(entries):
+        type_entry(form, number)
+        app.processEvents()
+        previous = form.snapshot()
+        if mode == "copy":
+            form.reset(notify=False)
+            app.processEvents()
+        began = time.perf_counter()
+        if mode == "rebuild":
+            form.widget.deleteLater()
+            app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+            form = FormEngine(AUTO_GENERATE_FIELDS, defaults={"prepared_by": "Admin"})
+            layout.addWidget(form.widget)
+        elif mode == "reset":
+            form.reset(notify=False)
+        else:
+            form.restore(previous, notify=False)
+        form.field("product_code").setFocus()
+        app.processEvents()
+        timings.append((time.perf_counter() - began) * 1000)
+    window.close()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    apply_theme(app)
+    print(f"{args.entries} entries, {len(AUTO_GENERATE_FIELDS)} fields, target {TARGET_MS:.1f} ms")
+    for mode in ("rebuild", "reset", "copy"):
+        timings = run(app, args.entries, mode)
+        median = statistics.median(timings)
+        worst = sorted(timings)[int(len(timings) * 0.95) - 1]
+        verdict = "ok" if median <= TARGET_MS else "over target"
+        print(f"{mode:<8} median {median:7.2f} ms   p95 {worst:7.2f} ms   {verdict}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Production ID allocations per second with several processes drawing from one database.
+
+    python benchmarks/bench_id_allocator.py --processes 4 --ids 20000 --block-size 100
+
+Each process opens its own store and allocator, as separate encoder workstations would.
+The run fails if any ID is handed out twice. A crashed client is simulated at the end to
+check that its unused IDs are recovered.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from production_data.Production_store import ProductionStore  # noqa: E402
+from production_data.Id_allocator import IdAllocator  # noqa: E402
+
+
+def allocate(path, count, block_size, start, results):
+    store = ProductionStore(path)
+    allocator = IdAllocator(store, block_size=block_size)
+    start.wait()
+    began = time.perf_counter()
+    ids = [allocator.next_id() for _ in range(count)]
+    elapsed = time.perf_counter() - began
+    allocator.close()
+    results.put((ids, elapsed))
+
+
+def run(path, processes, count, block_size):
+    start = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=allocate, args=(path, count, block_size, start, results))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    time.sleep(0.5)  # let every process open its store before the clock starts
+    began = time.perf_counter()
+    start.set()
+    collected = [results.get() for _ in workers]
+    wall = time.perf_counter() - began
+    for worker in workers:
+        worker.join()
+
+    ids = [value for batch, _ in collected for value in batch]
+    if len(ids) != len(set(ids)):
+        raise SystemExit(f"duplicate IDs handed out: {len(ids) - len(set(ids))}")
+    return len(ids) / wall
+
+
+def check_crash_recovery(path, block_size):
+    store = ProductionStore(path)
+    crashed = IdAllocator(store, block_size=block_size, lease_seconds=0)
+    used = crashed.next_id()
+    store.connection().execute("UPDATE production_record SET production_id = ? WHERE id = 1", (used,))
+    store.connection().commit()
+    # The crashed client never calls close(); its lease expires immediately
+    survivor = IdAllocator(store, block_size=block_size)
+    recovered = survivor.next_id()
+    survivor.close()
+    return used, recovered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--ids", type=int, default=20000, help="IDs drawn per process")
+    parser.add_argument("--block-size", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for block_size in (1, args.block_size):
+            path = os.path.join(directory, f"bench_{block_size}.db")
+            ProductionStore(path).close()
+            count = args.ids if block_size > 1 else min(args.ids, 1000)
+            rate = run(path, args.processes, count, block_size)
+            print(f"block size {block_size:>5}: {rate:>12,.0f} IDs/s across {args.processes} processes")
+        used, recovered = check_crash_recovery(os.path.join(directory, "bench_crash.db"), args.block_size)
+        print(f"crash recovery: first unused ID after a crash {recovered} (crashed client used {used})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Widget construction and repolish time: per-widget stylesheets against the shared theme.
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_theme.py --forms 20
+
+Each form has the Auto Generate tab's shape: labelled required and optional fields plus a row of
+buttons. The per-widget side builds it the way the tab used to, with a new QFont per label and a
+setStyleSheet per field and button under a window stylesheet; the themed side uses the cached font
+registry and stylesheet properties under the one application stylesheet. Then every field flips
+between required and optional (a setStyleSheet against a property change and repolish), and the
+colors change (every stylesheet re-set against one application stylesheet).
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtGui import QFont  # noqa: E402
+from PyQt6.QtWidgets import (QApplication, QFormLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,  # noqa: E402
+                             QVBoxLayout, QWidget)
+
+from production_tab.Theme import STYLESHEET, apply_theme, font, restyle  # noqa: E402
+
+FIELDS = 20
+BUTTONS = ["GENERATE", "TUMBLER", "GENERATE ADVANCE", "PRINT", "NEW", "CLOSE"]
+FIELD_STYLE = "background-color: #FFF3E0; border: 1px solid #FF9800; border-radius: 4px; padding: 4px;"
+WHITE_FIELD_STYLE = "background-color: #FAFAFA; border: 1px solid #E0E0E0; border-radius: 4px; padding: 4px;"
+BUTTON_STYLE = """
+    QPushButton { background-color: white; color: #424242; border: 1px solid #E0E0E0;
+                  border-radius: 6px; padding: 8px 16px; font-weight: 500; font-size: 9pt; }
+    QPushButton:hover { background-color: #F5F5F5; border-color: #BDBDBD; }
+    QPushButton:pressed { background-color: #EEEEEE; }
+"""
+
+
+def build_form(themed):
+    form = QWidget()
+    layout = QVBoxLayout(form)
+    fields = QFormLayout()
+    for number in range(FIELDS):
+        label = QLabel(f"FIELD {number}")
+        label.setFont(font(9) if themed else QFont("Segoe UI", 9))
+        edit = QLineEdit()
+        if themed:
+            edit.setProperty("field", "required" if number % 2 else "optional")
+        else:
+            edit.setStyleSheet(FIELD_STYLE if number % 2 else WHITE_FIELD_STYLE)
+        fields.addRow(label, edit)
+    layout.addLayout(fields)
+    buttons = QHBoxLayout()
+    for text in BUTTONS:
+        button = QPushButton(text)
+        if themed:
+            button.setProperty("variant", "secondary")
+        else:
+            button.setStyleSheet(BUTTON_STYLE)
+        buttons.addWidget(button)
+    layout.addLayout(buttons)
+    return form
+
+
+def build(app, count, themed):
+    """Build and show count forms; return (construction seconds, window)."""
+    began = time.perf_counter()
+    window = QWidget()
+    if not themed:
+        window.setStyleSheet(STYLESHEET)
+    layout = QVBoxLayout(window)
+    for _ in range(count):
+        layout.addWidget(build_form(themed))
+    window.show()
+    app.processEvents()
+    return time.perf_counter() - began, window
+
+
+def recolor(sheet):
+    return sheet.replace("#FFF3E0", "#FFFDE7").replace("#F5F5F5", "#FAFAFA")
+
+
+def change_theme(app, window, themed):
+    """Swap in recolored stylesheets and return the seconds taken to repolish everything."""
+    began = time.perf_counter()
+    if themed:
+        app.setStyleSheet(recolor(STYLESHEET))
+    else:
+        window.setStyleSheet(recolor(STYLESHEET))
+        for widget in window.findChildren(QWidget):
+            if widget.styleSheet():
+                widget.setStyleSheet(recolor(widget.styleSheet()))
+    app.processEvents()
+    return time.perf_counter() - began
+
+
+def toggle_fields(app, window, themed):
+    """Flip every field between required and optional and return the seconds it took."""
+    began = time.perf_counter()
+    for edit in window.findChildren(QLineEdit):
+        if themed:
+            restyle(edit, field="optional" if edit.property("field") == "required" else "required")
+        else:
+            edit.setStyleSheet(WHITE_FIELD_STYLE if edit.styleSheet() == FIELD_STYLE else FIELD_STYLE)
+    app.processEvents()
+    return time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--forms", type=int, default=20)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    widgets = args.forms * (FIELDS * 2 + len(BUTTONS))
+    print(f"{args.forms} forms, {widgets} widgets")
+    for label, themed in (("per-widget stylesheets", False), ("shared theme", True)):
+        if themed:
+            apply_theme(app)
+        build_time, window = build(app, args.forms, themed)
+        toggle_time = toggle_fields(app, window, themed)
+        theme_time = change_theme(app, window, themed)
+        window.close()
+        print(f"{label:<24} build {build_time * 1000:8.1f} ms   field restyle {toggle_time * 1000:8.1f} ms   "
+              f"theme change {theme_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+import json
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from datetime import date
+
+import numpy as np
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "archive")
+
+# Records older than this many days are moved out of the hot store on startup
+ARCHIVE_AFTER_DAYS = 730
+
+MAGIC = b"PCOL1\n"
+HEADER_SIZE = struct.Struct("<I")
+DICTIONARY_COLUMNS = ("customer", "product_code", "color")
+
+
+def month_of(iso_date):
+    return iso_date[:7]
+
+
+class ArchivePartition:
+    """One month of archived records in a memory-mapped, zlib-compressed columnar file.
+
+    Layout: MAGIC, a little-endian header length, a JSON header with row count, date
+    bounds, per-column offsets and the dictionaries for customer/product code/color,
+    then one compressed block per column.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        start = len(MAGIC)
+        if self._map[:start] != MAGIC:
+            raise ValueError(f"{path} is not a production archive partition")
+        (length,) = HEADER_SIZE.unpack_from(self._map, start)
+        start += HEADER_SIZE.size
+        self.header = json.loads(self._map[start:start + length])
+        self._data_start = start + length
+        self.rows = self.header["rows"]
+        self.min_date = self.header["min_date"]
+        self.max_date = self.header["max_date"]
+
+    def close(self):
+        self._map.close()
+
+    def _block(self, name):
+        column = self.header["columns"][name]
+        start = self._data_start + column["offset"]
+        return zlib.decompress(self._map[start:start + column["length"]])
+
+    def column(self, name):
+        """Decompress one column: int64 arrays for ids/dates/quantities, codes for dictionary columns."""
+        if name not in self.header["columns"]:
+            # Partitions written before production IDs existed
+            return np.zeros(self.rows, dtype=np.int64)
+        block = self._block(name)
+        if name == "lot_no":
+            return block.decode("utf-8").split("\n") if self.rows else []
+        dtype = np.int32 if name in DICTIONARY_COLUMNS else np.int64
+        return np.frombuffer(block, dtype=dtype)
+
+    def dictionary(self, name):
+        return self.header["dictionaries"][name]
+
+    def match(self, first=None, last=None, customer=None, product_code=None):
+        """Return a boolean mask of matching rows, or None when the partition can be skipped.
+
+        Date bounds and dictionary lookups are checked before any column is decompressed.
+        """
+        first_ordinal = date.fromisoformat(first).toordinal() if first else None
+        last_ordinal = date.fromisoformat(last).toordinal() if last else None
+        if first_ordinal is not None and self.max_date < first_ordinal:
+            return None
+        if last_ordinal is not None and self.min_date > last_ordinal:
+            return None
+
+        codes = {}
+        for name, value in (("customer", customer), ("product_code", product_code)):
+            if value is None:
+                continue
+            lookup = {entry.casefold(): code for code, entry in enumerate(self.dictionary(name))}
+            code = lookup.get(value.casefold())
+            if code is None:
+                return None
+            codes[name] = code
+
+        mask = np.ones(self.rows, dtype=bool)
+        if first_ordinal is not None or last_ordinal is not None:
+            dates = self.column("date")
+            if first_ordinal is not None:
+                mask &= dates >= first_ordinal
+            if last_ordinal is not None:
+                mask &= dates <= last_ordinal
+        for name, code in codes.items():
+            mask &= self.column(name) == code
+        return mask if mask.any() else None
+
+    def records(self, mask=None):
+        """Decode rows as (id, iso date, customer, product code, color, lot no, qty micrograms, production id)."""
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(self.rows)
+        ids = self.column("id")[rows].tolist()
+        dates = [date.fromordinal(ordinal).isoformat() for ordinal in self.column("date")[rows].tolist()]
+        decoded = [
+            [self.dictionary(name)[code] for code in self.column(name)[rows].tolist()]
+            for name in DICTIONARY_COLUMNS
+        ]
+        lots = self.column("lot_no")
+        lot_values = [lots[row] for row in rows.tolist()]
+        quantities = self.column("qty_produced_ug")[rows].tolist()
+        # 0 stands for a record without a production ID
+        production_ids = [value or None for value in self.column("production_id")[rows].tolist()]
+        return list(zip(ids, dates, *decoded, lot_values, quantities, production_ids))
+
+    @staticmethod
+    def write(path, records):
+        """Write (id, iso date, customer, product code, color, lot no, qty micrograms, production id) rows."""
+        records = sorted(records, key=lambda record: (record[1], record[0]))
+        ids, dates, customers, product_codes, colors, lots, quantities, production_ids = (
+            zip(*records) if records else ([],) * 8)
+        ordinals = [date.fromisoformat(value).toordinal() for value in dates]
+
+        dictionaries = {}
+        blocks = {
+            "id": array("q", ids).tobytes(),
+            "date": array("q", ordinals).tobytes(),
+            "lot_no": "\n".join(lots).encode("utf-8"),
+            "qty_produced_ug": array("q", quantities).tobytes(),
+            "production_id": array("q", (value or 0 for value in production_ids)).tobytes(),
+        }
+        for name, values in zip(DICTIONARY_COLUMNS, (customers, product_codes, colors)):
+            entries = sorted(set(values))
+            codes = {entry: code for code, entry in enumerate(entries)}
+            dictionaries[name] = entries
+            blocks[name] = array("i", (codes[value] for value in values)).tobytes()
+
+        columns = {}
+        payload = bytearray()
+        for name, block in blocks.items():
+            compressed = zlib.compress(block, 6)
+            columns[name] = {"offset": len(payload), "length": len(compressed)}
+            payload += compressed
+
+        header = json.dumps({
+            "rows": len(records),
+            "min_date": min(ordinals) if ordinals else 0,
+            "max_date": max(ordinals) if ordinals else 0,
+            "columns": columns,
+            "dictionaries": dictionaries,
+        }).encode("utf-8")
+
+        # Replace atomically so readers never see a half-written partition
+        partial_path = path + ".part"
+        with open(partial_path, "wb") as handle:
+            handle.write(MAGIC)
+            handle.write(HEADER_SIZE.pack(len(header)))
+            handle.write(header)
+            handle.write(payload)
+        os.replace(partial_path, path)
+
+
+class ArchiveStore:
+    """Monthly partitions of aged production records kept outside the hot SQLite store."""
+
+    def __init__(self, directory=DEFAULT_ARCHIVE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, month):
+        return os.path.join(self.directory, f"production_{month}.pcol")
+
+    def months(self):
+        """Return the archived months ("2023-05") in ascending order."""
+        names = (name for name in os.listdir(self.directory) if name.startswith("production_"))
+        return sorted(name[len("production_"):-len(".pcol")] for name in names if name.endswith(".pcol"))
+
+    def open(self, month):
+        return ArchivePartition(self._path(month))
+
+    def partitions(self):
+        """Return (month, rows, first date, last date) for every partition, reading headers only."""
+        summary = []
+        for month in self.months():
+            partition = self.open(month)
+            summary.append((month, partition.rows,
+                            date.fromordinal(partition.min_date).strftime("%m/%d/%y"),
+                            date.fromordinal(partition.max_date).strftime("%m/%d/%y")))
+            partition.close()
+        return summary
+
+    def write(self, records):
+        """Merge raw records into their monthly partitions, deduplicating by record id."""
+        by_month = {}
+        for record in records:
+            by_month.setdefault(month_of(record[1]), []).append(record)
+        for month, month_records in by_month.items():
+            path = self._path(month)
+            if os.path.exists(path):
+                partition = ArchivePartition(path)
+                existing = partition.records()
+                partition.close()
+                merged = {record[0]: record for record in existing}
+                merged.update((record[0], record) for record in month_records)
+                month_records = list(merged.values())
+            ArchivePartition.write(path, month_records)
+
+    def scan(self, first=None, last=None, customer=None, product_code=None, batch_size=5000):
+        """Yield matching records as display rows in batches, pruning partitions by predicate."""
+        for month in self.months():
+            if first and month < month_of(first):
+                continue
+            if last and month > month_of(last):
+                continue
+            partition = self.open(month)
+            try:
+                mask = partition.match(first, last, customer, product_code)
+                if mask is None:
+                    continue
+                rows = [(date.fromisoformat(record[1]).strftime("%m/%d/%y"), *record[2:7])
+                        for record in partition.records(mask)]
+            finally:
+                partition.close()
+            for start in range(0, len(rows), batch_size):
+                yield rows[start:start + batch_size]
+
+    def count(self, first=None, last=None, customer=None, product_code=None):
+        total = 0
+        for month in self.months():
+            partition = self.open(month)
+            mask = partition.match(first, last, customer, product_code)
+            partition.close()
+            if mask is not None:
+                total += int(mask.sum())
+        return total
+
+    @property
+    def _state_path(self):
+        return os.path.join(self.directory, "state.json")
+
+    def cutoff(self):
+        """Return the ISO date everything before which has already been archived, or None."""
+        if not os.path.exists(self._state_path):
+            return None
+        with open(self._state_path, encoding="utf-8") as handle:
+            return json.load(handle)["cutoff"]
+
+    def archive_from(self, store, cutoff):
+        """Move hot-store records dated before the ISO cutoff date into the archive.
+
+        Only dates since the previous cutoff are moved, so restored months stay in the hot store.
+        """
+        since = self.cutoff()
+        if since is not None and since >= cutoff:
+            return 0
+        records = store.fetch_raw_before(cutoff, since)
+        if records:
+            # Partitions are written before the rows are deleted; a rerun after a crash merges by id
+            self.write(records)
+            store.delete_before(cutoff, since)
+        with open(self._state_path, "w", encoding="utf-8") as handle:
+            json.dump({"cutoff": cutoff}, handle)
+        return len(records)
+
+    def restore(self, store, month):
+        """Move one month back into the hot store and drop its partition."""
+        partition = self.open(month)
+        records = partition.records()
+        partition.close()
+        store.insert_raw(records)
+        os.remove(self._path(month))
+        return len(records)
@@ -0,0 +1,96 @@
+import re
+import sqlite3
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from production_data.Consumption_calculator import batch_sizes, lot_consumption, split_batches
+from production_data.Fixed_point import UNITS_PER_KG, to_fixed_array
+from production_data.Lot_index import parse_lot
+
+# Guards against a typo such as "1584AN-15840AN", or a tiny tumbler batch size, turning into
+# thousands of entries
+MAX_LOTS_PER_RANGE = 1000
+
+GenerationResult = namedtuple("GenerationResult", ["records", "consumption", "elapsed", "rate"])
+
+
+def expand_lots(text):
+    """Expand "1584AN-1615AN" into ["1584AN", ..., "1615AN"]; a single lot expands to itself."""
+    parsed = parse_lot(text)
+    if parsed is None:
+        raise ValueError(f"{text.strip()!r} is not a lot number or lot range")
+    suffix, first, last = parsed
+    if last - first + 1 > MAX_LOTS_PER_RANGE:
+        raise ValueError(f"{text.strip()!r} spans {last - first + 1} lots (at most {MAX_LOTS_PER_RANGE})")
+    # Keep the digit count of the typed lot so zero-padded series stay padded
+    width = len(re.match(r"\s*(\d+)", text).group(1))
+    return [f"{number:0{width}d}{suffix}" for number in range(first, last + 1)]
+
+
+def split_evenly(qty_units, count):
+    """Split int micrograms over count lots in whole micrograms; the remainder goes to the first lots."""
+    base, remainder = divmod(int(qty_units), count)
+    quantities = np.full(count, base, dtype=np.int64)
+    quantities[:remainder] += 1
+    return quantities
+
+
+def batch_quantities(qty_kg, qty_per_batch):
+    """One quantity per batch of qty_per_batch kilograms, the last batch taking the rest."""
+    full, remainder = split_batches(qty_kg, qty_per_batch)
+    count = full + (1 if remainder else 0)
+    if count > MAX_LOTS_PER_RANGE:
+        raise ValueError(f"{qty_kg:g} KG makes {count} tumbler batches (at most {MAX_LOTS_PER_RANGE})")
+    return to_fixed_array(batch_sizes(qty_kg, qty_per_batch))
+
+
+class BatchGenerator:
+    """Turns Auto Generate form input into production entries, many lots per transaction.
+
+    Consumption for every lot is computed as one lots x materials matrix, and every production
+    and consumption row is written with a single executemany per table, so throughput is bound
+    by SQLite's bulk insert speed rather than by per-entry commits.
+    """
+
+    def __init__(self, store, production_ids):
+        self.store = store
+        self.production_ids = production_ids
+
+    def generate(self, formulation, production_date, customer, color, lots, quantities, dosage, ld_percent,
+                 order_form_no="", first_id=None):
+        """Write one entry per lot and return a GenerationResult.
+
+        quantities are int64 micrograms, one per lot. first_id, the ID already shown on the form,
+        goes to the first entry unless its lease was lost; the rest are drawn from the allocator
+        and handed back on failure, except when the store rejected an ID as already used.
+        """
+        if len(lots) != len(quantities):
+            raise ValueError("every lot needs a quantity")
+        if not lots:
+            raise ValueError("nothing to generate")
+        began = time.perf_counter()
+        if first_id is not None and not self.production_ids.holds(first_id):
+            first_id = None
+        drawn = [self.production_ids.next_id() for _ in range(len(lots) - (first_id is not None))]
+        ids = ([first_id] if first_id is not None else []) + drawn
+        try:
+            materials = [material for material, _ in formulation.materials]
+            weights, losses, consumed = lot_consumption(
+                [concentration for _, concentration in formulation.materials], dosage, ld_percent,
+                np.asarray(quantities, dtype=np.int64) / UNITS_PER_KG)
+            records = [(production_date, customer, formulation.product_code, color, lot, qty, production_id)
+                       for lot, qty, production_id in zip(lots, np.asarray(quantities).tolist(), ids)]
+            # Lots x materials matrices flattened row by row line up with the repeated IDs and tiled names
+            consumption = list(zip(np.repeat(ids, len(materials)).tolist(), materials * len(lots),
+                                   weights.ravel().tolist(), losses.ravel().tolist(), consumed.ravel().tolist()))
+            order_forms = [(order_form_no, customer)] if order_form_no else []
+            self.store.insert_entries(records, consumption, order_forms)
+        except BaseException as exc:
+            if not isinstance(exc, sqlite3.IntegrityError):
+                for production_id in reversed(drawn):
+                    self.production_ids.give_back(production_id)
+            raise
+        elapsed = time.perf_counter() - began
+        return GenerationResult(records, consumption, elapsed, len(records) / elapsed if elapsed > 0 else 0.0)
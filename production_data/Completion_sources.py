@@ -0,0 +1,69 @@
+import bisect
+from collections import OrderedDict
+
+# Upper bound for a prefix range: sorts after every valid character
+PREFIX_END = "\U0010ffff"
+
+
+class CompletionSource:
+    """Prefix completions answered one page at a time, with a small LRU cache of recent pages."""
+
+    def __init__(self, cache_size=32):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def matches(self, prefix, offset=0, limit=50):
+        """Return up to limit values starting with prefix (case-insensitive), skipping offset."""
+        key = (prefix.strip().casefold(), offset, limit)
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = self._cache[key] = self._query(key[0], offset, limit)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def invalidate(self, *_):
+        """Drop cached pages; usable directly as a store listener."""
+        self._cache.clear()
+
+    def _query(self, prefix, offset, limit):
+        raise NotImplementedError
+
+
+class SqlPrefixSource(CompletionSource):
+    """Distinct values of an indexed NOCASE column, read by seeking through its index."""
+
+    def __init__(self, store, table, column, cache_size=32):
+        super().__init__(cache_size)
+        self.store = store
+        # Skip scan: each step seeks the NOCASE index to the next distinct value, so a customer
+        # with thousands of records costs one seek rather than a walk over all its entries
+        self.sql = (f"WITH RECURSIVE value_range(value) AS ("
+                    f"SELECT MIN({column}) FROM {table} WHERE {column} >= :low AND {column} < :high "
+                    f"UNION ALL SELECT (SELECT MIN({column}) FROM {table} "
+                    f"WHERE {column} > value_range.value AND {column} < :high) "
+                    f"FROM value_range WHERE value_range.value IS NOT NULL) "
+                    f"SELECT value FROM value_range WHERE value IS NOT NULL LIMIT :limit OFFSET :offset")
+
+    def _query(self, prefix, offset, limit):
+        params = {"low": prefix, "high": prefix + PREFIX_END, "limit": limit, "offset": offset}
+        return [row[0] for row in self.store.connection().execute(self.sql, params)]
+
+
+class SortedPrefixSource(CompletionSource):
+    """Completions over a fixed in-memory list, kept sorted by casefolded value."""
+
+    def __init__(self, values, cache_size=32):
+        super().__init__(cache_size)
+        self._sorted = sorted((value.casefold(), value) for value in values)
+
+    def _query(self, prefix, offset, limit):
+        start = bisect.bisect_left(self._sorted, (prefix,)) + offset
+        stop = bisect.bisect_left(self._sorted, (prefix + PREFIX_END,))
+        return [value for _, value in self._sorted[start:min(stop, start + limit)]]
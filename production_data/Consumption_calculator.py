@@ -0,0 +1,85 @@
+from collections import namedtuple
+
+import numpy as np
+
+from production_data.Fixed_point import to_fixed_array
+
+# Materials weighing at least this much per batch go on the large (KG) scale
+LARGE_SCALE_MIN_KG = 1.0
+
+ConsumptionResult = namedtuple("ConsumptionResult", [
+    "batches", "per_batch", "large_scale", "small_scale",
+    "total_weight", "total_loss", "total_consumption",
+])
+
+
+def split_batches(qty_required, qty_per_batch):
+    """Return the number of full batches of qty_per_batch in qty_required and the kilograms left over."""
+    if qty_per_batch <= 0 or qty_required <= 0:
+        return 0, 0.0
+    full, remainder = divmod(qty_required, qty_per_batch)
+    return int(full), (remainder if remainder > 1e-9 else 0.0)
+
+
+def batch_sizes(qty_required, qty_per_batch):
+    """Split qty_required into full batches plus a final partial batch."""
+    full, remainder = split_batches(qty_required, qty_per_batch)
+    sizes = np.full(full + (1 if remainder else 0), float(qty_per_batch))
+    if remainder:
+        sizes[-1] = remainder
+    return sizes
+
+
+def material_fractions(concentrations, dosage):
+    """Kilograms of each material per kilogram produced."""
+    concentrations = np.asarray(concentrations, dtype=float)
+    total = concentrations.sum()
+    return concentrations / total * (dosage / 100.0) if total > 0 else np.zeros_like(concentrations)
+
+
+def compute_consumption(concentrations, dosage, ld_percent, qty_required, qty_per_batch):
+    """Compute every material's weights, loss and consumption across all batches.
+
+    concentrations are the formulation's parts per material; dosage and ld_percent are
+    percentages and quantities are in kilograms. Weights come back as int64 micrograms.
+    """
+    fractions = material_fractions(concentrations, dosage)
+
+    full, remainder = split_batches(qty_required, qty_per_batch)
+    # Every batch draws the same fractions, so the totals follow from the batched kilograms alone
+    weights = fractions * (full * qty_per_batch + remainder)
+
+    per_batch = fractions * qty_per_batch
+    on_large_scale = per_batch >= LARGE_SCALE_MIN_KG
+    total_weight = to_fixed_array(weights)
+    total_loss = to_fixed_array(weights * (ld_percent / 100.0))
+    per_batch = to_fixed_array(per_batch)
+
+    return ConsumptionResult(
+        batches=full + (1 if remainder else 0),
+        per_batch=per_batch,
+        large_scale=np.where(on_large_scale, per_batch, 0),
+        small_scale=np.where(on_large_scale, 0, per_batch),
+        total_weight=total_weight,
+        total_loss=total_loss,
+        total_consumption=total_weight - total_loss,
+    )
+
+
+def lot_consumption(concentrations, dosage, ld_percent, quantities):
+    """Compute every material's weight, loss and consumption for many lots in one pass.
+
+    quantities holds each lot's kilograms. Returns three lots x materials int64 microgram
+    matrices; each row carries the totals compute_consumption gives for that lot alone.
+    """
+    weights = np.outer(np.asarray(quantities, dtype=float), material_fractions(concentrations, dosage))
+    total_weight = to_fixed_array(weights)
+    total_loss = to_fixed_array(weights * (ld_percent / 100.0))
+    return total_weight, total_loss, total_weight - total_loss
+
+
+def material_rows(names, result):
+    """Zip material names with a ConsumptionResult into materials table rows of int64 micrograms."""
+    return list(zip(names, result.large_scale.tolist(), result.small_scale.tolist(),
+                    result.total_weight.tolist(), result.total_loss.tolist(),
+                    result.total_consumption.tolist()))
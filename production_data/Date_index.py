@@ -0,0 +1,34 @@
+import numpy as np
+
+
+class DateRangeIndex:
+    """Record dates as sorted day ordinals, answering From/To queries by binary search."""
+
+    def __init__(self):
+        self.row_count = -1
+        self.order = np.empty(0, dtype=np.int64)
+        self.sorted_dates = np.empty(0, dtype=np.int64)
+
+    def build(self, dates, order=None):
+        """Index an int64 array of day ordinals; order may be a precomputed ascending argsort."""
+        self.order = np.argsort(dates, kind="stable") if order is None else order
+        self.sorted_dates = dates[self.order]
+        self.row_count = len(dates)
+
+    def bounds(self):
+        """Return the first and last indexed ordinals, or None if nothing is indexed."""
+        if not len(self.sorted_dates):
+            return None
+        return int(self.sorted_dates[0]), int(self.sorted_dates[-1])
+
+    def rows_between(self, first, last):
+        """Return the rows dated from first to last inclusive."""
+        start = np.searchsorted(self.sorted_dates, first, side="left")
+        stop = np.searchsorted(self.sorted_dates, last, side="right")
+        return self.order[start:stop]
+
+    def mask_between(self, first, last):
+        """Return a boolean row mask of the records dated from first to last inclusive."""
+        mask = np.zeros(self.row_count, dtype=bool)
+        mask[self.rows_between(first, last)] = True
+        return mask
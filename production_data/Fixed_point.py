@@ -0,0 +1,46 @@
+from decimal import Decimal, ROUND_HALF_EVEN
+
+import numpy as np
+
+# Weights are held as integer micrograms
+UNITS_PER_KG = 1_000_000_000
+UNITS_PER_G = 1_000_000
+
+
+def parse_fixed(text, unit=UNITS_PER_KG):
+    """Parse a decimal string such as "2.5000000" into exact integer units."""
+    if isinstance(text, (int, np.integer)):
+        return int(text)
+    value = Decimal(str(text).strip() or "0") * unit
+    return int(value.to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+def format_fixed(units, places=7, unit=UNITS_PER_KG):
+    """Format integer units as a decimal string with the given number of places.
+
+    unit must be a power of ten. Places beyond the unit's own precision are zero-filled.
+    """
+    units = int(units)
+    negative = units < 0
+    units = abs(units)
+    unit_places = len(str(unit)) - 1
+    if places >= unit_places:
+        whole, fraction = divmod(units, unit)
+        fraction *= 10 ** (places - unit_places)
+        quotient = units
+    else:
+        # Round half to even at the requested precision using integers only
+        step = 10 ** (unit_places - places)
+        quotient, remainder = divmod(units, step)
+        if remainder * 2 > step or (remainder * 2 == step and quotient % 2):
+            quotient += 1
+        whole, fraction = divmod(quotient, 10 ** places)
+    sign = "-" if negative and quotient else ""
+    if places == 0:
+        return f"{sign}{whole}"
+    return f"{sign}{whole}.{fraction:0{places}d}"
+
+
+def to_fixed_array(values, unit=UNITS_PER_KG):
+    """Convert a float array of kilograms (or grams) to int64 units."""
+    return np.rint(np.asarray(values, dtype=float) * unit).astype(np.int64)
@@ -0,0 +1,144 @@
+from collections import OrderedDict, namedtuple
+
+FORMULATION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS formulation (
+    id INTEGER PRIMARY KEY,
+    product_code TEXT NOT NULL COLLATE NOCASE,
+    color TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    dosage REAL NOT NULL DEFAULT 100.0,
+    ld_percent REAL NOT NULL DEFAULT 0.0,
+    matched_date TEXT NOT NULL DEFAULT '',
+    colormatch_no TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_formulation_product_code ON formulation (product_code);
+CREATE TABLE IF NOT EXISTS formulation_material (
+    formulation_id INTEGER NOT NULL REFERENCES formulation (id),
+    position INTEGER NOT NULL,
+    material_code TEXT NOT NULL,
+    concentration REAL NOT NULL,
+    PRIMARY KEY (formulation_id, position)
+) WITHOUT ROWID;
+"""
+
+FORMULATION_COLUMNS = "id, product_code, color, dosage, ld_percent, matched_date, colormatch_no"
+SQL_FORMULATION = f"SELECT {FORMULATION_COLUMNS} FROM formulation WHERE id = ?"
+SQL_MATERIALS = ("SELECT material_code, concentration FROM formulation_material "
+                 "WHERE formulation_id = ? ORDER BY position")
+# The latest formulation of a product code is the one in use
+SQL_PRODUCT_ID = "SELECT MAX(id) FROM formulation WHERE product_code = ?"
+SQL_MATERIAL_CODES = "SELECT DISTINCT material_code FROM formulation_material ORDER BY material_code"
+SQL_INSERT_FORMULATION = f"INSERT INTO formulation ({FORMULATION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)"
+SQL_INSERT_MATERIAL = "INSERT INTO formulation_material VALUES (?, ?, ?, ?)"
+
+DEFAULT_FORMULATION_ID = 16026
+
+# matched_date is an ISO date, or empty when the color was never matched
+Formulation = namedtuple("Formulation", ["formulation_id", "product_code", "color", "dosage", "ld_percent",
+                                         "matched_date", "colormatch_no", "materials"])
+
+SAMPLE_FORMULATIONS = [
+    Formulation(16026, "BA0830E", "BLUE", 100.0, 1.0, "2025-02-14", "",
+                (("B107", 50.0), ("B37", 30.0), ("L28", 20.0))),
+]
+
+
+class FormulationRepository:
+    """Formulations loaded from the store by ID, kept in a bounded LRU cache.
+
+    Cached formulations are immutable tuples, so a hit hands back the same object without
+    querying or rebuilding anything. Product codes map to IDs through a second cache whose
+    entries are dropped with the formulation they point at.
+    """
+
+    def __init__(self, store, capacity=64):
+        self.store = store
+        self.capacity = capacity
+        self._cache = OrderedDict()
+        self._product_ids = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        conn = store.connection()
+        conn.executescript(FORMULATION_SCHEMA)
+        self._migrate()
+        if conn.execute("SELECT COUNT(*) FROM formulation").fetchone()[0] == 0:
+            self.insert_formulations(SAMPLE_FORMULATIONS)
+
+    def _migrate(self):
+        """Add the color match columns to formulation tables created without them."""
+        conn = self.store.connection()
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(formulation)")]
+        with conn:
+            for column in ("matched_date", "colormatch_no"):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE formulation ADD COLUMN {column} TEXT NOT NULL DEFAULT ''")
+
+    def get(self, formulation_id):
+        """Return the formulation with this ID, or None if there is none."""
+        formulation = self._cache.get(formulation_id)
+        if formulation is not None:
+            self._cache.move_to_end(formulation_id)
+            self.hits += 1
+            return formulation
+        self.misses += 1
+        formulation = self._load(formulation_id)
+        if formulation is not None:
+            self._remember(formulation)
+        return formulation
+
+    def for_product(self, product_code):
+        """Return the formulation currently used for a product code, or None."""
+        key = product_code.strip().casefold()
+        formulation_id = self._product_ids.get(key)
+        if formulation_id is None:
+            formulation_id = self.store.connection().execute(SQL_PRODUCT_ID, (key,)).fetchone()[0]
+            if formulation_id is None:
+                self.misses += 1
+                return None
+        return self.get(formulation_id)
+
+    def material_codes(self):
+        """Return every material code used by a formulation, sorted."""
+        return [code for code, in self.store.connection().execute(SQL_MATERIAL_CODES)]
+
+    def _load(self, formulation_id):
+        conn = self.store.connection()
+        row = conn.execute(SQL_FORMULATION, (formulation_id,)).fetchone()
+        if row is None:
+            return None
+        materials = tuple(conn.execute(SQL_MATERIALS, (formulation_id,)).fetchall())
+        return Formulation(*row, materials)
+
+    def _remember(self, formulation):
+        self._cache[formulation.formulation_id] = formulation
+        self._product_ids[formulation.product_code.casefold()] = formulation.formulation_id
+        while len(self._cache) > self.capacity:
+            _, evicted = self._cache.popitem(last=False)
+            self._product_ids.pop(evicted.product_code.casefold(), None)
+            self.evictions += 1
+
+    def invalidate(self, formulation_id=None):
+        """Drop one cached formulation, or all of them, after the stored data changes."""
+        if formulation_id is None:
+            self._cache.clear()
+            self._product_ids.clear()
+            return
+        formulation = self._cache.pop(formulation_id, None)
+        if formulation is not None:
+            self._product_ids.pop(formulation.product_code.casefold(), None)
+
+    def insert_formulations(self, formulations):
+        conn = self.store.connection()
+        with conn:
+            conn.executemany(SQL_INSERT_FORMULATION, (formulation[:7] for formulation in formulations))
+            conn.executemany(SQL_INSERT_MATERIAL, (
+                (formulation.formulation_id, position, code, concentration)
+                for formulation in formulations
+                for position, (code, concentration) in enumerate(formulation.materials)))
+        # A new formulation for a cached product code replaces the one in use
+        for formulation in formulations:
+            self._product_ids.pop(formulation.product_code.casefold(), None)
+
+    def cache_info(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._cache), "capacity": self.capacity}
@@ -0,0 +1,214 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+
+ID_SCHEMA = """
+CREATE TABLE IF NOT EXISTS id_sequence (
+    name TEXT PRIMARY KEY,
+    next_value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS id_lease (
+    name TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    first_value INTEGER NOT NULL,
+    last_value INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (name, first_value)
+);
+CREATE TABLE IF NOT EXISTS id_free (
+    name TEXT NOT NULL,
+    first_value INTEGER NOT NULL,
+    last_value INTEGER NOT NULL,
+    PRIMARY KEY (name, first_value)
+);
+"""
+
+# The hardcoded placeholder the Auto Generate tab used to show
+FIRST_PRODUCTION_ID = 98744
+
+# Finds which IDs of an expired lease were used before its owner went away
+PRODUCTION_ID_USAGE = "SELECT production_id FROM production_record WHERE production_id BETWEEN ? AND ?"
+
+
+def format_production_id(value):
+    return f"{value:07d}"
+
+
+class IdAllocator:
+    """Hands out unique IDs from blocks reserved in the store, one transaction per block.
+
+    Each block is leased to this client until expires_at. A background thread renews the
+    leases every quarter of lease_seconds, so an ID can sit on an idle form indefinitely, and
+    holds() re-checks the lease before such an ID is written. Leases of clients that crashed
+    expire, and their unused IDs (those not found by usage_sql) go back to a free list that
+    later blocks are taken from first. A cleanly closed client returns its unused IDs the
+    same way, but only from leases it still holds.
+    """
+
+    def __init__(self, store, name="production", block_size=100, lease_seconds=600,
+                 first_value=FIRST_PRODUCTION_ID, usage_sql=PRODUCTION_ID_USAGE):
+        self.store = store
+        self.name = name
+        self.block_size = block_size
+        self.lease_seconds = lease_seconds
+        self.usage_sql = usage_sql
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._pool = deque()  # IDs reserved but not handed out, lowest first
+        self._leases = {}  # first_value -> last_value of the blocks this client holds
+        self._renew_at = 0.0
+        self.last_error = None
+        self._closed = threading.Event()
+        self._renewer = None
+        conn = store.connection()
+        conn.executescript(ID_SCHEMA)
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO id_sequence VALUES (?, ?)", (name, first_value))
+
+    def next_id(self):
+        """Return a new unique ID; only every block_size-th call touches the database."""
+        with self._lock:
+            if self._pool and time.time() >= self._renew_at:
+                self._renew()
+            if not self._pool:
+                self._reserve()
+            return self._pool.popleft()
+
+    def holds(self, value):
+        """Renew the leases now and return whether value still belongs to one of them."""
+        with self._lock:
+            if self._leases:
+                self._renew()
+            return self._lease_of(value) is not None
+
+    def renew(self):
+        """Extend this client's leases now; the background thread calls this periodically."""
+        with self._lock:
+            if self._leases:
+                self._renew()
+
+    def give_back(self, value):
+        """Return an ID that was handed out but never used, e.g. a discarded entry.
+
+        An ID whose lease was reclaimed meanwhile may already be someone else's, so it is dropped.
+        """
+        with self._lock:
+            if self._lease_of(value) is not None:
+                self._pool.appendleft(value)
+
+    def close(self):
+        """Release the unused IDs of the leases still held to the free list and drop the leases."""
+        self._closed.set()
+        if self._renewer is not None:
+            self._renewer.join()
+        with self._lock:
+            if not self._leases:
+                return
+            conn = self.store.connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                held = self._held_leases(conn)
+                unused = [value for value in sorted(self._pool) if self._lease_of(value, held) is not None]
+                conn.executemany("INSERT OR REPLACE INTO id_free VALUES (?, ?, ?)",
+                                 ((self.name, first, last) for first, last in self._ranges(unused)))
+                conn.execute("DELETE FROM id_lease WHERE name = ? AND owner = ?", (self.name, self.owner))
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            self._pool.clear()
+            self._leases.clear()
+
+    def _held_leases(self, conn):
+        """Return {first: last} of the leases the store still records for this client."""
+        return dict(conn.execute("SELECT first_value, last_value FROM id_lease WHERE name = ? AND owner = ?",
+                                 (self.name, self.owner)).fetchall())
+
+    def _lease_of(self, value, leases=None):
+        """Return the first value of the lease containing value, or None."""
+        for first, last in (self._leases if leases is None else leases).items():
+            if first <= value <= last:
+                return first
+        return None
+
+    def _run(self):
+        while not self._closed.wait(self.lease_seconds / 4):
+            try:
+                self.renew()
+            except Exception as exc:
+                self.last_error = exc  # retried on the next round, well before the lease runs out
+        self.store.close()
+
+    @staticmethod
+    def _ranges(values):
+        """Collapse sorted IDs into (first, last) runs."""
+        runs = []
+        for value in values:
+            if runs and runs[-1][1] == value - 1:
+                runs[-1][1] = value
+            else:
+                runs.append([value, value])
+        return [tuple(run) for run in runs]
+
+    def _reserve(self):
+        conn = self.store.connection()
+        # IMMEDIATE takes the write lock up front so concurrent processes queue instead of deadlocking
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            self._recover_expired(conn, now)
+            free = conn.execute("SELECT first_value, last_value FROM id_free WHERE name = ? "
+                                "ORDER BY first_value LIMIT 1", (self.name,)).fetchone()
+            if free is not None:
+                first = free[0]
+                last = min(free[1], first + self.block_size - 1)
+                conn.execute("DELETE FROM id_free WHERE name = ? AND first_value = ?", (self.name, first))
+                if last < free[1]:
+                    conn.execute("INSERT INTO id_free VALUES (?, ?, ?)", (self.name, last + 1, free[1]))
+            else:
+                first = conn.execute("SELECT next_value FROM id_sequence WHERE name = ?",
+                                     (self.name,)).fetchone()[0]
+                last = first + self.block_size - 1
+                conn.execute("UPDATE id_sequence SET next_value = ? WHERE name = ?", (last + 1, self.name))
+            conn.execute("INSERT INTO id_lease VALUES (?, ?, ?, ?, ?)",
+                         (self.name, self.owner, first, last, now + self.lease_seconds))
+            conn.execute("UPDATE id_lease SET expires_at = ? WHERE name = ? AND owner = ?",
+                         (now + self.lease_seconds, self.name, self.owner))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        self._leases[first] = last
+        self._pool.extend(range(first, last + 1))
+        self._renew_at = now + self.lease_seconds / 2
+        if self._renewer is None:
+            self._renewer = threading.Thread(target=self._run, name=f"{self.name}-id-lease", daemon=True)
+            self._renewer.start()
+
+    def _renew(self):
+        """Extend this client's leases, dropping pooled IDs whose lease was reclaimed meanwhile."""
+        conn = self.store.connection()
+        now = time.time()
+        with conn:
+            conn.execute("UPDATE id_lease SET expires_at = ? WHERE name = ? AND owner = ?",
+                         (now + self.lease_seconds, self.name, self.owner))
+            held = self._held_leases(conn)
+        lost = [(first, last) for first, last in self._leases.items() if first not in held]
+        for first, last in lost:
+            del self._leases[first]
+            self._pool = deque(value for value in self._pool if not first <= value <= last)
+        self._renew_at = now + self.lease_seconds / 2
+
+    def _recover_expired(self, conn, now):
+        """Move the unused IDs of expired leases to the free list (inside the reserving transaction)."""
+        expired = conn.execute("SELECT first_value, last_value FROM id_lease WHERE name = ? AND expires_at < ?",
+                               (self.name, now)).fetchall()
+        for first, last in expired:
+            used = {row[0] for row in conn.execute(self.usage_sql, (first, last))} if self.usage_sql else set()
+            unused = [value for value in range(first, last + 1) if value not in used]
+            conn.executemany("INSERT OR REPLACE INTO id_free VALUES (?, ?, ?)",
+                             ((self.name, run_first, run_last) for run_first, run_last in self._ranges(unused)))
+            conn.execute("DELETE FROM id_lease WHERE name = ? AND first_value = ?", (self.name, first))
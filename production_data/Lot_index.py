@@ -0,0 +1,139 @@
+import re
+from array import array
+from collections import defaultdict
+
+import numpy as np
+
+# Pending entries beyond this many are merged by sorting everything instead of inserting each one
+MERGE_INSERT_MAX = 256
+
+LOT_PATTERN = re.compile(r"^\s*(\d+)\s*([A-Z]*)\s*(?:-\s*(\d+)\s*([A-Z]*))?\s*$", re.IGNORECASE)
+
+
+def parse_lot(text):
+    """Parse "1584AN-1615AN" or "8211X" into (suffix, first, last), or None if it is not a lot."""
+    match = LOT_PATTERN.match(text)
+    if not match:
+        return None
+    first, suffix, last, last_suffix = match.groups()
+    suffix = suffix.upper()
+    if last is None:
+        return suffix, int(first), int(first)
+    if last_suffix and last_suffix.upper() != suffix:
+        return None
+    first, last = int(first), int(last)
+    return suffix, min(first, last), max(first, last)
+
+
+def merge_intervals(starts, ends, rows, pending):
+    """Return new start, end and row arrays in (start, end) order with pending intervals merged in.
+
+    pending holds a flat first, last, row sequence per interval.
+    """
+    pending = np.array(pending, dtype=np.int64).reshape(-1, 3)
+    if len(pending) > MERGE_INSERT_MAX:
+        starts = np.concatenate([starts, pending[:, 0]])
+        ends = np.concatenate([ends, pending[:, 1]])
+        rows = np.concatenate([rows, pending[:, 2]])
+        order = np.lexsort((ends, starts))
+        return starts[order], ends[order], rows[order]
+    pending = pending[np.lexsort((pending[:, 1], pending[:, 0]))]
+    # Each interval goes after those with the same start and end, which came from earlier rows
+    positions = []
+    for first, last, _ in pending.tolist():
+        low = np.searchsorted(starts, first, side="left")
+        high = np.searchsorted(starts, first, side="right")
+        positions.append(low + np.searchsorted(ends[low:high], last, side="right"))
+    return (np.insert(starts, positions, pending[:, 0]), np.insert(ends, positions, pending[:, 1]),
+            np.insert(rows, positions, pending[:, 2]))
+
+
+class LotSeries:
+    """Lot intervals of one suffix series as sorted start/end arrays."""
+
+    def __init__(self):
+        self.starts = np.empty(0, dtype=np.int64)
+        self.ends = np.empty(0, dtype=np.int64)
+        self.rows = np.empty(0, dtype=np.int64)
+        self.max_ends = np.empty(0, dtype=np.int64)
+        self._pending = array("q")  # first, last, row of each interval added since the last flush
+
+    def add(self, row, first, last):
+        self._pending.extend((first, last, row))
+
+    def flush(self):
+        if self._pending:
+            self._replace(*merge_intervals(self.starts, self.ends, self.rows, self._pending))
+            self._pending = array("q")
+
+    def _replace(self, starts, ends, rows):
+        self.starts, self.ends, self.rows = starts, ends, rows
+        # Running maximum of the ends lets lookups skip every interval that finishes too early
+        self.max_ends = np.maximum.accumulate(ends)
+
+    def compacted(self):
+        """Return the arrays with the intervals pending now merged in; safe to call off the GUI thread."""
+        starts, pending = self.starts, self._pending[:]
+        return (starts, *merge_intervals(starts, self.ends, self.rows, pending), len(pending))
+
+    def install(self, compacted):
+        """Adopt arrays from compacted() unless the series was flushed in the meantime."""
+        base, starts, ends, rows, merged = compacted
+        if self.starts is base:
+            self._replace(starts, ends, rows)
+            del self._pending[:merged]
+
+    def find(self, number):
+        """Return the rows whose interval contains number."""
+        self.flush()
+        stop = np.searchsorted(self.starts, number, side="right")
+        start = np.searchsorted(self.max_ends[:stop], number, side="left")
+        hits = np.flatnonzero(self.ends[start:stop] >= number) + start
+        return self.rows[hits]
+
+    def overlaps(self):
+        """Return (row, conflicting row) pairs for intervals sharing any lot number."""
+        self.flush()
+        if len(self.starts) < 2:
+            return []
+        # Index of the interval holding the running maximum end before each position
+        positions = np.arange(len(self.ends))
+        holder = np.maximum.accumulate(np.where(self.ends == self.max_ends, positions, 0))
+        clashes = np.flatnonzero(self.starts[1:] <= self.max_ends[:-1]) + 1
+        return list(zip(self.rows[clashes].tolist(), self.rows[holder[clashes - 1]].tolist()))
+
+
+class LotRangeIndex:
+    """Interval index resolving a single lot number to the record whose range produced it."""
+
+    def __init__(self):
+        self.series = defaultdict(LotSeries)
+
+    def add(self, row, lot_no):
+        parsed = parse_lot(lot_no)
+        if parsed is not None:
+            suffix, first, last = parsed
+            self.series[suffix].add(row, first, last)
+
+    def compacted(self):
+        """Return each series' compacted() arrays; safe to call off the GUI thread."""
+        return {suffix: series.compacted() for suffix, series in list(self.series.items())}
+
+    def install(self, compacted):
+        for suffix, arrays in compacted.items():
+            self.series[suffix].install(arrays)
+
+    def find(self, lot_no):
+        """Return the rows whose lot range contains the single lot lot_no."""
+        parsed = parse_lot(lot_no)
+        if parsed is None or parsed[1] != parsed[2] or parsed[0] not in self.series:
+            return np.empty(0, dtype=np.int64)
+        suffix, number, _ = parsed
+        return self.series[suffix].find(number)
+
+    def overlaps(self):
+        """Return (row, conflicting row) pairs of overlapping or duplicate lot allocations."""
+        pairs = []
+        for series in self.series.values():
+            pairs.extend(series.overlaps())
+        return pairs
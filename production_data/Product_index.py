@@ -0,0 +1,82 @@
+import bisect
+from collections import namedtuple
+
+# Everything the Auto Generate form fills in from a product code; missing parts are None
+ProductEntry = namedtuple("ProductEntry", ["product_code", "formulation_id", "color", "matched_date",
+                                           "colormatch_no", "customer"])
+
+# Latest formulation and latest production customer per product code
+SQL_PRODUCT_FORMULATIONS = ("SELECT product_code, id, color, matched_date, colormatch_no FROM formulation "
+                            "WHERE id IN (SELECT MAX(id) FROM formulation GROUP BY product_code)")
+SQL_PRODUCT_CUSTOMERS = "SELECT product_code, customer, MAX(id) FROM production_record GROUP BY product_code"
+
+
+class ProductCodeIndex:
+    """Product code catalog: a hash map for exact lookups and a sorted key array for prefixes.
+
+    Keys are casefolded product codes. Codes added after loading are merged into the sorted
+    array on the next prefix query.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._sorted = []  # (key, product code) pairs in key order
+        self._pending = []
+
+    def load(self, store):
+        """Rebuild the catalog from the store's formulations and production records."""
+        conn = store.connection()
+        entries = {}
+        for product_code, formulation_id, color, matched_date, colormatch_no in conn.execute(
+                SQL_PRODUCT_FORMULATIONS):
+            entries[product_code.casefold()] = ProductEntry(product_code, formulation_id, color, matched_date,
+                                                            colormatch_no, None)
+        for product_code, customer, _ in conn.execute(SQL_PRODUCT_CUSTOMERS):
+            key = product_code.casefold()
+            entry = entries.get(key)
+            entries[key] = (entry._replace(customer=customer) if entry is not None
+                            else ProductEntry(product_code, None, None, None, None, customer))
+        # Each attribute is swapped in whole so readers on the GUI thread never see a partial build
+        self._entries = entries
+        self._sorted = sorted((key, entry.product_code) for key, entry in entries.items())
+        self._pending = []
+
+    def lookup(self, product_code):
+        """Return the ProductEntry for an exact (case-insensitive) product code, or None."""
+        return self._entries.get(product_code.strip().casefold())
+
+    def update(self, product_code, **fields):
+        """Add or change one product's fields, e.g. after a new formulation or production entry."""
+        key = product_code.casefold()
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = ProductEntry(product_code, None, None, None, None, None)
+            self._pending.append((key, product_code))
+        self._entries[key] = entry._replace(**fields)
+
+    def on_records_changed(self, removed, added):
+        """Store listener: the latest production entry sets a product's customer."""
+        for record in added:
+            self.update(record[2], customer=record[1])
+
+    def flush(self):
+        if self._pending:
+            self._sorted = sorted(set(self._sorted).union(self._pending))
+            self._pending = []
+
+    def prefix_range(self, prefix):
+        """Return the (start, stop) positions of the codes starting with prefix."""
+        self.flush()
+        key = prefix.strip().casefold()
+        start = bisect.bisect_left(self._sorted, (key,))
+        stop = bisect.bisect_left(self._sorted, (key + "\uffff",))
+        return start, stop
+
+    def matches(self, prefix, offset=0, limit=50):
+        """Return up to limit product codes starting with prefix, skipping offset (a completion source)."""
+        start, stop = self.prefix_range(prefix)
+        start += offset
+        return [code for _, code in self._sorted[start:min(stop, start + limit)]]
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,239 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from production_data.Fixed_point import parse_fixed
+from production_data.Summary_rollup import apply_rollups, create_rollups, summarize
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "production.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS production_record (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    production_date TEXT NOT NULL,
+    customer TEXT NOT NULL COLLATE NOCASE,
+    product_code TEXT NOT NULL COLLATE NOCASE,
+    color TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    lot_no TEXT NOT NULL COLLATE NOCASE,
+    qty_produced_ug INTEGER NOT NULL,
+    production_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_production_date ON production_record (production_date);
+CREATE INDEX IF NOT EXISTS idx_production_customer ON production_record (customer);
+CREATE INDEX IF NOT EXISTS idx_production_product_code ON production_record (product_code);
+CREATE INDEX IF NOT EXISTS idx_production_lot_no ON production_record (lot_no);
+CREATE TABLE IF NOT EXISTS order_form (
+    order_form_no TEXT PRIMARY KEY COLLATE NOCASE,
+    customer TEXT NOT NULL DEFAULT '' COLLATE NOCASE
+);
+CREATE TABLE IF NOT EXISTS production_consumption (
+    production_id INTEGER NOT NULL,
+    material_code TEXT NOT NULL,
+    weight_ug INTEGER NOT NULL,
+    loss_ug INTEGER NOT NULL,
+    consumption_ug INTEGER NOT NULL,
+    PRIMARY KEY (production_id, material_code)
+) WITHOUT ROWID;
+"""
+
+# Statement texts are module constants so sqlite3 reuses its prepared statements
+RECORD_COLUMNS = "production_date, customer, product_code, color, lot_no, qty_produced_ug"
+# Dates are formatted for display inside SQLite so rows need no Python post-processing;
+# strftime has no two-digit year, so the "mm/dd/yy" text is cut out of the ISO date
+DISPLAY_COLUMNS = ("substr(production_date, 6, 2) || '/' || substr(production_date, 9, 2) || '/' || "
+                   "substr(production_date, 3, 2), customer, product_code, color, lot_no, qty_produced_ug")
+SQL_COUNT = "SELECT COUNT(*) FROM production_record"
+SQL_ITER = f"SELECT {DISPLAY_COLUMNS} FROM production_record ORDER BY id"
+SQL_COUNT_RANGE = "SELECT COUNT(*) FROM production_record WHERE production_date BETWEEN :first AND :last"
+SQL_ITER_RANGE = (f"SELECT {DISPLAY_COLUMNS} FROM production_record "
+                  "WHERE production_date BETWEEN :first AND :last ORDER BY id")
+SQL_INSERT = f"INSERT INTO production_record ({RECORD_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+# Raw rows carry the row id first and the allocated production ID last
+SQL_RAW_BEFORE = (f"SELECT id, {RECORD_COLUMNS}, production_id FROM production_record "
+                  "WHERE production_date >= :since AND production_date < :cutoff ORDER BY id")
+SQL_DELETE_BEFORE = "DELETE FROM production_record WHERE production_date >= :since AND production_date < :cutoff"
+SQL_IDS_BETWEEN = "SELECT id FROM production_record WHERE id BETWEEN :first AND :last"
+SQL_RECORD = f"SELECT {RECORD_COLUMNS} FROM production_record WHERE id = :id"
+SQL_UPDATE = ("UPDATE production_record SET production_date = ?, customer = ?, product_code = ?, color = ?, "
+              "lot_no = ?, qty_produced_ug = ? WHERE id = ?")
+SQL_INSERT_RAW = (f"INSERT OR IGNORE INTO production_record (id, {RECORD_COLUMNS}, production_id) "
+                  "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+# Generated entries carry their production ID; consumption rows are keyed by it
+SQL_INSERT_ENTRY = (f"INSERT INTO production_record ({RECORD_COLUMNS}, production_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)")
+SQL_INSERT_CONSUMPTION = "INSERT INTO production_consumption VALUES (?, ?, ?, ?, ?)"
+SQL_INSERT_ORDER_FORM = "INSERT OR IGNORE INTO order_form (order_form_no, customer) VALUES (?, ?)"
+
+PAGE_SIZE = 200
+# Open-ended bounds for ISO date range queries
+FIRST_DATE = "0000-01-01"
+LAST_DATE = "9999-12-31"
+
+SAMPLE_RECORDS = [
+    ["10/06/25", "TRADESPHERE INDUSTRIAL COMMODITIES, INC.", "PP-W9845E", "White", "8211X", "2.5000000"],
+    ["10/06/25", "PLACEL MFG. CO., INC.", "PP-V0669E", "PEARL VIOLET", "8210X", "1.0200000"],
+    ["10/06/25", "In House", "VA4086E", "VIOLET", "1619AN", "125.0000000"],
+    ["10/03/25", "ROWELL LITHOGRAPHY & METAL CLOSURE, INC.", "DE-B17719E", "BLUE", "8196X", "5.0000000"],
+    ["10/06/25", "In House", "VA4086E", "VIOLET", "1618AN", "70.6200000"],
+    ["10/06/25", "In House", "VA4086E", "VIOLET", "1617AN", "50.0000000"],
+    ["10/06/25", "TRADESPHERE INDUSTRIAL COMMODITIES, INC.", "DP-K16339E", "PINK", "8209X", "1.0400000"],
+    ["10/04/25", "Everbright Net & Twine", "IA1770E", "GOLDEN BROWN", "1616AN", "15.0000000"],
+    ["10/04/25", "Everbright Net & Twine", "IA1770E", "GOLDEN BROWN", "1584AN-1615AN", "800.0000000"],
+    ["10/04/25", "EVERGOOD PLASTIC INDUSTRY INC.", "KA4595E", "FUCHSIA PINK", "1574AN-1583AN", "500.0000000"],
+    ["10/04/25", "FILIPINAS PLASTIC CORP.", "DU-B12434E", "BLUE", "8208X", "40.0000000"]
+]
+
+
+def to_iso_date(display_date):
+    """Convert a "10/06/25" display date to the stored "2025-10-06" form."""
+    return datetime.strptime(display_date, "%m/%d/%y").strftime("%Y-%m-%d")
+
+
+class ProductionStore:
+    """SQLite backed production record store with one connection per thread."""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._listeners = []
+        self.connection().executescript(SCHEMA)
+        self._migrate()
+        create_rollups(self.connection())
+        # Seed only a brand-new table, not one whose rows have all moved to the archive
+        if self.count_records() == 0 and not self._has_inserted():
+            self.insert_records(SAMPLE_RECORDS)
+
+    def connection(self):
+        """Return the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def add_listener(self, callback):
+        """Call callback(removed, added) with stored record tuples after every committed change."""
+        self._listeners.append(callback)
+
+    def _notify(self, removed, added):
+        for callback in self._listeners:
+            callback(removed, added)
+
+    def _has_inserted(self):
+        row = self.connection().execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'production_record'").fetchone()
+        return bool(row and row[0])
+
+    def _migrate(self):
+        """Bring tables created by earlier versions up to the current schema."""
+        conn = self.connection()
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(production_record)")]
+        if "qty_produced" in columns:
+            # Quantities stored as decimal strings become integer micrograms
+            conn.create_function("parse_fixed", 1, parse_fixed, deterministic=True)
+            with conn:
+                conn.execute("ALTER TABLE production_record ADD COLUMN qty_produced_ug INTEGER NOT NULL DEFAULT 0")
+                conn.execute("UPDATE production_record SET qty_produced_ug = parse_fixed(qty_produced)")
+                conn.execute("ALTER TABLE production_record DROP COLUMN qty_produced")
+        with conn:
+            if "production_id" not in columns:
+                conn.execute("ALTER TABLE production_record ADD COLUMN production_id INTEGER")
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_production_id ON production_record (production_id)")
+
+    def count_records(self):
+        return self.connection().execute(SQL_COUNT).fetchone()[0]
+
+    def count_between(self, first=None, last=None):
+        """Count records dated from first to last inclusive (ISO dates, None for open-ended)."""
+        params = {"first": first or FIRST_DATE, "last": last or LAST_DATE}
+        return self.connection().execute(SQL_COUNT_RANGE, params).fetchone()[0]
+
+    def iter_records(self, batch_size=PAGE_SIZE, first=None, last=None):
+        """Yield records as display rows one batch at a time, optionally within an ISO date range."""
+        if first is None and last is None:
+            cursor = self.connection().execute(SQL_ITER)
+        else:
+            params = {"first": first or FIRST_DATE, "last": last or LAST_DATE}
+            cursor = self.connection().execute(SQL_ITER_RANGE, params)
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield batch
+
+    def insert_records(self, records):
+        """Insert display rows ("10/06/25" dates, decimal string or microgram quantities) in one transaction."""
+        rows = [(to_iso_date(r[0]), *r[1:5], parse_fixed(r[5])) for r in records]
+        conn = self.connection()
+        with conn:
+            conn.executemany(SQL_INSERT, rows)
+            apply_rollups(conn, [], rows)
+        self._notify([], rows)
+
+    def insert_entries(self, records, consumption=(), order_forms=()):
+        """Insert generated entries with their consumption in one transaction, one bulk insert per table.
+
+        records are (ISO date, customer, product code, color, lot, qty micrograms, production ID)
+        tuples and consumption rows (production ID, material, weight, loss, consumption) in
+        micrograms; order_forms are (order form no, customer) pairs. Nothing is kept if any row fails.
+        """
+        rows = [record[:6] for record in records]
+        conn = self.connection()
+        with conn:
+            conn.executemany(SQL_INSERT_ENTRY, records)
+            conn.executemany(SQL_INSERT_CONSUMPTION, consumption)
+            conn.executemany(SQL_INSERT_ORDER_FORM, order_forms)
+            apply_rollups(conn, [], rows)
+        self._notify([], rows)
+
+    def update_record(self, record_id, record):
+        """Replace one record with a display row, as accepted by insert_records."""
+        row = (to_iso_date(record[0]), *record[1:5], parse_fixed(record[5]))
+        conn = self.connection()
+        with conn:
+            old = conn.execute(SQL_RECORD, {"id": record_id}).fetchone()
+            if old is None:
+                raise KeyError(record_id)
+            conn.execute(SQL_UPDATE, (*row, record_id))
+            apply_rollups(conn, [old], [row])
+        self._notify([old], [row])
+
+    def fetch_raw_before(self, cutoff, since=None):
+        """Return (id, ISO date, ..., qty micrograms) rows dated from since up to the ISO cutoff date."""
+        params = {"since": since or FIRST_DATE, "cutoff": cutoff}
+        return self.connection().execute(SQL_RAW_BEFORE, params).fetchall()
+
+    def delete_before(self, cutoff, since=None):
+        """Delete records moved to the archive; the summary rollups keep counting them."""
+        params = {"since": since or FIRST_DATE, "cutoff": cutoff}
+        conn = self.connection()
+        with conn:
+            removed = [row[1:7] for row in conn.execute(SQL_RAW_BEFORE, params)] if self._listeners else []
+            conn.execute(SQL_DELETE_BEFORE, params)
+        self._notify(removed, [])
+
+    def insert_raw(self, records):
+        """Insert rows as returned by fetch_raw_before, keeping their ids, in one transaction."""
+        if not records:
+            return
+        conn = self.connection()
+        with conn:
+            ids = [record[0] for record in records]
+            params = {"first": min(ids), "last": max(ids)}
+            existing = {row[0] for row in conn.execute(SQL_IDS_BETWEEN, params)}
+            added = [record for record in records if record[0] not in existing]
+            conn.executemany(SQL_INSERT_RAW, added)
+        self._notify([], [record[1:7] for record in added])
+
+    def summarize(self, grain="month", dimensions=("customer", "product_code", "color"), first=None, last=None):
+        """Summarize production per day, week or month from the rollups, covering archived records too."""
+        return summarize(self.connection(), grain, dimensions, first, last)
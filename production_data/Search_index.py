@@ -0,0 +1,193 @@
+import bisect
+from array import array
+from collections import defaultdict
+
+import numpy as np
+
+from production_data.Lot_index import LotRangeIndex, MERGE_INSERT_MAX
+
+# Column positions of the searchable fields in a production record row
+CUSTOMER, PRODUCT_CODE, COLOR, LOT_NO = 1, 2, 3, 4
+CATEGORY_FIELDS = (CUSTOMER, PRODUCT_CODE, COLOR)
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def merge_lots(lots, rows, new_lots, new_rows):
+    """Merge lots added at rows new_rows into a sorted lot list and its row array.
+
+    Returns the lot list, which may be lots itself updated in place, and a new row array.
+    """
+    if len(new_lots) > MERGE_INSERT_MAX:
+        merged = lots + new_lots
+        # A stable sort keeps rows with the same lot in row order
+        order = sorted(range(len(merged)), key=merged.__getitem__)
+        return [merged[position] for position in order], np.concatenate([rows, new_rows])[order]
+    order = sorted(range(len(new_lots)), key=new_lots.__getitem__)
+    new_lots, new_rows = [new_lots[position] for position in order], new_rows[order]
+    # Later rows follow earlier rows with the same lot, so each goes after its equals
+    positions = [bisect.bisect_right(lots, lot) for lot in new_lots]
+    for position, lot in reversed(list(zip(positions, new_lots))):
+        lots.insert(position, lot)
+    return lots, np.insert(rows, positions, new_rows)
+
+
+class CategoryIndex:
+    """Trigram index over the distinct values of one low-cardinality column."""
+
+    def __init__(self):
+        self.values = []            # value id -> lower-cased value
+        self.value_ids = {}         # lower-cased value -> value id
+        self.rows = []              # value id -> list of row ids
+        self._row_arrays = {}       # value id -> cached np.ndarray of rows
+        self._grams = defaultdict(set)
+        self._short = defaultdict(set)  # 1-2 character word prefixes
+
+    def add(self, row, value):
+        value = value.lower()
+        value_id = self.value_ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self.values.append(value)
+            self.value_ids[value] = value_id
+            self.rows.append([])
+            for gram in trigrams(value):
+                self._grams[gram].add(value_id)
+            for word in value.split():
+                self._short[word[:1]].add(value_id)
+                self._short[word[:2]].add(value_id)
+        self.rows[value_id].append(row)
+        self._row_arrays.pop(value_id, None)
+
+    def match_values(self, word):
+        """Return ids of the values containing word (word prefix for 1-2 characters)."""
+        if len(word) < 3:
+            return self._short.get(word, set())
+        grams = sorted((self._grams.get(g, set()) for g in trigrams(word)), key=len)
+        candidates = set.intersection(*grams) if grams else set()
+        return {value_id for value_id in candidates if word in self.values[value_id]}
+
+    def row_array(self, value_id):
+        rows = self._row_arrays.get(value_id)
+        if rows is None:
+            rows = self._row_arrays[value_id] = np.array(self.rows[value_id], dtype=np.int64)
+        return rows
+
+    def compacted(self):
+        """Return every value's row array as it stands now; safe to call off the GUI thread."""
+        return [np.array(rows[:], dtype=np.int64) for rows in self.rows[:]]
+
+    def install(self, arrays):
+        """Cache row arrays from compacted() for the values that gained no rows since."""
+        for value_id, rows in enumerate(arrays):
+            if len(rows) == len(self.rows[value_id]):
+                self._row_arrays[value_id] = rows
+
+
+class LotPrefixIndex:
+    """Sorted lot number strings answering prefix queries by binary search."""
+
+    def __init__(self):
+        self._lots = []
+        self._rows = np.empty(0, dtype=np.int64)
+        self._pending_lots = []
+        self._pending_rows = array("q")
+        self._flushes = 0
+
+    def add(self, row, lot_no):
+        self._pending_lots.append(lot_no.lower())
+        self._pending_rows.append(row)
+
+    def flush(self):
+        """Merge lots added since the last query into the sorted arrays."""
+        if self._pending_rows:
+            self._lots, self._rows = merge_lots(self._lots, self._rows, self._pending_lots,
+                                                np.array(self._pending_rows, dtype=np.int64))
+            self._pending_lots, self._pending_rows = [], array("q")
+            self._flushes += 1
+
+    def compacted(self):
+        """Return sorted arrays with the lots pending now merged in, without changing the index.
+
+        Safe to call off the GUI thread; hand the result to install() on the GUI thread.
+        """
+        # add() appends the lot first, so there are at least as many pending lots as rows
+        flushes, rows = self._flushes, np.array(self._pending_rows[:], dtype=np.int64)
+        pending = len(rows)
+        return (flushes, *merge_lots(self._lots[:], self._rows, self._pending_lots[:pending], rows), pending)
+
+    def install(self, compacted):
+        """Adopt arrays from compacted() unless the index was flushed in the meantime."""
+        flushes, lots, rows, merged = compacted
+        if self._flushes == flushes:
+            self._lots, self._rows = lots, rows
+            del self._pending_lots[:merged], self._pending_rows[:merged]
+            self._flushes += 1
+
+    def match(self, prefix):
+        self.flush()
+        start = bisect.bisect_left(self._lots, prefix)
+        end = bisect.bisect_left(self._lots, prefix + "\uffff")
+        return self._rows[start:end]
+
+
+class SearchIndex:
+    """In-memory search over customer, product code, color and lot number."""
+
+    def __init__(self):
+        self.row_count = 0
+        self.categories = {field: CategoryIndex() for field in CATEGORY_FIELDS}
+        self.lots = LotPrefixIndex()
+        self.lot_ranges = LotRangeIndex()
+
+    def add_records(self, records):
+        """Index a batch of rows; row ids continue from the previous batch."""
+        for record in records:
+            row = self.row_count
+            for field, index in self.categories.items():
+                index.add(row, record[field])
+            self.lots.add(row, record[LOT_NO])
+            self.lot_ranges.add(row, record[LOT_NO])
+            self.row_count += 1
+
+    def compacted(self):
+        """Build the sorted and cached arrays for the rows indexed so far, leaving the index as it is.
+
+        Runs off the GUI thread while rows may still be added; install() the result on the GUI thread.
+        """
+        return (self.lots.compacted(), self.lot_ranges.compacted(),
+                {field: index.compacted() for field, index in self.categories.items()})
+
+    def install(self, compacted):
+        """Adopt the arrays from compacted() so the first queries need not build them."""
+        lots, lot_ranges, categories = compacted
+        self.lots.install(lots)
+        self.lot_ranges.install(lot_ranges)
+        for field, arrays in categories.items():
+            self.categories[field].install(arrays)
+
+    def match_word(self, word):
+        """Return a boolean row mask of records where any field matches word."""
+        mask = np.zeros(self.row_count, dtype=bool)
+        for index in self.categories.values():
+            for value_id in index.match_values(word):
+                mask[index.row_array(value_id)] = True
+        mask[self.lots.match(word)] = True
+        return mask
+
+    def search(self, text):
+        """Return a boolean row mask of records matching every word of text."""
+        mask = None
+        for word in text.lower().split():
+            word_mask = self.match_word(word)
+            mask = word_mask if mask is None else mask & word_mask
+        return mask
+
+    def search_lot(self, lot_no):
+        """Return a boolean row mask of records whose lot number starts with or whose range contains lot_no."""
+        mask = np.zeros(self.row_count, dtype=bool)
+        mask[self.lots.match(lot_no.strip().lower())] = True
+        mask[self.lot_ranges.find(lot_no)] = True
+        return mask
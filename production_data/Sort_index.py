@@ -0,0 +1,79 @@
+import numpy as np
+
+# Column positions in a production record row
+DATE, CUSTOMER, PRODUCT_CODE = 0, 1, 2
+
+
+def collation_key(value):
+    return value.casefold(), value
+
+
+class CollationRanks:
+    """Case-insensitive ranks of a text column's distinct values, renumbered as new values arrive."""
+
+    def __init__(self):
+        self.distinct = []  # distinct values in rank order
+        self.ranks = {}
+
+    def extend(self, values):
+        """Rank values, taking in the ones not seen before.
+
+        Returns their int64 ranks and, when new values moved existing ranks, an array mapping
+        each old rank to its new one (otherwise None).
+        """
+        new = set(values).difference(self.ranks)
+        remap = None
+        if new:
+            old = self.distinct
+            self.distinct = sorted(old + list(new), key=collation_key)
+            self.ranks = {value: rank for rank, value in enumerate(self.distinct)}
+            remap = np.fromiter((self.ranks[value] for value in old), dtype=np.int64, count=len(old))
+        return np.fromiter((self.ranks[value] for value in values), dtype=np.int64, count=len(values)), remap
+
+
+class SortPermutations:
+    """Row permutations for each sort mode, extended in place as rows are appended.
+
+    Each mode keeps its sort keys in permutation order, so appended rows are merged in at
+    their searchsorted positions instead of re-sorting every row.
+    """
+
+    def __init__(self):
+        self.row_count = 0
+        self._ranks = {CUSTOMER: CollationRanks(), PRODUCT_CODE: CollationRanks()}
+        self._permutations = {}
+        self._sorted_keys = {}
+        for key in ("date_old", "date_new", "customer", "product_code"):
+            self._permutations[key] = self._sorted_keys[key] = np.empty(0, dtype=np.int64)
+
+    @staticmethod
+    def columns(model, first=0):
+        """Copy the columns the sort modes read from row first on, for extend() on any thread."""
+        return (model.column_array(DATE)[first:].copy(), model.column_values(CUSTOMER)[first:],
+                model.column_values(PRODUCT_CODE)[first:])
+
+    def extend(self, dates, customers, product_codes):
+        """Merge the rows that follow row_count into every permutation.
+
+        dates is an int64 array of day ordinals and the others are lists of text values.
+        """
+        keys = {"date_old": dates, "date_new": -dates}
+        for key, column, values in (("customer", CUSTOMER, customers), ("product_code", PRODUCT_CODE, product_codes)):
+            keys[key], remap = self._ranks[column].extend(values)
+            if remap is not None:
+                self._sorted_keys[key] = remap[self._sorted_keys[key]]
+        rows = np.arange(self.row_count, self.row_count + len(dates), dtype=np.int64)
+        for key, new_keys in keys.items():
+            # Stable order, and insertion after equal keys, keep rows of equal keys in their loaded order
+            order = np.argsort(new_keys, kind="stable")
+            new_keys = new_keys[order]
+            positions = np.searchsorted(self._sorted_keys[key], new_keys, side="right")
+            self._sorted_keys[key] = np.insert(self._sorted_keys[key], positions, new_keys)
+            self._permutations[key] = np.insert(self._permutations[key], positions, rows[order])
+        self.row_count += len(dates)
+
+    def get(self, key, model):
+        """Return the permutation for a sort mode, merging in rows appended since the last call."""
+        if self.row_count < model.source_count():
+            self.extend(*self.columns(model, self.row_count))
+        return self._permutations[key]
@@ -0,0 +1,118 @@
+import threading
+from collections import Counter
+
+# Column positions in a stored record (production_date, customer, product_code, color, lot_no, qty_produced_ug)
+DATE, CUSTOMER, PRODUCT_CODE, QTY = 0, 1, 2, 5
+
+SQL_AGGREGATE = ("SELECT production_date, customer, product_code, COUNT(*), SUM(qty_produced_ug) "
+                 "FROM production_record GROUP BY production_date, customer, product_code")
+# Materials of each product code's latest formulation, the one its records are produced with
+SQL_PRODUCT_MATERIALS = ("SELECT formulation.product_code, formulation_material.material_code FROM formulation "
+                         "JOIN formulation_material ON formulation_material.formulation_id = formulation.id "
+                         "WHERE formulation.id IN (SELECT MAX(id) FROM formulation GROUP BY product_code)")
+SQL_MATERIALS_OF_PRODUCT = ("SELECT material_code FROM formulation_material WHERE formulation_id = "
+                            "(SELECT MAX(id) FROM formulation WHERE product_code = ?)")
+
+
+class ProductionStatistics:
+    """Running production aggregates, updated from store change events instead of rescans.
+
+    Customer and product code keys are casefolded to match the store's NOCASE columns.
+    Quantities are integer micrograms. Reads are O(1) lookups into the running totals.
+    Materials used counts the distinct materials in the formulations of the product codes
+    that have records; each material is reference-counted by those products.
+    """
+
+    def __init__(self, store=None):
+        self.store = store
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.record_count = 0
+        self.total_qty = 0
+        self.qty_by_customer = Counter()
+        self.qty_by_product = Counter()
+        self.qty_by_day = Counter()
+        self._product_records = Counter()
+        self._product_materials = {}  # product key -> material keys of its formulation
+        self._material_refs = Counter()
+
+    def load(self, store):
+        """Seed the aggregates with a single grouped scan of the store."""
+        self.store = store
+        conn = store.connection()
+        record_count, total_qty = 0, 0
+        by_customer, by_product, by_day, product_records = Counter(), Counter(), Counter(), Counter()
+        for day, customer, product_code, count, qty in conn.execute(SQL_AGGREGATE):
+            record_count += count
+            total_qty += qty
+            by_customer[customer.casefold()] += qty
+            by_product[product_code.casefold()] += qty
+            by_day[day] += qty
+            product_records[product_code.casefold()] += count
+        product_materials = {}
+        for product_code, material in conn.execute(SQL_PRODUCT_MATERIALS):
+            product_materials.setdefault(product_code.casefold(), set()).add(material.casefold())
+        material_refs = Counter()
+        for product in product_records:
+            material_refs.update(product_materials.get(product, ()))
+        with self._lock:
+            self.record_count, self.total_qty = record_count, total_qty
+            self.qty_by_customer, self.qty_by_product, self.qty_by_day = by_customer, by_product, by_day
+            self._product_records, self._product_materials = product_records, product_materials
+            self._material_refs = material_refs
+            self._loaded = True
+
+    def on_records_changed(self, removed, added):
+        """Store listener: apply removed and added records (an update passes both)."""
+        with self._lock:
+            # Changes made before the first load are already part of its scan
+            if not self._loaded:
+                return
+            self._apply(removed, -1)
+            self._apply(added, 1)
+
+    def _apply(self, records, sign):
+        for record in records:
+            qty = sign * record[QTY]
+            self.record_count += sign
+            self.total_qty += qty
+            for totals, key in ((self.qty_by_customer, record[CUSTOMER].casefold()),
+                                (self.qty_by_product, record[PRODUCT_CODE].casefold()),
+                                (self.qty_by_day, record[DATE])):
+                totals[key] += qty
+                if sign < 0 and not totals[key]:
+                    del totals[key]
+            self._count_product(record[PRODUCT_CODE].casefold(), sign)
+
+    def _count_product(self, product, sign):
+        """Reference a product's materials when its first record arrives; release them with its last."""
+        self._product_records[product] += sign
+        count = self._product_records[product]
+        if count == 0:
+            del self._product_records[product]
+            self._material_refs.subtract(self._materials_of(product))
+            self._material_refs += Counter()  # drop materials no longer referenced
+        elif count == 1 and sign > 0:
+            self._material_refs.update(self._materials_of(product))
+
+    def _materials_of(self, product):
+        materials = self._product_materials.get(product)
+        if materials is None:
+            # A product first seen after loading; its formulation is looked up once
+            rows = self.store.connection().execute(SQL_MATERIALS_OF_PRODUCT, (product,)) if self.store else ()
+            materials = self._product_materials[product] = {material.casefold() for material, in rows}
+        return materials
+
+    @property
+    def materials_used(self):
+        """Number of distinct materials in the formulations of the products with records."""
+        return len(self._material_refs)
+
+    def customer_qty(self, customer):
+        return self.qty_by_customer.get(customer.casefold(), 0)
+
+    def product_qty(self, product_code):
+        return self.qty_by_product.get(product_code.casefold(), 0)
+
+    def day_qty(self, iso_date):
+        return self.qty_by_day.get(iso_date, 0)
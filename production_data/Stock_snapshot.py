@@ -0,0 +1,59 @@
+import threading
+
+import numpy as np
+
+
+class StockSnapshot:
+    """Per-material on-hand balances in one int64 array, for availability checks without queries.
+
+    Loaded once from the ledger's running balances and kept current by its change notifications.
+    Material codes map to array slots through a dict of casefolded codes. A material the ledger
+    has never posted gets an untracked slot the first time it is asked about and is never
+    reported short, since the warehouse keeps no stock record for it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._slots = {}
+        self.on_hand = np.zeros(0, dtype=np.int64)
+        self.tracked = np.zeros(0, dtype=bool)
+
+    def load(self, ledger):
+        balances = ledger.balances()
+        with self._lock:
+            self._slots = {material: slot for slot, material in enumerate(balances)}
+            self.on_hand = np.fromiter(balances.values(), dtype=np.int64, count=len(balances))
+            self.tracked = np.ones(len(balances), dtype=bool)
+
+    def on_stock_changed(self, changes):
+        """Ledger listener: changes maps casefolded material codes to their new on-hand micrograms."""
+        with self._lock:
+            slots = self._slot_array(changes)
+            self.on_hand[slots] = list(changes.values())
+            self.tracked[slots] = True
+
+    def _slot_array(self, materials):
+        keys = [material.casefold() for material in materials]
+        new = [key for key in dict.fromkeys(keys) if key not in self._slots]
+        if new:
+            first = len(self._slots)
+            self._slots.update((key, first + offset) for offset, key in enumerate(new))
+            self.on_hand = np.concatenate([self.on_hand, np.zeros(len(new), dtype=np.int64)])
+            self.tracked = np.concatenate([self.tracked, np.zeros(len(new), dtype=bool)])
+        return np.fromiter((self._slots[key] for key in keys), dtype=np.int64, count=len(keys))
+
+    def shortfalls(self, materials, required):
+        """Return the micrograms each material column lacks in stock, checked all at once.
+
+        required is one row of micrograms per material, or a planned productions x materials
+        matrix whose rows are summed; a material in several columns is checked against its
+        combined requirement. Untracked materials are never short.
+        """
+        required = np.asarray(required, dtype=np.int64)
+        if required.ndim == 2:
+            required = required.sum(axis=0)
+        with self._lock:
+            slots = self._slot_array(materials)
+            needed = np.zeros(len(self.on_hand), dtype=np.int64)
+            np.add.at(needed, slots, required)
+            return np.where(self.tracked, np.maximum(needed - self.on_hand, 0), 0)[slots]
@@ -0,0 +1,99 @@
+from collections import Counter
+from datetime import date, timedelta
+
+# Rollups are kept per period at the finest dimension grain; coarser groupings sum these rows
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS production_rollup (
+    grain TEXT NOT NULL,
+    period_start TEXT NOT NULL,
+    customer TEXT NOT NULL COLLATE NOCASE,
+    product_code TEXT NOT NULL COLLATE NOCASE,
+    color TEXT NOT NULL COLLATE NOCASE,
+    record_count INTEGER NOT NULL,
+    qty_produced_ug INTEGER NOT NULL,
+    PRIMARY KEY (grain, period_start, customer, product_code, color)
+) WITHOUT ROWID;
+"""
+
+GRAINS = ("day", "week", "month")
+DIMENSIONS = ("customer", "product_code", "color")
+
+# Period starts for each grain, computed in SQLite for the one-off backfill
+PERIOD_SQL = {
+    "day": "production_date",
+    "week": "date(production_date, 'weekday 0', '-6 days')",
+    "month": "substr(production_date, 1, 7) || '-01'",
+}
+
+SQL_UPSERT = ("INSERT INTO production_rollup VALUES (?, ?, ?, ?, ?, ?, ?) "
+              "ON CONFLICT (grain, period_start, customer, product_code, color) DO UPDATE SET "
+              "record_count = record_count + excluded.record_count, "
+              "qty_produced_ug = qty_produced_ug + excluded.qty_produced_ug")
+SQL_PRUNE = "DELETE FROM production_rollup WHERE record_count <= 0"
+SQL_BACKFILL = ("INSERT INTO production_rollup SELECT '{grain}', {period}, customer, product_code, color, "
+                "COUNT(*), SUM(qty_produced_ug) FROM production_record "
+                "GROUP BY {period}, customer, product_code, color")
+
+
+def period_start(iso_date, grain):
+    """Return the ISO date starting the day, Monday-based week or month containing iso_date."""
+    if grain == "day":
+        return iso_date
+    if grain == "month":
+        return iso_date[:8] + "01"
+    day = date.fromisoformat(iso_date)
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+def rollup_deltas(removed, added):
+    """Fold stored record tuples into per-cell (count, qty) deltas for every grain."""
+    counts, quantities = Counter(), Counter()
+    for records, sign in ((removed, -1), (added, 1)):
+        for production_date, customer, product_code, color, _lot_no, qty in records:
+            for grain in GRAINS:
+                key = (grain, period_start(production_date, grain), customer, product_code, color)
+                counts[key] += sign
+                quantities[key] += sign * qty
+    return [(*key, counts[key], quantities[key]) for key in counts if counts[key] or quantities[key]]
+
+
+def apply_rollups(conn, removed, added):
+    """Upsert rollup deltas on conn; call inside the transaction that changes the records."""
+    deltas = rollup_deltas(removed, added)
+    if not deltas:
+        return
+    conn.executemany(SQL_UPSERT, deltas)
+    if removed:
+        conn.execute(SQL_PRUNE)
+
+
+def create_rollups(conn):
+    """Create the rollup table, backfilling it from existing records when it is new."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'production_rollup'").fetchone()
+    if exists:
+        return
+    with conn:
+        conn.executescript(ROLLUP_SCHEMA)
+        for grain in GRAINS:
+            conn.execute(SQL_BACKFILL.format(grain=grain, period=PERIOD_SQL[grain]))
+
+
+def summarize(conn, grain="month", dimensions=DIMENSIONS, first=None, last=None):
+    """Return (period start, *dimension values, record count, qty micrograms) rows from the rollups.
+
+    first and last are ISO dates matched against period starts; dimensions may be any subset.
+    """
+    if grain not in GRAINS:
+        raise ValueError(f"Unknown summary grain: {grain}")
+    unknown = set(dimensions) - set(DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Unknown summary dimension(s): {', '.join(sorted(unknown))}")
+    columns = ", ".join(("period_start", *dimensions))
+    sql = (f"SELECT {columns}, SUM(record_count), SUM(qty_produced_ug) FROM production_rollup "
+           "WHERE grain = :grain AND period_start BETWEEN :first AND :last "
+           f"GROUP BY {columns} ORDER BY {columns}")
+    # A period that starts before first but contains it is still included
+    first = period_start(first, grain) if first else "0000-01-01"
+    params = {"grain": grain, "first": first, "last": last or "9999-12-31"}
+    return conn.execute(sql, params).fetchall()
@@ -0,0 +1,2 @@
+# Accounts offered at login and as PREPARED BY names
+USERNAMES = ["Admin", "User1 Technician", "User2 Manager", "Guest"]
@@ -0,0 +1,148 @@
+import sqlite3
+import threading
+
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stock_ledger (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    posted_date TEXT NOT NULL,
+    material_code TEXT NOT NULL COLLATE NOCASE,
+    production_id INTEGER,
+    qty_ug INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stock_ledger_production_id ON stock_ledger (production_id);
+CREATE TABLE IF NOT EXISTS stock_balance (
+    material_code TEXT PRIMARY KEY COLLATE NOCASE,
+    on_hand_ug INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+SQL_INSERT_POSTING = "INSERT INTO stock_ledger (posted_date, material_code, production_id, qty_ug) VALUES (?, ?, ?, ?)"
+# Balances move by the batch's net change per material; the ledger itself is never summed
+SQL_ADD_BALANCE = ("INSERT INTO stock_balance (material_code, on_hand_ug) VALUES (?, ?) "
+                   "ON CONFLICT (material_code) DO UPDATE SET on_hand_ug = on_hand_ug + excluded.on_hand_ug")
+SQL_BALANCES = "SELECT material_code, on_hand_ug FROM stock_balance"
+
+
+class WarehouseLedger:
+    """Material stock movements posted through a write-behind queue, with running balances.
+
+    post() only queues: postings for the same date, material and production ID are coalesced,
+    and a background thread writes them with the balances' net changes in one transaction per
+    batch, every flush_interval seconds or as soon as max_pending postings wait. Balances are
+    running totals that already include queued postings, so reading one or confirming a
+    production never scans the ledger. Receipts are positive and draw-downs negative, all in
+    int64 micrograms; material keys are casefolded to match the NOCASE columns.
+    """
+
+    def __init__(self, store, flush_interval=1.0, max_pending=500):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}  # (date, material key, production ID) -> posting
+        self._wake = threading.Event()
+        self._closed = False
+        self._flusher = None
+        self._listeners = []
+        conn = store.connection()
+        conn.executescript(LEDGER_SCHEMA)
+        self._balances = {material.casefold(): on_hand for material, on_hand in conn.execute(SQL_BALANCES)}
+
+    def post(self, postings):
+        """Queue (ISO date, material, production ID or None, qty micrograms) postings."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("the ledger is closed")
+            changed = {}
+            for posted_date, material, production_id, qty in postings:
+                material_key = material.casefold()
+                key = (posted_date, material_key, production_id)
+                queued = self._pending.get(key)
+                self._pending[key] = (posted_date, material, production_id, qty + (queued[3] if queued else 0))
+                self._balances[material_key] = changed[material_key] = self._balances.get(material_key, 0) + qty
+            full = len(self._pending) >= self.max_pending
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._run, name="ledger-flush", daemon=True)
+                self._flusher.start()
+        if full:
+            self._wake.set()
+        self._notify(changed)
+
+    def add_listener(self, callback):
+        """Call callback(changes) with {casefolded material: on-hand micrograms} after every post."""
+        self._listeners.append(callback)
+
+    def _notify(self, changed):
+        for callback in self._listeners:
+            callback(changed)
+
+    def confirm(self, consumption, posted_date):
+        """Draw generated entries' consumption, (production ID, material, weight, loss, consumption)
+        rows in micrograms, from stock as of the inventory confirmation date."""
+        self.post([(posted_date, material, production_id, -consumed)
+                   for production_id, material, _, _, consumed in consumption])
+
+    def receive(self, receipts, posted_date):
+        """Add (material, qty micrograms) receipts to stock as of posted_date."""
+        self.post([(posted_date, material, None, qty) for material, qty in receipts])
+
+    def balance(self, material):
+        """Return a material's on-hand micrograms, queued postings included."""
+        return self._balances.get(material.casefold(), 0)
+
+    def balances(self):
+        """Return a copy of every material's on-hand micrograms keyed by casefolded code."""
+        with self._lock:
+            return dict(self._balances)
+
+    @property
+    def pending_count(self):
+        return len(self._pending)
+
+    def flush(self):
+        """Write every queued posting in one transaction and return how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            deltas = {}
+            for _, material, _, qty in pending.values():
+                name, total = deltas.get(material.casefold(), (material, 0))
+                deltas[material.casefold()] = (name, total + qty)
+            conn = self.store.connection()
+            try:
+                with conn:
+                    conn.executemany(SQL_INSERT_POSTING, pending.values())
+                    conn.executemany(SQL_ADD_BALANCE, deltas.values())
+            except BaseException:
+                # Requeue in front of anything posted meanwhile; the running balances already count both
+                with self._lock:
+                    for key, posting in self._pending.items():
+                        queued = pending.get(key)
+                        pending[key] = posting[:3] + (posting[3] + (queued[3] if queued else 0),)
+                    self._pending = pending
+                raise
+            return len(pending)
+
+    def close(self):
+        """Stop the background writer and flush what is still queued."""
+        with self._lock:
+            self._closed = True
+            flusher = self._flusher
+        if flusher is not None:
+            self._wake.set()
+            flusher.join()
+        self.flush()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as exc:
+                self.last_error = exc  # kept queued and retried on the next round
+        self.store.close()
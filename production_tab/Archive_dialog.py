@@ -0,0 +1,62 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QAbstractItemView, QLabel, QPushButton, QMessageBox)
+from PyQt6.QtCore import pyqtSignal
+
+from production_tab.Theme import font
+
+
+class ArchiveDialog(QDialog):
+    """List the monthly archive partitions and move selected months back to the hot store."""
+
+    restored = pyqtSignal(int)
+
+    def __init__(self, archive, store, parent=None):
+        super().__init__(parent)
+        self.archive = archive
+        self.store = store
+        self.setWindowTitle("Production Archives")
+        self.resize(560, 400)
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        self.summary_label.setFont(font(9))
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Month", "Records", "First Date", "Last Date"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        restore_btn = QPushButton("♻ Restore Selected")
+        restore_btn.clicked.connect(self.restore_selected)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        buttons.addWidget(restore_btn)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+        self.refresh()
+
+    def refresh(self):
+        """Reload the partition list; only partition headers are read."""
+        partitions = self.archive.partitions()
+        self.table.setRowCount(len(partitions))
+        for row, partition in enumerate(partitions):
+            for column, value in enumerate(partition):
+                self.table.setItem(row, column, QTableWidgetItem(str(value)))
+        total = sum(partition[1] for partition in partitions)
+        self.summary_label.setText(f"📦 {len(partitions)} archived month(s), {total} record(s)")
+
+    def restore_selected(self):
+        months = sorted({self.table.item(index.row(), 0).text() for index in self.table.selectedIndexes()})
+        if not months:
+            QMessageBox.information(self, "Restore Data", "Select the archived months to restore.")
+            return
+        restored = sum(self.archive.restore(self.store, month) for month in months)
+        self.refresh()
+        self.restored.emit(restored)
@@ -1,328 +1,212 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox,
-                             QTableWidget, QTableWidgetItem, QHeaderView, QFrame, QFormLayout, QTextEdit)
+import sqlite3
+import time
+from datetime import date, datetime
+from functools import partial
+
+import numpy as np
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableView, QHeaderView, QFrame,
+                             QAbstractItemView, QMessageBox)
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
+from PyQt6.QtGui import QKeySequence, QShortcut
+
+from production_tab.Theme import ModernButton, font
+from production_tab.Production_model import MaterialTableModel
+from production_tab.Completer_model import attach_prefix_completer
+from production_tab.Form_engine import (BLANK_DATE, FieldSpec, FormEngine, date_text, integer, is_blank, lot_text,
+                                       number, today)
+from production_data.Consumption_calculator import compute_consumption, material_rows, lot_consumption
+from production_data.Formulation_repository import DEFAULT_FORMULATION_ID
+from production_data.Id_allocator import format_production_id
+from production_data.Batch_generator import expand_lots, split_evenly, batch_quantities
+from production_data.Fixed_point import UNITS_PER_KG, format_fixed, parse_fixed
+
+# The Auto Generate form as data: fields with a label go in the Form Details card in this order,
+# the unlabelled ones are placed beside the materials table and in the encoded-by rows
+AUTO_GENERATE_FIELDS = (
+    FieldSpec("product_code", "PRODUCT CODE *", "combo", True, "BA0830E"),
+    FieldSpec("product_color", "PRODUCT COLOR", default="BLUE"),
+    FieldSpec("dosage", "DOSAGE *", required=True, default="100.00000", validator=number, width=100),
+    FieldSpec("ld", "LD (%)", default="0.40000", validator=number, width=80, joins="dosage"),
+    FieldSpec("customer", "CUSTOMER *", "combo", True, "Una Internationale"),
+    FieldSpec("lot_no", "LOT NO. *", "combo", True, validator=lot_text),
+    FieldSpec("tentative_date", "TENTATIVE PRODUCTION DATE *", required=True, default=today, validator=date_text),
+    FieldSpec("confirm_date", "CONFIRMATION DATE FOR INVENTORY ONLY *", default=BLANK_DATE, validator=date_text),
+    FieldSpec("order_form", "ORDER FORM NO. *", "combo", True),
+    FieldSpec("colormatch_no", "COLORMATCH NO.", default="-"),
+    FieldSpec("matched_date", "MATCHED DATE", default="02/14/2025", validator=date_text),
+    FieldSpec("formulation_id", "FORMULATION ID", default=str(DEFAULT_FORMULATION_ID), validator=integer),
+    FieldSpec("mixing_time", "MIXING TIME", default="-"),
+    FieldSpec("machine_no", "MACHINE NO."),
+    FieldSpec("qty_req", "QTY. REQ. *", required=True, default="0.0000000", validator=number),
+    FieldSpec("qty_per_batch", "QTY. PER BATCH *", required=True, default="0.0000000", validator=number),
+    FieldSpec("prepared_by", "PREPARED BY *", "combo", True),
+    FieldSpec("notes", "NOTES", "text"),
+    FieldSpec("form_type", "", "choice", True, width=150),
+    FieldSpec("confirm_encoded", "", required=True, default="0000000", width=120),
+    FieldSpec("prod_encoded", "", default=BLANK_DATE, width=100),
+)
+# Fields checked before entries are generated
+DETAIL_FIELDS = tuple(spec.name for spec in AUTO_GENERATE_FIELDS if spec.label)
+# Editable combos completed from the production records
+COMPLETED_FIELDS = ("product_code", "customer", "lot_no", "order_form", "prepared_by")
+# Inputs of the consumption calculation
+QUANTITY_FIELDS = ("dosage", "ld", "qty_req", "qty_per_batch")
+# Shortcut that refills the form from the last generated entry
+COPY_PREVIOUS = "Ctrl+D"
 
 
 class AutoGenerateTab(QWidget):
-    def __init__(self, username, current_date):
+    def __init__(self, username, current_date, main_window):
         super().__init__()
         self.username = username
         self.current_date = current_date
+        self.main_window = main_window
+        self.formulations = main_window.formulations
+        self.product_index = main_window.product_index
+        self.formulation = self.formulations.get(DEFAULT_FORMULATION_ID)
+        self.production_id = main_window.production_ids.next_id()
+        self.form = FormEngine(AUTO_GENERATE_FIELDS, defaults={"prepared_by": username})
+        # Fields of the last generated entry that differ from the defaults, for COPY_PREVIOUS
+        self.last_entry = {}
+        # Material names and total consumption micrograms currently in the materials table
+        self._consumption = [], np.zeros(0, dtype=np.int64)
         self.setup_ui()
+        self.recalculate_materials()
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
-        layout.setContentsMargins(10, 10, 10, 10)
-        layout.setSpacing(5)
-
-        # Title
-        title = QLabel("PRODUCTION - AUTO GENERATE RECORDS - WITH CONSUMPTION BY WH")
-        title.setFont(QFont("Arial", 11, QFont.Weight.Bold))
-        title.setAlignment(Qt.AlignmentFlag.AlignLeft)
-        title.setStyleSheet("background-color: lightblue; padding: 5px;")
-        layout.addWidget(title)
-
-        # User and Tab Section
-        user_tab_layout = QHBoxLayout()
-        user_label = QLabel(f"👤 USER : {self.username}")
-        user_label.setFont(QFont("Arial", 9))
-        user_tab_layout.addWidget(user_label)
-
-        prod_records_btn = QPushButton("PRODUCTION RECORDS")
-        prod_records_btn.setFont(QFont("Arial", 9))
-        user_tab_layout.addWidget(prod_records_btn)
-
-        auto_gen_btn = QPushButton("AUTO-GENERATE PRODUCTION ENTRY")
-        auto_gen_btn.setFont(QFont("Arial", 9))
-        user_tab_layout.addWidget(auto_gen_btn)
-
-        user_tab_layout.addStretch()
-        layout.addLayout(user_tab_layout)
+        layout.setContentsMargins(20, 10, 20, 10)
+        layout.setSpacing(8)
 
         # Main Content Layout
         main_content = QHBoxLayout()
         main_content.setSpacing(10)
 
-        # Left Side: Icon and Label
-        left_side = QVBoxLayout()
-        left_side.setAlignment(Qt.AlignmentFlag.AlignTop)
-
-        icon_label = QLabel("🏭\n📦")  # Placeholder for production icon
-        icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        icon_label.setFont(QFont("Arial", 24))
-        left_side.addWidget(icon_label)
-
-        prod_auto_label = QLabel("PRODUCTION AUTO")
-        prod_auto_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        prod_auto_label.setFont(QFont("Arial", 8, QFont.Weight.Bold))
-        left_side.addWidget(prod_auto_label)
-
-        left_side.addStretch()
-        main_content.addLayout(left_side, 1)
-
-        # Middle: Form Fields
-        middle_layout = QVBoxLayout()
-        middle_layout.setSpacing(2)
-
-        form_widget = QWidget()
-        form_layout = QFormLayout(form_widget)
-        form_layout.setLabelAlignment(Qt.AlignmentFlag.AlignRight)
-        form_layout.setHorizontalSpacing(5)
-        form_layout.setVerticalSpacing(2)
-        form_layout.setContentsMargins(0, 0, 0, 0)
-
-        # Field styling
-        field_style = "background-color: yellow; border: 1px solid black;"
-        white_field_style = "background-color: white; border: 1px solid black;"
-        field_width = 200
-        field_height = 22
-
-        # Product Code (with asterisk for required field)
-        product_code_layout = QHBoxLayout()
-        self.product_code_combo = QComboBox()
-        self.product_code_combo.setEditable(True)
-        self.product_code_combo.setCurrentText("BA0830E")
-        self.product_code_combo.setFixedSize(field_width, field_height)
-        self.product_code_combo.setStyleSheet(field_style)
-        product_code_layout.addWidget(self.product_code_combo)
-        product_code_layout.addStretch()
-        form_layout.addRow("PRODUCT CODE      *", product_code_layout)
-
-        # Product Color
-        self.product_color_edit = QLineEdit("BLUE")
-        self.product_color_edit.setFixedSize(field_width, field_height)
-        self.product_color_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("PRODUCT COLOR", self.product_color_edit)
-
-        # Dosage and LD(%)
-        dosage_layout = QHBoxLayout()
-        dosage_layout.setSpacing(5)
-        self.dosage_edit = QLineEdit("100.00000")
-        self.dosage_edit.setFixedSize(100, field_height)
-        self.dosage_edit.setStyleSheet(field_style)
-        dosage_layout.addWidget(self.dosage_edit)
-
-        ld_label = QLabel("LD (%)")
-        dosage_layout.addWidget(ld_label)
-
-        self.ld_edit = QLineEdit("0.40000")
-        self.ld_edit.setFixedSize(80, field_height)
-        self.ld_edit.setStyleSheet(white_field_style)
-        dosage_layout.addWidget(self.ld_edit)
-        dosage_layout.addStretch()
-        form_layout.addRow("DOSAGE      *", dosage_layout)
-
-        # Customer
-        self.customer_combo = QComboBox()
-        self.customer_combo.setEditable(True)
-        self.customer_combo.setCurrentText("Una Internationale")
-        self.customer_combo.setFixedSize(field_width, field_height)
-        self.customer_combo.setStyleSheet(field_style)
-        form_layout.addRow("CUSTOMER      *", self.customer_combo)
-
-        # Lot No.
-        self.lot_no_combo = QComboBox()
-        self.lot_no_combo.setEditable(True)
-        self.lot_no_combo.setFixedSize(field_width, field_height)
-        self.lot_no_combo.setStyleSheet(field_style)
-        form_layout.addRow("LOT NO.      *", self.lot_no_combo)
-
-        # Tentative Production Date
-        self.tentative_date_edit = QLineEdit("  /  /")
-        self.tentative_date_edit.setFixedSize(field_width, field_height)
-        self.tentative_date_edit.setStyleSheet(field_style)
-        form_layout.addRow("TENTATIVE\nPRODUCTION DATE      *", self.tentative_date_edit)
-
-        # Confirmation Date for Inventory Only
-        self.confirm_date_edit = QLineEdit("  /  /")
-        self.confirm_date_edit.setFixedSize(field_width, field_height)
-        self.confirm_date_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("CONFIRMATION DATE\nFOR INVENTORY ONLY      *", self.confirm_date_edit)
-
-        # Order Form No.
-        self.order_form_combo = QComboBox()
-        self.order_form_combo.setEditable(True)
-        self.order_form_combo.setFixedSize(field_width, field_height)
-        self.order_form_combo.setStyleSheet(field_style)
-        form_layout.addRow("ORDER FORM NO.      *", self.order_form_combo)
-
-        # Colormatch No.
-        self.colormatch_no_edit = QLineEdit("-")
-        self.colormatch_no_edit.setFixedSize(field_width, field_height)
-        self.colormatch_no_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("COLORMATCH NO.", self.colormatch_no_edit)
-
-        # Matched Date
-        self.matched_date_edit = QLineEdit("02/14/2025")
-        self.matched_date_edit.setFixedSize(field_width, field_height)
-        self.matched_date_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("MATCHED DATE", self.matched_date_edit)
-
-        # Formulation ID
-        self.formulation_id_edit = QLineEdit("16026")
-        self.formulation_id_edit.setFixedSize(field_width, field_height)
-        self.formulation_id_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("FORMULATION ID", self.formulation_id_edit)
-
-        # Mixing Time
-        self.mixing_time_edit = QLineEdit("-")
-        self.mixing_time_edit.setFixedSize(field_width, field_height)
-        self.mixing_time_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("MIXING TIME", self.mixing_time_edit)
-
-        # Machine No.
-        self.machine_no_edit = QLineEdit()
-        self.machine_no_edit.setFixedSize(field_width, field_height)
-        self.machine_no_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("MACHINE NO.", self.machine_no_edit)
-
-        # QTY. REQ.
-        self.qty_req_edit = QLineEdit("0.0000000")
-        self.qty_req_edit.setFixedSize(field_width, field_height)
-        self.qty_req_edit.setStyleSheet(field_style)
-        form_layout.addRow("QTY. REQ.      *", self.qty_req_edit)
-
-        # QTY. PER BATCH
-        self.qty_per_batch_edit = QLineEdit("0.0000000")
-        self.qty_per_batch_edit.setFixedSize(field_width, field_height)
-        self.qty_per_batch_edit.setStyleSheet(field_style)
-        form_layout.addRow("QTY. PER BATCH      *", self.qty_per_batch_edit)
-
-        # Prepared By
-        self.prepared_by_combo = QComboBox()
-        self.prepared_by_combo.setEditable(True)
-        self.prepared_by_combo.setFixedSize(field_width, field_height)
-        self.prepared_by_combo.setStyleSheet(field_style)
-        form_layout.addRow("PREPARED BY      *", self.prepared_by_combo)
-
-        # Notes
-        self.notes_edit = QTextEdit()
-        self.notes_edit.setFixedSize(field_width, 50)
-        self.notes_edit.setStyleSheet(white_field_style)
-        form_layout.addRow("NOTES", self.notes_edit)
-
-        middle_layout.addWidget(form_widget)
-        main_content.addLayout(middle_layout, 3)
-
-        # Right Side: Form Type, Production ID, and Materials Table
-        right_layout = QVBoxLayout()
-        right_layout.setSpacing(5)
+        # Middle: Form Fields Card
+        middle_card = QFrame()
+        middle_card.setObjectName("card")
+        middle_layout = QVBoxLayout(middle_card)
+        middle_layout.setContentsMargins(15, 15, 15, 15)
+        middle_layout.setSpacing(5)
+
+        form_title = QLabel("Form Details")
+        form_title.setFont(font(10, bold=True))
+        form_title.setProperty("tone", "title")
+        middle_layout.addWidget(form_title, 2)
+
+        # Required fields are orange and optional ones white, through the theme's field property
+        middle_layout.addWidget(self.form.widget)
+        main_content.addWidget(middle_card, 3)
+
+        # Right Side: Form Type, Production ID, and Materials Card
+        right_card = QFrame()
+        right_card.setObjectName("card")
+        right_layout = QVBoxLayout(right_card)
+        right_layout.setContentsMargins(15, 15, 15, 15)
+        right_layout.setSpacing(8)
 
         # Form Type Row
         form_type_layout = QHBoxLayout()
         form_type_label = QLabel("FORM TYPE")
-        form_type_label.setFont(QFont("Arial", 9))
+        form_type_label.setFont(font(9))
         form_type_layout.addWidget(form_type_label)
-
-        self.form_type_combo = QComboBox()
-        self.form_type_combo.setFixedSize(150, field_height)
-        self.form_type_combo.setStyleSheet(field_style)
-        form_type_layout.addWidget(self.form_type_combo)
+        form_type_layout.addWidget(self.form.field("form_type"))
         form_type_layout.addStretch()
         right_layout.addLayout(form_type_layout)
 
         # Production ID
         prod_id_layout = QHBoxLayout()
         prod_id_label = QLabel("PRODUCTION ID")
-        prod_id_label.setFont(QFont("Arial", 9))
+        prod_id_label.setFont(font(9))
         prod_id_layout.addWidget(prod_id_label)
 
-        self.production_id_label = QLabel("0098744")
-        self.production_id_label.setFont(QFont("Arial", 20, QFont.Weight.Bold))
-        self.production_id_label.setStyleSheet("color: blue;")
+        self.production_id_label = QLabel(format_production_id(self.production_id))
+        self.production_id_label.setFont(font(14, bold=True))
+        self.production_id_label.setProperty("tone", "accent")
         prod_id_layout.addWidget(self.production_id_label)
         prod_id_layout.addStretch()
         right_layout.addLayout(prod_id_layout)
 
-        # Materials Table Header
-        table_header_widget = QWidget()
-        table_header_widget.setStyleSheet("background-color: darkblue;")
-        table_header_layout = QHBoxLayout(table_header_widget)
-        table_header_layout.setContentsMargins(0, 0, 0, 0)
-        table_header_layout.setSpacing(0)
-
-        headers = ["TOTAL WEIGHT (KG.)", "TOTAL LOSS (KG.)", "TOTAL CONSUMPTION (KG.)"]
-        for header in headers:
-            header_label = QLabel(header)
-            header_label.setFont(QFont("Arial", 8, QFont.Weight.Bold))
-            header_label.setStyleSheet("color: white; background-color: darkblue; padding: 3px;")
-            header_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            table_header_layout.addWidget(header_label)
-
-        right_layout.addWidget(table_header_widget)
-
-        # Large empty area for materials (simplified as empty space)
-        materials_area = QWidget()
-        materials_area.setMinimumHeight(300)
-        materials_area.setStyleSheet("background-color: white; border: 1px solid gray;")
-        right_layout.addWidget(materials_area)
+        # Materials Table
+        self.materials_model = MaterialTableModel(parent=self)
+        self.materials_table = QTableView()
+        self.materials_table.setModel(self.materials_model)
+
+        # Modern table styling
+        self.materials_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.materials_table.verticalHeader().setVisible(False)
+        self.materials_table.setAlternatingRowColors(True)
+        self.materials_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.materials_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.materials_table.setFont(font(9))
+        self.materials_table.horizontalHeader().setFont(font(7, bold=True))
+        self.materials_table.setMinimumHeight(250)
+        self.materials_table.setProperty("header", "accent")
+
+        right_layout.addWidget(self.materials_table)
 
         # Bottom stats section
         stats_layout = QVBoxLayout()
-        stats_layout.setSpacing(2)
+        stats_layout.setSpacing(3)
 
-        items_label = QLabel("NO. OF ITEMS :  0")
-        items_label.setFont(QFont("Arial", 9, QFont.Weight.Bold))
-        stats_layout.addWidget(items_label)
+        self.items_label = QLabel("NO. OF ITEMS :  0")
+        self.items_label.setFont(font(8, bold=True))
+        stats_layout.addWidget(self.items_label)
 
-        weight_label = QLabel("TOTAL WEIGHT  : 0.000000")
-        weight_label.setFont(QFont("Arial", 9, QFont.Weight.Bold))
-        stats_layout.addWidget(weight_label)
+        self.weight_label = QLabel("TOTAL WEIGHT  : 0.000000")
+        self.weight_label.setFont(font(8, bold=True))
+        stats_layout.addWidget(self.weight_label)
 
         fg_label = QLabel("FG in 1D (FOR WH) ONLY")
-        fg_label.setFont(QFont("Arial", 8))
+        fg_label.setFont(font(7))
         stats_layout.addWidget(fg_label)
 
         right_layout.addLayout(stats_layout)
+        right_layout.addStretch()
 
-        main_content.addLayout(right_layout, 4)
+        main_content.addWidget(right_card, 7)
 
         layout.addLayout(main_content)
 
-        # Cancel link
-        cancel_btn = QPushButton("CLICK HERE TO CANCEL THIS PRODUCTION")
-        cancel_btn.setStyleSheet(
-            "QPushButton { text-decoration: underline; color: blue; background: transparent; border: none; }")
-        cancel_btn.setFont(QFont("Arial", 8))
+        # Cancel Button
+        cancel_btn = ModernButton("CLICK HERE TO CANCEL THIS PRODUCTION")
+        cancel_btn.setProperty("variant", "link")
         layout.addWidget(cancel_btn, alignment=Qt.AlignmentFlag.AlignRight)
 
-        # Encoded By Section
-        encoded_layout = QHBoxLayout()
+        # Encoded By Section Card
+        encoded_card = QFrame()
+        encoded_card.setObjectName("card")
+        encoded_layout = QHBoxLayout(encoded_card)
+        encoded_layout.setContentsMargins(20, 8, 20, 8)
 
         encoded_by_label = QLabel("ENCODED BY")
-        encoded_by_label.setFont(QFont("Arial", 9))
+        encoded_by_label.setFont(font(9))
         encoded_layout.addWidget(encoded_by_label)
 
         prod_confirm_label = QLabel("PRODUCTION CONFIRMATION ENCODED ON")
-        prod_confirm_label.setFont(QFont("Arial", 9))
+        prod_confirm_label.setFont(font(9))
         encoded_layout.addWidget(prod_confirm_label)
-
-        self.confirm_encoded_edit = QLineEdit("0000000")
-        self.confirm_encoded_edit.setFixedSize(120, field_height)
-        self.confirm_encoded_edit.setStyleSheet(field_style)
-        encoded_layout.addWidget(self.confirm_encoded_edit)
+        encoded_layout.addWidget(self.form.field("confirm_encoded"))
 
         encoded_layout.addStretch()
-        layout.addLayout(encoded_layout)
+        layout.addWidget(encoded_card)
 
-        # Bottom Section with Date and Buttons
-        bottom_layout = QHBoxLayout()
+        # Bottom Section with Date and Buttons Card
+        bottom_card = QFrame()
+        bottom_card.setObjectName("card")
+        bottom_layout = QHBoxLayout(bottom_card)
+        bottom_layout.setContentsMargins(20, 8, 20, 8)
 
         date_prod_layout = QVBoxLayout()
-        date_label = QLabel("10/07/2025 09:49:35 AM")
-        date_label.setFont(QFont("Arial", 8))
+        date_label = QLabel(self.current_date)
+        date_label.setFont(font(8))
         date_prod_layout.addWidget(date_label)
 
         prod_encoded_layout = QHBoxLayout()
         prod_encoded_label = QLabel("PRODUCTION ENCODED ON")
-        prod_encoded_label.setFont(QFont("Arial", 8))
+        prod_encoded_label.setFont(font(8))
         prod_encoded_layout.addWidget(prod_encoded_label)
-
-        self.prod_encoded_edit = QLineEdit("  /  /")
-        self.prod_encoded_edit.setFixedSize(100, field_height)
-        self.prod_encoded_edit.setStyleSheet(white_field_style)
-        prod_encoded_layout.addWidget(self.prod_encoded_edit)
+        prod_encoded_layout.addWidget(self.form.field("prod_encoded"))
         prod_encoded_layout.addStretch()
 
         date_prod_layout.addLayout(prod_encoded_layout)
@@ -332,39 +216,218 @@ class AutoGenerateTab(QWidget):
 
         # Action Buttons
         btn_layout = QHBoxLayout()
-        btn_layout.setSpacing(5)
+        btn_layout.setSpacing(3)
 
         buttons = [
-            ("GENERATE", 90),
-            ("TUMBLER", 90),
-            ("GENERATE ADVANCE", 140),
-            ("PRINT", 70),
-            ("NEW", 70),
-            ("CLOSE", 70)
+            ("GENERATE", True),
+            ("TUMBLER", False),
+            ("GENERATE ADVANCE", False),
+            ("PRINT", False),
+            ("NEW", False),
+            ("CLOSE", False)
         ]
 
-        for btn_text, btn_width in buttons:
-            btn = QPushButton(btn_text)
+        for btn_text, is_primary in buttons:
+            btn_width = 120 if btn_text == "GENERATE ADVANCE" else 80 if btn_text == "GENERATE" or btn_text == "TUMBLER" else 60
+            btn = ModernButton(btn_text, primary=is_primary)
             btn.setFixedSize(btn_width, 25)
-            btn.setFont(QFont("Arial", 8, QFont.Weight.Bold))
-            btn.setStyleSheet("background-color: lightgray; border: 1px solid black;")
             if btn_text == "CLOSE":
-                btn.clicked.connect(self.close)
+                btn.clicked.connect(self.main_window.close)
+            elif btn_text == "NEW":
+                btn.clicked.connect(self.new_entry)
+                btn.setToolTip(f"Clear the form ({COPY_PREVIOUS} fills in the previous entry)")
+            elif btn_text in ("GENERATE", "TUMBLER", "GENERATE ADVANCE"):
+                btn.clicked.connect(partial(self.generate, btn_text))
             btn_layout.addWidget(btn)
 
         bottom_layout.addLayout(btn_layout)
-        layout.addLayout(bottom_layout)
-
-        # Footer
-        footer_layout = QHBoxLayout()
-        footer_left = QLabel("MBPI SYSTEM 2022")
-        footer_left.setFont(QFont("Arial", 8))
-        footer_layout.addWidget(footer_left)
-
-        footer_layout.addStretch()
-
-        footer_right = QLabel("NUM")
-        footer_right.setFont(QFont("Arial", 8))
-        footer_layout.addWidget(footer_right)
-
-        layout.addLayout(footer_layout)
\ No newline at end of file
+        layout.addWidget(bottom_card)
+
+        for name in QUANTITY_FIELDS:
+            self.form.changed(name).connect(self.recalculate_materials)
+        completions = self.main_window.completions
+        for name in COMPLETED_FIELDS:
+            attach_prefix_completer(self.form.field(name), completions[name])
+        self.form.changed("product_code").connect(self.on_product_code_changed)
+        self.form.changed("confirm_date").connect(self.show_shortfalls)
+        self.form.field("formulation_id").editingFinished.connect(self.on_formulation_id_changed)
+        QShortcut(QKeySequence(COPY_PREVIOUS), self, self.copy_previous_entry)
+
+    def on_product_code_changed(self, product_code):
+        """Fill the dependent fields from one product index lookup; the formulation comes from the cache."""
+        entry = self.product_index.lookup(product_code)
+        if entry is not None and entry.customer:
+            self.form.set_value("customer", entry.customer)
+        if entry is None or entry.formulation_id is None:
+            self.formulation = None
+            self.form.set_value("formulation_id", "")
+        else:
+            self.formulation = self.formulations.get(entry.formulation_id)
+            self.show_color_match(entry)
+        self.recalculate_materials()
+
+    def show_color_match(self, match):
+        """Show the formulation ID, color and color match fields of a ProductEntry or Formulation."""
+        self.form.set_value("formulation_id", str(match.formulation_id))
+        self.form.set_value("product_color", match.color)
+        matched = date.fromisoformat(match.matched_date).strftime("%m/%d/%Y") if match.matched_date else ""
+        self.form.set_value("matched_date", matched)
+        self.form.set_value("colormatch_no", match.colormatch_no or "-")
+
+    def on_formulation_id_changed(self):
+        try:
+            formulation = self.formulations.get(int(self.form.value("formulation_id")))
+        except ValueError:
+            formulation = None
+        if formulation is None or formulation is self.formulation:
+            return
+        self.formulation = formulation
+        # The product code may have newer formulations; keep the one picked by ID
+        self.form.set_value("product_code", formulation.product_code, notify=False)
+        self.show_color_match(formulation)
+        self.recalculate_materials()
+
+    def new_entry(self):
+        """Clear the form for the next entry, recycling its widgets."""
+        self.show_entry({}, "🆕 New entry")
+
+    def copy_previous_entry(self):
+        """Refill the form with the last generated entry, to change only what differs."""
+        self.show_entry(self.last_entry, "📋 Copied the previous entry")
+
+    def show_entry(self, snapshot, message):
+        """Restore a form snapshot and recalculate once, then focus the first field.
+
+        Change handlers stay quiet while the fields are rewritten: the formulation is looked up
+        from the restored ID instead of cascading through the product code lookup.
+        """
+        began = time.perf_counter()
+        self.form.restore(snapshot, notify=False)
+        try:
+            self.formulation = self.formulations.get(int(self.form.value("formulation_id")))
+        except ValueError:
+            self.formulation = None
+        self.recalculate_materials()
+        product_code = self.form.field("product_code")
+        product_code.setFocus()
+        product_code.lineEdit().selectAll()
+        elapsed = time.perf_counter() - began
+        self.main_window.statusBar().showMessage(f"{message} ready in {elapsed * 1000:.1f} ms")
+
+    def _number(self, name):
+        try:
+            return float(self.form.value(name))
+        except ValueError:
+            return 0.0
+
+    def recalculate_materials(self):
+        """Recompute the whole materials table from the form inputs in one vectorized pass."""
+        materials = self.formulation.materials if self.formulation is not None else ()
+        names = [material for material, _ in materials]
+        result = compute_consumption(
+            [concentration for _, concentration in materials],
+            dosage=self._number("dosage"),
+            ld_percent=self._number("ld"),
+            qty_required=self._number("qty_req"),
+            qty_per_batch=self._number("qty_per_batch"),
+        )
+        # Quantities stay int64 micrograms; the model formats them only for display
+        self.materials_model.set_records(material_rows(names, result))
+        self._consumption = names, result.total_consumption
+        self.show_shortfalls()
+        self.items_label.setText(f"NO. OF ITEMS :  {len(names)}")
+        self.weight_label.setText(f"TOTAL WEIGHT  : {format_fixed(result.total_weight.sum(), 6)}")
+
+    def show_shortfalls(self, *_):
+        """Highlight materials the warehouse is short of; only inventory-confirmed entries draw stock."""
+        names, consumed = self._consumption
+        confirming = not is_blank(self.form.value("confirm_date"))
+        self.materials_model.set_shortfalls(self.main_window.stock.shortfalls(names, consumed) if confirming else ())
+
+    def _form_date(self, name, default=None):
+        """Return an "mm/dd/yy" or "mm/dd/yyyy" field as an ISO date, or default when it is blank."""
+        text = self.form.value(name).replace(" ", "")
+        if text.strip("/") == "":
+            return default
+        for pattern in ("%m/%d/%y", "%m/%d/%Y"):
+            try:
+                return datetime.strptime(text, pattern).date().isoformat()
+            except ValueError:
+                pass
+        raise ValueError(f"{self.form.value(name).strip()!r} is not a date")
+
+    def _generation_plan(self, mode):
+        """Return the lots and their microgram quantities for one of the generate buttons.
+
+        GENERATE writes the lot field as typed with the whole QTY REQ; GENERATE ADVANCE writes
+        one entry per lot of the range, sharing QTY REQ between them; TUMBLER writes one entry
+        per tumbler batch, each on the next lot of the range (or all on a single lot).
+        """
+        lot_text = self.form.value("lot_no").strip()
+        qty_required = self._number("qty_req")
+        if qty_required <= 0:
+            raise ValueError("enter the quantity required")
+        if mode == "GENERATE":
+            return [lot_text], [parse_fixed(self.form.value("qty_req"))]
+        lots = expand_lots(lot_text)
+        if mode == "GENERATE ADVANCE":
+            return lots, split_evenly(parse_fixed(self.form.value("qty_req")), len(lots))
+        quantities = batch_quantities(qty_required, self._number("qty_per_batch"))
+        if not len(quantities):
+            raise ValueError("enter the quantity per batch")
+        if len(lots) == 1:
+            lots = lots * len(quantities)
+        elif len(lots) != len(quantities):
+            raise ValueError(f"{lot_text} has {len(lots)} lots for {len(quantities)} tumbler batches")
+        return lots, quantities
+
+    def confirm_shortfalls(self, mode, lots, quantities):
+        """Check every planned lot against the stock snapshot at once; ask before drawing below zero."""
+        names = [material for material, _ in self.formulation.materials]
+        _, _, consumed = lot_consumption([concentration for _, concentration in self.formulation.materials],
+                                         self._number("dosage"), self._number("ld"),
+                                         np.asarray(quantities, dtype=np.int64) / UNITS_PER_KG)
+        shortfalls = self.main_window.stock.shortfalls(names, consumed)
+        short = [f"{name}: {format_fixed(qty, 6)} KG" for name, qty in zip(names, shortfalls.tolist()) if qty > 0]
+        if not short:
+            return True
+        answer = QMessageBox.question(self, mode.title(), "⚠ The warehouse is short of\n" + "\n".join(short) +
+                                      f"\n\nfor {len(lots)} lot(s). Generate anyway?")
+        return answer == QMessageBox.StandardButton.Yes
+
+    def generate(self, mode):
+        """Write the form as production entries and their material consumption in one transaction."""
+        errors = self.form.validate(DETAIL_FIELDS)
+        if errors:
+            QMessageBox.warning(self, mode.title(), "❌ Check the highlighted fields:\n" +
+                                "\n".join(f"{label} {message}" for label, message in errors))
+            return
+        try:
+            if self.formulation is None:
+                raise ValueError("pick a product code or formulation ID first")
+            lots, quantities = self._generation_plan(mode)
+            confirmed = self._form_date("confirm_date")
+            if confirmed is not None and not self.confirm_shortfalls(mode, lots, quantities):
+                return
+            result = self.main_window.batch_generator.generate(
+                self.formulation, self._form_date("tentative_date", date.today().isoformat()),
+                self.form.value("customer").strip(), self.form.value("product_color").strip(), lots, quantities,
+                dosage=self._number("dosage"), ld_percent=self._number("ld"),
+                order_form_no=self.form.value("order_form").strip(), first_id=self.production_id)
+        except (ValueError, sqlite3.Error) as exc:
+            # The ID on screen was taken elsewhere; show a fresh one so the next try can succeed
+            if isinstance(exc, sqlite3.IntegrityError):
+                self.next_production_id()
+            QMessageBox.warning(self, mode.title(), f"❌ {exc}")
+            return
+        # Only entries confirmed for inventory draw their materials from the warehouse
+        if confirmed is not None:
+            self.main_window.ledger.confirm(result.consumption, confirmed)
+            self.recalculate_materials()
+        self.last_entry = self.form.snapshot()
+        self.next_production_id()
+        self.main_window.on_entries_generated(result)
+
+    def next_production_id(self):
+        self.production_id = self.main_window.production_ids.next_id()
+        self.production_id_label.setText(format_production_id(self.production_id))
@@ -0,0 +1,74 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt6.QtWidgets import QCompleter
+
+
+class PrefixCompleterModel(QAbstractListModel):
+    """Completion list for one prefix, paged in from a completion source as the popup scrolls.
+
+    The source provides matches(prefix, offset, limit); nothing is loaded until the user types.
+    """
+
+    def __init__(self, source, page_size=50, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.page_size = page_size
+        self._prefix = ""
+        self._values = []
+        self._more = False
+        self._fetching = False
+
+    def set_prefix(self, prefix):
+        self.beginResetModel()
+        self._prefix = prefix
+        self._values = []
+        self._more = False
+        if prefix.strip():
+            self._values = self._load_page()
+        self.endResetModel()
+
+    def _load_page(self):
+        # One extra value tells whether another page exists without counting every match
+        page = self.source.matches(self._prefix, len(self._values), self.page_size + 1)
+        self._more = len(page) > self.page_size
+        return page[:self.page_size]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._values)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        return self._values[index.row()]
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._more
+
+    def fetchMore(self, parent=QModelIndex()):
+        # A popup that is not laid out yet asks again from inside endInsertRows; page once per call
+        if self._fetching or not self.canFetchMore(parent):
+            return
+        self._fetching = True
+        page = self._load_page()
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self._values), len(self._values) + len(page) - 1)
+            self._values.extend(page)
+            self.endInsertRows()
+        self._fetching = False
+
+
+def attach_prefix_completer(combo, source, page_size=50):
+    """Give an editable combo a completer that pages matches from a completion source as the user types."""
+    model = PrefixCompleterModel(source, page_size, combo)
+    completer = QCompleter(model, combo)
+    # The model already holds only the matches, so the completer must not filter again
+    completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+    completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    combo.setCompleter(completer)
+
+    def on_text_edited(text):
+        model.set_prefix(text)
+        if model.rowCount():
+            completer.complete()
+
+    combo.lineEdit().textEdited.connect(on_text_edited)
+    return completer
@@ -0,0 +1,90 @@
+import time
+from collections import deque
+
+from PyQt6.QtCore import QObject, QRunnable, QTimer, pyqtSignal
+
+
+class LoaderSignals(QObject):
+    """Signals emitted by a BatchLoader; delivered on the GUI thread."""
+    batch_loaded = pyqtSignal(list)
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+
+class BatchLoader(QRunnable):
+    """Run a batch generator on the thread pool and stream its batches back."""
+
+    def __init__(self, batches):
+        super().__init__()
+        self.batches = batches  # callable returning an iterable of row lists
+        self.signals = LoaderSignals()
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            for batch in self.batches():
+                if self.cancelled:
+                    return
+                self.signals.batch_loaded.emit(batch)
+        except Exception as exc:
+            self.signals.failed.emit(str(exc))
+            return
+        self.signals.finished.emit()
+
+
+class BatchFeeder(QObject):
+    """Hand queued batches to a sink on the GUI thread within a per-tick time budget."""
+    progress = pyqtSignal(int)
+    finished = pyqtSignal()
+
+    def __init__(self, sink, budget_ms=8, parent=None):
+        super().__init__(parent)
+        self.sink = sink
+        self.budget = budget_ms / 1000
+        self.loaded = 0
+        self.loader = None
+        self._pending = deque()
+        self._done = False
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._drain)
+
+    def attach(self, loader):
+        self.loader = loader
+        loader.signals.batch_loaded.connect(self.enqueue)
+        loader.signals.finished.connect(self.finish)
+
+    def cancel(self):
+        """Stop the loader and drop any batches not yet handed to the sink."""
+        if self.loader is not None:
+            self.loader.cancel()
+            self.loader.signals.batch_loaded.disconnect(self.enqueue)
+            self.loader.signals.finished.disconnect(self.finish)
+            self.loader = None
+        self._pending.clear()
+        self._timer.stop()
+
+    def enqueue(self, batch):
+        self._pending.append(batch)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def finish(self):
+        self._done = True
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _drain(self):
+        deadline = time.perf_counter() + self.budget
+        while self._pending and time.perf_counter() < deadline:
+            batch = self._pending.popleft()
+            self.sink(batch)
+            self.loaded += len(batch)
+        self.progress.emit(self.loaded)
+        if not self._pending:
+            self._timer.stop()
+            if self._done:
+                self.finished.emit()
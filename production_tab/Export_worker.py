@@ -0,0 +1,94 @@
+import csv
+import os
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from production_data.Fixed_point import format_fixed
+
+EXPORT_HEADERS = ["Date", "Customer", "Product Code", "Color", "Lot No.", "Qty Produced"]
+
+
+class ExportSignals(QObject):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class ExportWorker(QRunnable):
+    """Stream record batches straight to a CSV or XLSX file on the thread pool."""
+
+    def __init__(self, batches, path, headers=EXPORT_HEADERS, format_row=None):
+        super().__init__()
+        self.batches = batches  # callable returning an iterable of row batches
+        self.path = path
+        self.headers = headers
+        if format_row is not None:
+            self.format_row = format_row
+        self.signals = ExportSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    @staticmethod
+    def format_row(row):
+        return [*row[:5], format_fixed(row[5])]
+
+    def run(self):
+        # Write next to the target and only replace it once the export completes
+        partial_path = self.path + ".part"
+        try:
+            if self.path.lower().endswith(".xlsx"):
+                completed = self._write_xlsx(partial_path)
+            else:
+                completed = self._write_csv(partial_path)
+        except Exception as exc:
+            self._discard(partial_path)
+            self.signals.failed.emit(str(exc))
+            return
+        if not completed:
+            self._discard(partial_path)
+            self.signals.cancelled.emit()
+            return
+        os.replace(partial_path, self.path)
+        self.signals.finished.emit(self.path)
+
+    def _rows(self):
+        """Yield formatted rows, emitting progress per batch; stops early when cancelled."""
+        written = 0
+        for batch in self.batches():
+            if self._cancelled:
+                return
+            yield from map(self.format_row, batch)
+            written += len(batch)
+            self.signals.progress.emit(written)
+
+    def _write_csv(self, path):
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(self.headers)
+            writer.writerows(self._rows())
+        return not self._cancelled
+
+    def _write_xlsx(self, path):
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise RuntimeError("XLSX export requires the openpyxl package; export to CSV instead.")
+        # Write-only workbooks stream rows to disk instead of keeping cells in memory
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Production Records")
+        sheet.append(self.headers)
+        for row in self._rows():
+            sheet.append(row)
+        if self._cancelled:
+            workbook.close()
+            return False
+        workbook.save(path)
+        return True
+
+    @staticmethod
+    def _discard(path):
+        if os.path.exists(path):
+            os.remove(path)
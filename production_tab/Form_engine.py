@@ -0,0 +1,223 @@
+from collections import namedtuple
+from datetime import date, datetime
+from functools import lru_cache, partial
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QComboBox, QFormLayout, QHBoxLayout, QLabel, QLineEdit, QTextEdit, QWidget
+
+from production_tab.Theme import font, restyle
+from production_data.Lot_index import parse_lot
+
+FIELD_WIDTH = 180
+FIELD_HEIGHT = 24
+TEXT_HEIGHT = 40
+# An empty mm/dd/yy date field
+BLANK_DATE = "  /  /"
+
+# name: key used by code; label: row label ("" keeps the field out of the form layout);
+# kind: "line", "combo" (editable), "choice" (pick from a list) or "text" (multi-line);
+# required: must be filled in; default: text or a callable returning it, applied on reset;
+# validator: callable(text) returning an error message or None; width: fixed width in pixels;
+# joins: name of an earlier field whose row this field is appended to, after a small label
+FieldSpec = namedtuple("FieldSpec", ["name", "label", "kind", "required", "default", "validator", "width", "joins"],
+                       defaults=("line", False, "", None, FIELD_WIDTH, None))
+
+
+def today():
+    return date.today().strftime("%m/%d/%Y")
+
+
+def is_blank(text):
+    return not text.replace("/", "").strip()
+
+
+def number(text):
+    try:
+        float(text)
+    except ValueError:
+        return "must be a number"
+    return None
+
+
+def integer(text):
+    return None if text.strip().isdigit() else "must be a whole number"
+
+
+def date_text(text):
+    text = text.replace(" ", "")
+    for pattern in ("%m/%d/%y", "%m/%d/%Y"):
+        try:
+            datetime.strptime(text, pattern)
+            return None
+        except ValueError:
+            pass
+    return "must be a date (mm/dd/yy)"
+
+
+def lot_text(text):
+    return None if parse_lot(text) is not None else "must be a lot number or range such as 1584AN-1615AN"
+
+
+@lru_cache(maxsize=None)
+def form_rows(specs):
+    """Group a spec tuple into (label, fields) layout rows; computed once per spec."""
+    rows = []
+    positions = {}
+    for spec in specs:
+        if spec.joins is not None:
+            rows[positions[spec.joins]][1].append(spec)
+        elif spec.label:
+            positions[spec.name] = len(rows)
+            rows.append((spec.label, [spec]))
+    return tuple((label, tuple(fields)) for label, fields in rows)
+
+
+class FormState:
+    """Which fields have been written since the form was last reset or restored.
+
+    Only these (plus fields whose default is computed, such as today's date) can differ from
+    the defaults, so a reset rewrites just them instead of every widget.
+    """
+
+    def __init__(self, names=()):
+        self.dirty = set(names)
+
+    def touch(self, name, *_):
+        self.dirty.add(name)
+
+    def settle(self, names=()):
+        self.dirty = set(names)
+
+
+class FormEngine:
+    """Widgets built once from a tuple of FieldSpecs, read and written by field name.
+
+    Fields with a label are laid out in a QFormLayout on the engine's widget; the others are
+    created too and placed by the owner through field(). reset() and restore() write into the
+    same widgets, touching only the fields the FormState saw change, so a new entry never
+    rebuilds the widget tree.
+    """
+
+    def __init__(self, specs, defaults=None, parent=None):
+        self.specs = {spec.name: spec for spec in specs}
+        # Per-form defaults, such as the signed-in user, that override the spec's
+        self.defaults = dict(defaults or {})
+        self.computed = {name for name, spec in self.specs.items()
+                         if callable(self.defaults.get(name, spec.default))}
+        self.fields = {spec.name: self._create(spec) for spec in specs}
+        self.state = FormState(self.fields)
+        self.invalid = set()
+        for name in self.fields:
+            self.changed(name).connect(partial(self.state.touch, name))
+        self.widget = QWidget(parent)
+        layout = QFormLayout(self.widget)
+        layout.setLabelAlignment(Qt.AlignmentFlag.AlignRight)
+        layout.setHorizontalSpacing(8)
+        layout.setVerticalSpacing(3)
+        layout.setContentsMargins(0, 0, 0, 0)
+        for label, row_specs in form_rows(tuple(specs)):
+            if len(row_specs) == 1:
+                layout.addRow(label, self.fields[row_specs[0].name])
+                continue
+            row = QHBoxLayout()
+            row.setSpacing(5)
+            for position, spec in enumerate(row_specs):
+                if position:
+                    joined_label = QLabel(spec.label)
+                    joined_label.setFont(font(8))
+                    row.addWidget(joined_label)
+                row.addWidget(self.fields[spec.name])
+            row.addStretch()
+            layout.addRow(label, row)
+        self.reset()
+
+    @staticmethod
+    def _create(spec):
+        if spec.kind == "text":
+            widget = QTextEdit()
+            widget.setFixedHeight(TEXT_HEIGHT)
+        elif spec.kind in ("combo", "choice"):
+            widget = QComboBox()
+            widget.setEditable(spec.kind == "combo")
+            widget.setFixedSize(spec.width, FIELD_HEIGHT)
+        else:
+            widget = QLineEdit()
+            widget.setFixedSize(spec.width, FIELD_HEIGHT)
+        widget.setProperty("field", "required" if spec.required else "optional")
+        return widget
+
+    def field(self, name):
+        return self.fields[name]
+
+    def changed(self, name):
+        """Return the signal emitted whenever the field's text changes."""
+        widget = self.fields[name]
+        return widget.currentTextChanged if isinstance(widget, QComboBox) else widget.textChanged
+
+    def value(self, name):
+        widget = self.fields[name]
+        if isinstance(widget, QComboBox):
+            return widget.currentText()
+        if isinstance(widget, QTextEdit):
+            return widget.toPlainText()
+        return widget.text()
+
+    def set_value(self, name, text, notify=True):
+        widget = self.fields[name]
+        blocked = widget.blockSignals(not notify)
+        if isinstance(widget, QComboBox):
+            widget.setCurrentText(text)
+        elif isinstance(widget, QTextEdit):
+            widget.setPlainText(text)
+        else:
+            widget.setText(text)
+        widget.blockSignals(blocked)
+        self.state.touch(name)
+
+    def values(self):
+        return {name: self.value(name) for name in self.fields}
+
+    def default(self, name):
+        default = self.defaults.get(name, self.specs[name].default)
+        return default() if callable(default) else default
+
+    def reset(self, notify=True):
+        """Put the form back to its defaults in place."""
+        self.restore({}, notify)
+
+    def snapshot(self):
+        """Return the fields that differ from their defaults, for restore()."""
+        return {name: text for name in self.state.dirty if (text := self.value(name)) != self.default(name)}
+
+    def restore(self, snapshot, notify=True):
+        """Show the defaults overlaid with a snapshot, rewriting only fields that may differ."""
+        pending = self.state.dirty | self.computed | self.invalid | snapshot.keys()
+        self.state.settle(snapshot)
+        for name in pending:
+            text = snapshot[name] if name in snapshot else self.default(name)
+            if self.value(name) != text:
+                self.set_value(name, text, notify)
+            if name in self.invalid:
+                restyle(self.fields[name], invalid=False)
+        self.invalid.clear()
+        # Keep fields that change handlers filled in along the way
+        self.state.settle(name for name in self.state.dirty
+                          if name in snapshot or self.value(name) != self.default(name))
+
+    def validate(self, names=None):
+        """Check required fields and validators; mark failing fields and return (label, message) pairs."""
+        errors = []
+        for name in names or self.fields:
+            spec = self.specs[name]
+            text = self.value(name)
+            if is_blank(text):
+                message = "is required" if spec.required else None
+            else:
+                message = spec.validator(text) if spec.validator else None
+            invalid = message is not None
+            if (name in self.invalid) != invalid:
+                restyle(self.fields[name], invalid=invalid)
+                (self.invalid.add if invalid else self.invalid.discard)(name)
+            if invalid:
+                errors.append((spec.label.rstrip(" *") or name, message))
+        return errors
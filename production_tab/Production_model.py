@@ -0,0 +1,252 @@
+from array import array
+from datetime import date, datetime
+
+import numpy as np
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor, QBrush
+
+from production_tab.Theme import font
+from production_data.Fixed_point import UNITS_PER_KG, UNITS_PER_G, parse_fixed, format_fixed
+
+
+class ColumnarTableModel(QAbstractTableModel):
+    """Virtualized table model backed by one list per column."""
+
+    HEADERS = []
+    # column -> (units per display unit, decimal places) for int64 fixed-point columns
+    FIXED_COLUMNS = {}
+    # "mm/dd/yy" columns held as int64 day ordinals
+    DATE_COLUMNS = ()
+
+    def __init__(self, records=None, parent=None, page_size=200):
+        super().__init__(parent)
+        self._columns = self._empty_columns()
+        self._view = None  # visible source rows while filtered or sorted
+        self._filters = {}
+        self._order = None
+        self.page_size = page_size
+        self._limit = page_size  # rows exposed so far; views page further with fetchMore
+        self.highlight_row = None
+        self._ordinals = {}
+        self._date_strings = {}
+
+        # Constant roles are answered from one shared cache instead of per cell
+        self._font = font(9)
+        self._highlight_brush = QBrush(QColor("#E3F2FD"))
+        self._role_cache = {
+            Qt.ItemDataRole.FontRole: self._font,
+            Qt.ItemDataRole.TextAlignmentRole: Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+        }
+
+        if records:
+            self.set_records(records)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return min(self.visible_count(), self._limit)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._display(index.column(), self.source_row(index.row()))
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self._highlight_brush if self.source_row(index.row()) == self.highlight_row else None
+        return self._role_cache.get(role)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self.rowCount() < self.visible_count()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        first = self.rowCount()
+        last = min(self.visible_count(), self._limit + self.page_size) - 1
+        self.beginInsertRows(QModelIndex(), first, last)
+        self._limit += self.page_size
+        self.endInsertRows()
+
+    def _empty_columns(self):
+        typed = set(self.FIXED_COLUMNS) | set(self.DATE_COLUMNS)
+        return [array("q") if column in typed else [] for column in range(len(self.HEADERS))]
+
+    def _display(self, column, source_row):
+        value = self._columns[column][source_row]
+        fixed = self.FIXED_COLUMNS.get(column)
+        if fixed is not None:
+            unit, places = fixed
+            return format_fixed(value, places, unit)
+        if column in self.DATE_COLUMNS:
+            text = self._date_strings.get(value)
+            if text is None:
+                text = self._date_strings[value] = date.fromordinal(value).strftime("%m/%d/%y")
+            return text
+        return value
+
+    def _ordinal(self, text):
+        ordinal = self._ordinals.get(text)
+        if ordinal is None:
+            ordinal = self._ordinals[text] = datetime.strptime(text, "%m/%d/%y").toordinal()
+        return ordinal
+
+    def visible_count(self):
+        """Number of rows passing the filters, including those not paged in yet."""
+        return len(self._view) if self._view is not None else self.source_count()
+
+    def source_row(self, row):
+        """Map a visible row to its position in the column lists."""
+        return row if self._view is None else int(self._view[row])
+
+    def append_records(self, records):
+        """Append a batch of row lists, notifying attached views once."""
+        if not records:
+            return
+        first = self.rowCount()
+        last = min(self.source_count() + len(records), self._limit) - 1
+        if self._view is not None or last < first:
+            # Rows beyond the paged-in range, or outside an active filter or sort,
+            # show up on the next fetchMore or apply_filters
+            self._append(records)
+            return
+        self.beginInsertRows(QModelIndex(), first, last)
+        self._append(records)
+        self.endInsertRows()
+
+    def _append(self, records):
+        for position, (column, values) in enumerate(zip(self._columns, zip(*records))):
+            fixed = self.FIXED_COLUMNS.get(position)
+            if fixed is not None:
+                column.extend(parse_fixed(value, fixed[0]) for value in values)
+            elif position in self.DATE_COLUMNS:
+                column.extend(map(self._ordinal, values))
+            else:
+                column.extend(map(str, values))
+
+    def set_records(self, records):
+        """Replace the model contents with the given row lists."""
+        self.beginResetModel()
+        self._columns = self._empty_columns()
+        self._view = None
+        self._filters = {}
+        self._order = None
+        self._limit = self.page_size
+        self._append(records)
+        self.endResetModel()
+
+    def set_filter(self, name, mask):
+        """Show only rows passing every named boolean mask; a None mask removes the filter."""
+        if mask is None:
+            self._filters.pop(name, None)
+        else:
+            self._filters[name] = mask
+        self.apply_filters()
+
+    def set_sort_order(self, order):
+        """Show rows in the order of a precomputed permutation; None restores loaded order."""
+        self._order = order
+        self.apply_filters()
+
+    def apply_filters(self):
+        """Recompute the visible rows from the filter masks and sort order without touching the data."""
+        self.beginResetModel()
+        self._limit = self.page_size
+        total = self.source_count()
+        if self._filters:
+            visible = np.ones(total, dtype=bool)
+            for mask in self._filters.values():
+                size = min(len(mask), total)
+                visible[:size] &= mask[:size]
+                visible[size:] = False
+        else:
+            visible = None
+
+        order = self._order
+        if order is not None and len(order) < total:
+            # Rows added after the permutation was built follow in loaded order
+            order = np.concatenate([order, np.arange(len(order), total)])
+        if order is None:
+            self._view = None if visible is None else np.flatnonzero(visible)
+        else:
+            self._view = order if visible is None else order[visible[order]]
+        self.endResetModel()
+
+    def record(self, row):
+        """Return one visible row as a list of display strings."""
+        return self.source_record(self.source_row(row))
+
+    def source_record(self, source_row):
+        """Return one row by its position in the column lists as display strings, ignoring filters."""
+        return [self._display(column, source_row) for column in range(len(self._columns))]
+
+    def column_array(self, column):
+        """Return a fixed-point or date column as a zero-copy int64 NumPy view.
+
+        The view pins the column's buffer, so drop it before more rows are appended.
+        """
+        return np.frombuffer(self._columns[column], dtype=np.int64)
+
+    def column_values(self, column):
+        """Return a text column's list of values."""
+        return self._columns[column]
+
+    def source_count(self):
+        """Number of rows held, ignoring filters."""
+        return len(self._columns[0])
+
+
+class ProductionTableModel(ColumnarTableModel):
+    HEADERS = ["Date", "Customer", "Product Code", "Color", "Lot No.", "Qty Produced"]
+    FIXED_COLUMNS = {5: (UNITS_PER_KG, 7)}
+    DATE_COLUMNS = (0,)
+
+
+class MaterialTableModel(ColumnarTableModel):
+    HEADERS = ["Material", "Large Scale (KG)", "Small Scale (G)",
+               "Total Weight (KG)", "Total Loss (KG)", "Total Consumption (KG)"]
+    FIXED_COLUMNS = {1: (UNITS_PER_KG, 6), 2: (UNITS_PER_G, 6), 3: (UNITS_PER_KG, 7),
+                     4: (UNITS_PER_KG, 6), 5: (UNITS_PER_KG, 6)}
+
+    def __init__(self, records=None, parent=None):
+        self.shortfalls = np.zeros(0, dtype=np.int64)
+        self._shortfall_brush = QBrush(QColor("#FFCDD2"))
+        self._shortfall_text = QBrush(QColor("#B71C1C"))
+        super().__init__(records, parent)
+
+    def set_shortfalls(self, shortfalls):
+        """Highlight rows whose material is short in the warehouse, given micrograms short per source row."""
+        self.shortfalls = np.asarray(shortfalls, dtype=np.int64)
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, len(self.HEADERS) - 1))
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role in (Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ForegroundRole,
+                                        Qt.ItemDataRole.ToolTipRole):
+            row = self.source_row(index.row())
+            short = self.shortfalls[row] if row < len(self.shortfalls) else 0
+            if short > 0:
+                if role == Qt.ItemDataRole.ToolTipRole:
+                    return f"Short by {format_fixed(short, 6)} KG in the warehouse"
+                return self._shortfall_brush if role == Qt.ItemDataRole.BackgroundRole else self._shortfall_text
+        return super().data(index, role)
+
+
+class SummaryTableModel(ColumnarTableModel):
+    """Summary rows whose grouping columns vary; the last column is a quantity in kilograms."""
+
+    def __init__(self, headers, records=None, parent=None):
+        self.HEADERS = headers
+        self.FIXED_COLUMNS = {len(headers) - 1: (UNITS_PER_KG, 7)}
+        super().__init__(records, parent)
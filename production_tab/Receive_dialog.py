@@ -0,0 +1,67 @@
+from decimal import InvalidOperation
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QPushButton, QComboBox,
+                             QLineEdit, QDateEdit, QMessageBox)
+from PyQt6.QtCore import QDate, pyqtSignal
+
+from production_tab.Theme import font
+from production_data.Fixed_point import parse_fixed, format_fixed
+
+
+class ReceiveDialog(QDialog):
+    """Post material deliveries to the warehouse ledger, one receipt at a time."""
+
+    received = pyqtSignal(str, object)  # material, micrograms received
+
+    def __init__(self, ledger, materials, parent=None):
+        super().__init__(parent)
+        self.ledger = ledger
+        self.setWindowTitle("Receive Stock")
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        self.material_combo = QComboBox()
+        self.material_combo.setEditable(True)
+        self.material_combo.addItems(materials)
+        self.material_combo.setCurrentText("")
+        self.qty_edit = QLineEdit()
+        self.qty_edit.setPlaceholderText("0.000000")
+        self.date_edit = QDateEdit(QDate.currentDate())
+        self.date_edit.setCalendarPopup(True)
+        form.addRow("Material:", self.material_combo)
+        form.addRow("Quantity (KG):", self.qty_edit)
+        form.addRow("Received On:", self.date_edit)
+        layout.addLayout(form)
+
+        self.on_hand_label = QLabel()
+        self.on_hand_label.setFont(font(9))
+        layout.addWidget(self.on_hand_label)
+        self.material_combo.currentTextChanged.connect(self.show_on_hand)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        receive_btn = QPushButton("📥 Receive")
+        receive_btn.clicked.connect(self.receive)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        buttons.addWidget(receive_btn)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+    def show_on_hand(self, material):
+        material = material.strip()
+        self.on_hand_label.setText(f"On hand: {format_fixed(self.ledger.balance(material), 6)} KG" if material else "")
+
+    def receive(self):
+        material = self.material_combo.currentText().strip()
+        try:
+            qty = parse_fixed(self.qty_edit.text())
+        except InvalidOperation:
+            qty = 0
+        if not material or qty <= 0:
+            QMessageBox.warning(self, "Receive Stock", "❌ Enter a material and a quantity above zero.")
+            return
+        self.ledger.receive([(material, qty)], self.date_edit.date().toPyDate().isoformat())
+        self.qty_edit.clear()
+        self.show_on_hand(material)
+        self.received.emit(material, qty)
@@ -0,0 +1,106 @@
+import time
+from datetime import date
+from functools import lru_cache
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QLabel,
+                             QPushButton, QComboBox, QCheckBox, QDateEdit, QAbstractItemView)
+from PyQt6.QtCore import QDate
+
+from production_tab.Production_model import SummaryTableModel
+from production_tab.Theme import font
+from production_data.Fixed_point import format_fixed
+
+GRAIN_LABELS = {"Daily": "day", "Weekly": "week", "Monthly": "month"}
+PERIOD_HEADERS = {"day": "Date", "week": "Week Of", "month": "Month"}
+DIMENSION_LABELS = {"customer": "Customer", "product_code": "Product Code", "color": "Color"}
+
+
+@lru_cache(maxsize=None)
+def period_label(iso_date, grain):
+    day = date.fromisoformat(iso_date)
+    return day.strftime("%b %Y") if grain == "month" else day.strftime("%m/%d/%y")
+
+
+class SummaryDialog(QDialog):
+    """Daily, weekly and monthly production summaries read from the store's rollups."""
+
+    def __init__(self, store, export, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.export = export  # MainApplicationWindow.start_export
+        self.rows = []
+        self.headers = []
+        self.setWindowTitle("Production Summary")
+        self.resize(900, 560)
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+
+        self.grain_combo = QComboBox()
+        self.grain_combo.addItems(list(GRAIN_LABELS))
+        self.grain_combo.setCurrentText("Monthly")
+        controls.addWidget(QLabel("Period:"))
+        controls.addWidget(self.grain_combo)
+
+        self.dimension_checks = {}
+        for key, label in DIMENSION_LABELS.items():
+            check = QCheckBox(label)
+            check.setChecked(key == "customer")
+            self.dimension_checks[key] = check
+            controls.addWidget(check)
+
+        self.all_dates_chk = QCheckBox("All Dates")
+        self.all_dates_chk.setChecked(True)
+        controls.addWidget(self.all_dates_chk)
+        self.date_from_edit = QDateEdit(QDate.currentDate().addYears(-1))
+        self.date_from_edit.setCalendarPopup(True)
+        self.date_to_edit = QDateEdit(QDate.currentDate())
+        self.date_to_edit.setCalendarPopup(True)
+        controls.addWidget(QLabel("From:"))
+        controls.addWidget(self.date_from_edit)
+        controls.addWidget(QLabel("To:"))
+        controls.addWidget(self.date_to_edit)
+        controls.addStretch()
+
+        generate_btn = QPushButton("📊 Generate")
+        generate_btn.clicked.connect(self.generate)
+        controls.addWidget(generate_btn)
+        export_btn = QPushButton("📤 Export")
+        export_btn.clicked.connect(self.export_summary)
+        controls.addWidget(export_btn)
+        layout.addLayout(controls)
+
+        self.table = QTableView()
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel()
+        self.summary_label.setFont(font(9))
+        layout.addWidget(self.summary_label)
+
+        self.generate()
+
+    def generate(self):
+        grain = GRAIN_LABELS[self.grain_combo.currentText()]
+        dimensions = [key for key, check in self.dimension_checks.items() if check.isChecked()]
+        first = last = None
+        if not self.all_dates_chk.isChecked():
+            first = self.date_from_edit.date().toPyDate().isoformat()
+            last = self.date_to_edit.date().toPyDate().isoformat()
+
+        started = time.perf_counter()
+        rows = self.store.summarize(grain, dimensions, first, last)
+        self.rows = [(period_label(row[0], grain), *row[1:]) for row in rows]
+        self.headers = [PERIOD_HEADERS[grain], *(DIMENSION_LABELS[key] for key in dimensions),
+                        "Records", "Qty Produced"]
+        self.table.setModel(SummaryTableModel(self.headers, self.rows, self.table))
+        elapsed = (time.perf_counter() - started) * 1000
+        self.summary_label.setText(f"{len(self.rows)} summary row(s) in {elapsed:.0f} ms")
+
+    def export_summary(self):
+        rows = self.rows
+        grain = GRAIN_LABELS[self.grain_combo.currentText()]
+        self.export(None, None, f"production_summary_{grain}", lambda: [rows], len(rows), self.headers,
+                    lambda row: [*row[:-1], format_fixed(row[-1])])
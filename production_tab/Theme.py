@@ -0,0 +1,366 @@
+from functools import lru_cache
+
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QApplication, QPushButton
+
+FONT_FAMILY = "Segoe UI"
+
+# Widgets pick their look through object names and dynamic properties matched here, so one
+# stylesheet is parsed for the whole application instead of one per widget:
+#   QPushButton[variant="primary" | "secondary" | "link"]
+#   QLineEdit / QComboBox / QTextEdit [field="required" | "optional"], plus [invalid="true"]
+#   QLabel[tone="title" | "accent" | "muted" | "success" | "inverse" | "inverse-muted"]
+#   QTableView[header="accent"] for tables with a blue header
+STYLESHEET = """
+    QMainWindow {
+        background-color: #F5F7FA;
+    }
+
+    #headerFrame {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #1976D2, stop:0.5 #2196F3, stop:1 #42A5F5);
+        border: none;
+    }
+
+    #userFrame {
+        background-color: rgba(255, 255, 255, 0.15);
+        border-radius: 8px;
+        padding: 3px 10px;
+    }
+
+    #card {
+        background-color: white;
+        border-radius: 12px;
+        border: 1px solid #E0E0E0;
+    }
+
+    #sidePanel {
+        background-color: transparent;
+    }
+
+    #statsCard {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+            stop:0 #E3F2FD, stop:1 #BBDEFB);
+        border-radius: 12px;
+        border: none;
+    }
+
+    QLabel[tone="title"] { color: #1976D2; }
+    QLabel[tone="accent"] { color: #2196F3; }
+    QLabel[tone="muted"] { color: #757575; }
+    QLabel[tone="success"] { color: #4CAF50; }
+    QLabel[tone="inverse"] { color: white; }
+    QLabel[tone="inverse-muted"] { color: rgba(255, 255, 255, 0.8); }
+
+    QPushButton[variant="primary"] {
+        background-color: #2196F3;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 8px 16px;
+        font-weight: 600;
+        font-size: 9pt;
+    }
+
+    QPushButton[variant="primary"]:hover {
+        background-color: #1976D2;
+    }
+
+    QPushButton[variant="primary"]:pressed {
+        background-color: #0D47A1;
+    }
+
+    QPushButton[variant="secondary"] {
+        background-color: white;
+        color: #424242;
+        border: 1px solid #E0E0E0;
+        border-radius: 6px;
+        padding: 8px 16px;
+        font-weight: 500;
+        font-size: 9pt;
+    }
+
+    QPushButton[variant="secondary"]:hover {
+        background-color: #F5F5F5;
+        border-color: #BDBDBD;
+    }
+
+    QPushButton[variant="secondary"]:pressed {
+        background-color: #EEEEEE;
+    }
+
+    QPushButton[variant="link"] {
+        color: #2196F3;
+        background: transparent;
+        border: none;
+        text-decoration: underline;
+    }
+
+    QLineEdit {
+        background-color: #F5F5F5;
+        border: 2px solid #E0E0E0;
+        border-radius: 8px;
+        padding: 8px 12px;
+        font-size: 9pt;
+        font-family: 'Segoe UI';
+    }
+
+    QLineEdit:focus {
+        border: 2px solid #2196F3;
+        background-color: white;
+    }
+
+    QDateEdit {
+        background-color: #F5F5F5;
+        border: 2px solid #E0E0E0;
+        border-radius: 8px;
+        padding: 6px 10px;
+        font-size: 9pt;
+        font-family: 'Segoe UI';
+    }
+
+    QDateEdit:focus {
+        border: 2px solid #2196F3;
+        background-color: white;
+    }
+
+    QDateEdit::drop-down {
+        border: none;
+        padding-right: 5px;
+    }
+
+    QCheckBox {
+        font-size: 9pt;
+        font-family: 'Segoe UI';
+        spacing: 8px;
+        color: #424242;
+    }
+
+    QCheckBox::indicator {
+        width: 18px;
+        height: 18px;
+        border-radius: 4px;
+        border: 2px solid #BDBDBD;
+        background-color: white;
+    }
+
+    QCheckBox::indicator:hover {
+        border-color: #2196F3;
+    }
+
+    QCheckBox::indicator:checked {
+        background-color: #2196F3;
+        border-color: #2196F3;
+        image: none;
+    }
+
+    QTableView {
+        background-color: white;
+        gridline-color: #F0F0F0;
+        border: none;
+        border-radius: 8px;
+    }
+
+    QTableView::item {
+        padding: 8px;
+        border: none;
+    }
+
+    QTableView::item:selected {
+        background-color: #E3F2FD;
+        color: #1976D2;
+    }
+
+    QTableView::item:alternate {
+        background-color: #FAFAFA;
+    }
+
+    QHeaderView::section {
+        background-color: #F5F5F5;
+        color: #616161;
+        padding: 8px;
+        border: none;
+        border-bottom: 2px solid #E0E0E0;
+        font-weight: bold;
+    }
+
+    QTableView[header="accent"] QHeaderView::section {
+        background-color: #1976D2;
+        color: white;
+        padding: 4px;
+        border: none;
+        font-weight: bold;
+    }
+
+    QMenuBar {
+        background-color: white;
+        border-bottom: 1px solid #E0E0E0;
+        padding: 4px;
+        font-family: 'Segoe UI';
+    }
+
+    QMenuBar::item {
+        padding: 6px 12px;
+        background-color: transparent;
+        border-radius: 4px;
+    }
+
+    QMenuBar::item:selected {
+        background-color: #E3F2FD;
+        color: #1976D2;
+    }
+
+    QMenu {
+        background-color: white;
+        border: 1px solid #E0E0E0;
+        border-radius: 8px;
+        padding: 5px;
+    }
+
+    QMenu::item {
+        padding: 8px 25px;
+        border-radius: 4px;
+    }
+
+    QMenu::item:selected {
+        background-color: #E3F2FD;
+        color: #1976D2;
+    }
+
+    QStatusBar {
+        background-color: white;
+        border-top: 1px solid #E0E0E0;
+        color: #757575;
+    }
+
+    QScrollBar:vertical {
+        background-color: #F5F5F5;
+        width: 12px;
+        border-radius: 6px;
+    }
+
+    QScrollBar::handle:vertical {
+        background-color: #BDBDBD;
+        border-radius: 6px;
+        min-height: 20px;
+    }
+
+    QScrollBar::handle:vertical:hover {
+        background-color: #9E9E9E;
+    }
+
+    QTabWidget::pane {
+        border: 1px solid #E0E0E0;
+        background-color: #F5F7FA;
+    }
+
+    QTabBar::tab {
+        background-color: #F5F5F5;
+        padding: 8px 16px;
+        border: 1px solid #E0E0E0;
+        border-bottom: none;
+        font-family: 'Segoe UI';
+        font-size: 9pt;
+    }
+
+    QTabBar::tab:selected {
+        background-color: white;
+        border-top: 2px solid #2196F3;
+    }
+
+    QTabBar::tab:hover {
+        background-color: #E3F2FD;
+    }
+
+    QComboBox {
+        background-color: #F5F5F5;
+        border: 2px solid #E0E0E0;
+        border-radius: 8px;
+        padding: 6px 10px;
+        font-size: 9pt;
+        font-family: 'Segoe UI';
+        min-height: 24px;
+    }
+
+    QComboBox:focus {
+        border: 2px solid #2196F3;
+        background-color: white;
+    }
+
+    QComboBox::drop-down {
+        border: none;
+        width: 20px;
+    }
+
+    QTextEdit {
+        background-color: #FAFAFA;
+        border: 1px solid #E0E0E0;
+        border-radius: 4px;
+        padding: 4px;
+        font-size: 9pt;
+        font-family: 'Segoe UI';
+    }
+
+    QLineEdit[field="required"], QComboBox[field="required"], QTextEdit[field="required"] {
+        background-color: #FFF3E0;
+        border: 1px solid #FF9800;
+        border-radius: 4px;
+        padding: 4px;
+    }
+
+    QLineEdit[field="optional"], QComboBox[field="optional"], QTextEdit[field="optional"] {
+        background-color: #FAFAFA;
+        border: 1px solid #E0E0E0;
+        border-radius: 4px;
+        padding: 4px;
+    }
+
+    QLineEdit[invalid="true"], QComboBox[invalid="true"], QTextEdit[invalid="true"] {
+        border: 1px solid #E53935;
+    }
+"""
+
+
+@lru_cache(maxsize=None)
+def font(size, bold=False, family=FONT_FAMILY):
+    """Return the shared QFont for a size and weight; widgets copy it, so it is built only once."""
+    return QFont(family, size, QFont.Weight.Bold if bold else QFont.Weight.Normal)
+
+
+def apply_theme(app=None):
+    """Install the application stylesheet and font once; later calls are no-ops."""
+    app = app or QApplication.instance()
+    if app.property("themed"):
+        return
+    app.setProperty("themed", True)
+    app.setFont(font(9))
+    app.setStyleSheet(STYLESHEET)
+
+
+def styled(widget, **properties):
+    """Set the stylesheet properties of a widget that has not been shown yet and return it."""
+    for name, value in properties.items():
+        widget.setProperty(name, value)
+    return widget
+
+
+def restyle(widget, **properties):
+    """Change stylesheet properties of a live widget and repolish just that widget."""
+    styled(widget, **properties)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+
+
+class ModernButton(QPushButton):
+    """Custom modern button with hover effect."""
+
+    def __init__(self, text, primary=False):
+        super().__init__(text)
+        self.primary = primary
+        self.setup_style()
+
+    def setup_style(self):
+        # Colors and hover states come from the theme's variant rules
+        self.setProperty("variant", "primary" if self.primary else "secondary")
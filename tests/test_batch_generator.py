@@ -0,0 +1,26 @@
+import pytest
+
+from production_data.Batch_generator import MAX_LOTS_PER_RANGE, batch_quantities, expand_lots, split_evenly
+from production_data.Fixed_point import UNITS_PER_KG, parse_fixed
+
+
+def test_split_evenly_keeps_every_microgram():
+    quantities = split_evenly(parse_fixed("100.0000001"), 3)
+    assert quantities.sum() == parse_fixed("100.0000001")
+    assert quantities.tolist() == [33333333367, 33333333367, 33333333366]
+
+
+def test_tumbler_batches_take_the_rest_last():
+    assert batch_quantities(25.0, 10.0).tolist() == [10 * UNITS_PER_KG, 10 * UNITS_PER_KG, 5 * UNITS_PER_KG]
+
+
+def test_tumbler_batches_are_capped():
+    assert len(batch_quantities(MAX_LOTS_PER_RANGE / 1000, 0.001)) == MAX_LOTS_PER_RANGE
+    with pytest.raises(ValueError, match="tumbler batches"):
+        batch_quantities(1000.0, 0.001)
+
+
+def test_lot_ranges_are_capped():
+    assert expand_lots("0098AN-0101AN") == ["0098AN", "0099AN", "0100AN", "0101AN"]
+    with pytest.raises(ValueError, match="spans"):
+        expand_lots("1584AN-15840AN")
@@ -0,0 +1,27 @@
+import numpy as np
+
+from production_data.Consumption_calculator import compute_consumption
+from production_data.Fixed_point import UNITS_PER_KG
+
+
+def test_totals_cover_full_and_partial_batches():
+    result = compute_consumption([50, 30, 20], 100.0, 10.0, 25.0, 10.0)
+    assert result.batches == 3
+    assert result.per_batch.tolist() == [5 * UNITS_PER_KG, 3 * UNITS_PER_KG, 2 * UNITS_PER_KG]
+    assert result.large_scale.tolist() == result.per_batch.tolist()
+    assert result.total_weight.tolist() == [int(12.5 * UNITS_PER_KG), int(7.5 * UNITS_PER_KG), 5 * UNITS_PER_KG]
+    assert (result.total_consumption + result.total_loss == result.total_weight).all()
+
+
+def test_tiny_batches_need_no_per_batch_array():
+    result = compute_consumption([50, 30, 20], 100.0, 0.0, 1000.0, 1e-6)
+    assert result.batches == 1_000_000_000
+    assert np.allclose(result.total_weight, np.array([500, 300, 200]) * UNITS_PER_KG, rtol=1e-9)
+    assert result.large_scale.tolist() == [0, 0, 0]
+    assert result.small_scale.tolist() == [500, 300, 200]
+
+
+def test_nothing_to_batch():
+    result = compute_consumption([50, 50], 100.0, 1.0, 10.0, 0.0)
+    assert result.batches == 0
+    assert result.total_weight.tolist() == [0, 0]
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from production_data.Fixed_point import UNITS_PER_G, UNITS_PER_KG, format_fixed, parse_fixed, to_fixed_array
+
+
+@pytest.mark.parametrize("text", ["0.0000000", "2.5000000", "125.0000000", "1.0200000", "800.0000000",
+                                  "0.0000001", "-3.1415926"])
+def test_parse_format_round_trip(text):
+    assert format_fixed(parse_fixed(text)) == text
+
+
+@pytest.mark.parametrize("text, units", [("2.5", 2_500_000_000), ("0.000000001", 1), ("", 0), ("  7 ", 7 * UNITS_PER_KG)])
+def test_parse_is_exact(text, units):
+    assert parse_fixed(text) == units
+
+
+def test_parse_rounds_half_to_even_below_a_microgram():
+    assert parse_fixed("0.0000000005") == 0
+    assert parse_fixed("0.0000000015") == 2
+    assert parse_fixed("0.0000000025") == 2
+
+
+def test_parse_passes_integers_through():
+    assert parse_fixed(np.int64(42)) == 42
+
+
+@pytest.mark.parametrize("units, places, expected", [
+    (1_234_500_000, 3, "1.234"),
+    (1_235_500_000, 3, "1.236"),
+    (1_234_500_001, 3, "1.235"),
+    (2_500_000_000, 0, "2"),
+    (3_500_000_000, 0, "4"),
+    (999_999_999, 6, "1.000000"),
+])
+def test_format_rounds_half_to_even(units, places, expected):
+    assert format_fixed(units, places) == expected
+
+
+def test_format_negative_values():
+    assert format_fixed(-2_500_000_000, 2) == "-2.50"
+    # Rounds to zero, so no sign is shown
+    assert format_fixed(-400, 6) == "0.000000"
+
+
+@pytest.mark.parametrize("units, places, expected", [
+    (1_500_000, 7, "1.5000000"),
+    (1_500_000, 6, "1.500000"),
+    (1_000_001, 9, "1.000001000"),
+    (1_500_000, 1, "1.5"),
+])
+def test_format_places_beyond_the_unit_precision(units, places, expected):
+    assert format_fixed(units, places, UNITS_PER_G) == expected
+
+
+def test_to_fixed_array_rounds_to_units():
+    assert to_fixed_array([2.5, 0.1]).tolist() == [2_500_000_000, 100_000_000]
@@ -0,0 +1,50 @@
+import time
+
+from production_data.Id_allocator import IdAllocator
+from production_data.Production_store import ProductionStore
+
+
+def allocators(path, count, **options):
+    return [IdAllocator(ProductionStore(str(path)), block_size=4, **options) for _ in range(count)]
+
+
+def expire(allocator):
+    """Make the allocator's leases look abandoned, as if its process had stalled past lease_seconds."""
+    conn = allocator.store.connection()
+    with conn:
+        conn.execute("UPDATE id_lease SET expires_at = 0 WHERE owner = ?", (allocator.owner,))
+
+
+def test_idle_lease_is_kept_alive(tmp_path):
+    first, second = allocators(tmp_path / "production.db", 2, lease_seconds=0.4)
+    shown = first.next_id()
+    time.sleep(1.0)  # well past lease_seconds with no next_id() call
+    drawn = [second.next_id() for _ in range(4)]
+    assert shown not in drawn
+    assert first.holds(shown)
+    first.close()
+    second.close()
+
+
+def test_expired_lease_is_not_released_twice(tmp_path):
+    first, second, third = allocators(tmp_path / "production.db", 3)
+    shown = first.next_id()
+    expire(first)
+    # The second client reclaims the expired block and hands its IDs out again
+    taken = [second.next_id() for _ in range(4)]
+    assert shown in taken
+    assert not first.holds(shown)
+    first.give_back(shown)
+    first.close()  # must not free the reclaimed block a second time
+    drawn = [third.next_id() for _ in range(8)]
+    assert not set(drawn) & set(taken)
+    second.close()
+    third.close()
+
+
+def test_close_releases_unused_ids_of_held_leases(tmp_path):
+    first, second = allocators(tmp_path / "production.db", 2)
+    used = first.next_id()
+    first.close()
+    assert [second.next_id() for _ in range(3)] == [used + 1, used + 2, used + 3]
+    second.close()
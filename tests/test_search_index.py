@@ -0,0 +1,40 @@
+import numpy as np
+
+from production_data.Search_index import SearchIndex
+
+
+def record(lot_no, customer="ACME", product_code="BA0830E", color="BLUE"):
+    return ("10/06/25", customer, product_code, color, lot_no, 0)
+
+
+def test_lots_added_after_a_query_are_merged_in_order():
+    index = SearchIndex()
+    index.add_records([record(f"{number}AN") for number in range(1000, 1600)])
+    assert index.search_lot("15").tolist().count(True) == 100
+    index.add_records([record("1500AN"), record("0999AN"), record("1700AN-1710AN")])
+    assert np.flatnonzero(index.search_lot("1500an")).tolist() == [500, 600]
+    assert np.flatnonzero(index.search_lot("0999")).tolist() == [601]
+    assert np.flatnonzero(index.search_lot("1705AN")).tolist() == [602]
+    assert index.lots._lots == sorted(index.lots._lots)
+
+
+def test_compacted_arrays_installed_after_more_rows_were_added():
+    index = SearchIndex()
+    index.add_records([record("1584AN-1615AN", customer="ACME"), record("1620AN", customer="ZENITH")])
+    compacted = index.compacted()
+    index.add_records([record("1600AN", customer="ACME")])
+    index.install(compacted)
+    assert np.flatnonzero(index.search_lot("1600AN")).tolist() == [0, 2]
+    assert np.flatnonzero(index.search("acme")).tolist() == [0, 2]
+    assert np.flatnonzero(index.search("zen")).tolist() == [1]
+    assert index.lot_ranges.overlaps() == [(2, 0)]
+
+
+def test_compacted_arrays_ignored_after_the_index_was_flushed():
+    index = SearchIndex()
+    index.add_records([record("1584AN")])
+    compacted = index.compacted()
+    index.search_lot("1584AN")
+    index.add_records([record("1585AN")])
+    index.install(compacted)
+    assert np.flatnonzero(index.search_lot("158")).tolist() == [0, 1]
@@ -0,0 +1,41 @@
+import numpy as np
+
+from production_data.Sort_index import SortPermutations
+
+
+def expected(dates, customers, product_codes):
+    def argsort(keys):
+        return sorted(range(len(keys)), key=lambda row: (keys[row], row))
+
+    return {
+        "date_old": argsort(dates.tolist()),
+        "date_new": argsort((-dates).tolist()),
+        "customer": argsort([(value.casefold(), value) for value in customers]),
+        "product_code": argsort([(value.casefold(), value) for value in product_codes]),
+    }
+
+
+def test_appended_rows_merge_into_every_sort_order():
+    dates = np.array([739000, 738990, 739000, 738995, 738990, 739010], dtype=np.int64)
+    customers = ["beta", "Alpha", "beta", "alpha", "Gamma", "Beta"]
+    product_codes = ["P2", "p1", "P3", "P2", "P1", "A0"]
+    permutations = SortPermutations()
+    permutations.extend(dates[:3], customers[:3], product_codes[:3])
+    permutations.extend(dates[3:5], customers[3:5], product_codes[3:5])
+    permutations.extend(dates[5:], customers[5:], product_codes[5:])
+    assert permutations.row_count == 6
+    for key, order in expected(dates, customers, product_codes).items():
+        assert permutations._permutations[key].tolist() == order, key
+
+
+def test_appending_row_by_row_matches_one_build():
+    rng = np.random.default_rng(7)
+    dates = rng.integers(738000, 738100, 300)
+    customers = [f"c{value}" for value in rng.integers(0, 40, 300)]
+    product_codes = [f"P{value}" for value in rng.integers(0, 60, 300)]
+    built = SortPermutations()
+    built.extend(dates[:250], customers[:250], product_codes[:250])
+    for row in range(250, 300):
+        built.extend(dates[row:row + 1], customers[row:row + 1], product_codes[row:row + 1])
+    for key, order in expected(dates, customers, product_codes).items():
+        assert built._permutations[key].tolist() == order, key
@@ -0,0 +1,38 @@
+from production_data.Formulation_repository import FormulationRepository
+from production_data.Production_store import ProductionStore
+from production_data.Statistics import ProductionStatistics
+
+RECORD = ["10/07/25", "Una Internationale", "BA0830E", "BLUE", "9000X", "1.0000000"]
+
+
+def loaded_statistics(path):
+    store = ProductionStore(str(path))
+    FormulationRepository(store)
+    statistics = ProductionStatistics(store)
+    store.add_listener(statistics.on_records_changed)
+    statistics.load(store)
+    return store, statistics
+
+
+def test_materials_used_follows_record_changes(tmp_path):
+    store, statistics = loaded_statistics(tmp_path / "production.db")
+    # None of the sample records' products has a formulation on file
+    assert statistics.materials_used == 0
+
+    store.insert_records([RECORD, RECORD])
+    assert statistics.materials_used == 3
+    record_id = store.connection().execute("SELECT MAX(id) FROM production_record").fetchone()[0]
+    store.update_record(record_id, [*RECORD[:2], "PP-W9845E", *RECORD[3:]])
+    assert statistics.materials_used == 3  # the other BA0830E record still uses them
+
+    store.delete_before("2100-01-01")
+    assert statistics.materials_used == 0
+    assert statistics.record_count == 0
+
+
+def test_materials_used_is_seeded_from_the_store(tmp_path):
+    store, _ = loaded_statistics(tmp_path / "production.db")
+    store.insert_records([[*RECORD[:2], "ba0830e", *RECORD[3:]]])
+    statistics = ProductionStatistics()
+    statistics.load(store)
+    assert statistics.materials_used == 3
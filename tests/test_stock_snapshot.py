@@ -0,0 +1,15 @@
+from production_data.Stock_snapshot import StockSnapshot
+
+
+def test_unknown_materials_get_consecutive_slots():
+    stock = StockSnapshot()
+    assert stock.shortfalls(["B107", "B37", "L28"], [5, 3, 2]).tolist() == [0, 0, 0]
+    stock.on_stock_changed({"b37": 10, "x1": 4, "l28": 1})
+    assert stock.shortfalls(["B107", "b37", "X1", "B37", "L28"], [1, 6, 5, 6, 3]).tolist() == [0, 2, 1, 2, 2]
+    assert len(stock.on_hand) == 4
+
+
+def test_only_materials_with_ledger_history_are_short():
+    stock = StockSnapshot()
+    stock.on_stock_changed({"b37": -5})
+    assert stock.shortfalls(["B107", "B37"], [[1, 1], [2, 2]]).tolist() == [0, 8]
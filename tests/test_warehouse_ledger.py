@@ -0,0 +1,21 @@
+from production_data.Production_store import ProductionStore
+from production_data.Stock_snapshot import StockSnapshot
+from production_data.Warehouse_ledger import WarehouseLedger
+
+
+def test_receipts_and_draw_downs_reach_the_snapshot_and_the_store(tmp_path):
+    ledger = WarehouseLedger(ProductionStore(str(tmp_path / "production.db")))
+    stock = StockSnapshot()
+    stock.load(ledger)
+    ledger.add_listener(stock.on_stock_changed)
+    assert ledger.balances() == {}
+
+    ledger.receive([("B37", 10_000), ("l28", 500)], "2025-10-06")
+    ledger.confirm([(1, "b37", 0, 0, 4_000)], "2025-10-07")
+    assert ledger.balance("b37") == 6_000
+    assert stock.shortfalls(["B37", "L28", "B107"], [7_000, 100, 9]).tolist() == [1_000, 0, 0]
+
+    ledger.close()
+    reopened = WarehouseLedger(ProductionStore(str(tmp_path / "production.db")))
+    assert reopened.balances() == {"b37": 6_000, "l28": 500}
+    reopened.close()